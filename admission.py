@@ -0,0 +1,144 @@
+"""Admission control for the web process.
+
+Every Engine.IO polling session keeps one long-poll request parked on a
+server thread, so real-time sessions have to be capped below the thread
+pool or page requests starve. AdmissionControl is WSGI middleware that:
+
+    rejects new Engine.IO handshakes past `max_sessions` in total or
+    `max_sessions_per_ip` per client address (503 + Retry-After; the
+    Socket.IO client backs off and retries by itself),
+    caps concurrent non-real-time requests at `max_inflight`; past that,
+    requests with an overflow handler (the status page) get its cached
+    snapshot, everything else a 503 with Retry-After,
+    counts long-poll requests (`?wait=` on one of `longpoll_paths`)
+    against their own `max_longpoll` cap instead, so parked watchers
+    cannot take the in-flight slots the page needs.
+
+Requests to an existing session and the exempt paths (health checks) are
+never turned away.
+
+Behind `trusted_proxies` reverse proxies the client address is the
+X-Forwarded-For entry the outermost trusted proxy appended, counted from
+the right; anything left of it came from the client and may be forged.
+"""
+import threading
+
+from werkzeug.wsgi import ClosingIterator
+
+
+class AdmissionControl:
+    def __init__(self, app, session_addresses, max_sessions=48, max_sessions_per_ip=4, max_inflight=16,
+                 max_longpoll=8, longpoll_paths=(), retry_after=10, trusted_proxies=0, overflow=None,
+                 exempt=('/healthz', '/readyz'), realtime_prefix='/socket.io'):
+        self.app = app
+        self.session_addresses = session_addresses  # Callable returning the client address of every live session
+        self.max_sessions = max_sessions
+        self.max_sessions_per_ip = max_sessions_per_ip
+        self.max_inflight = max_inflight
+        self.max_longpoll = max_longpoll
+        self.longpoll_paths = frozenset(longpoll_paths)
+        self.retry_after = str(retry_after)
+        self.trusted_proxies = trusted_proxies  # Proxy hops that append to X-Forwarded-For; 0 ignores the header
+        self.overflow = overflow or {}  # Path -> callable returning (body, content type) or None
+        self.exempt = frozenset(exempt)
+        self.realtime_prefix = realtime_prefix
+        self.lock = threading.Lock()
+        self.inflight = 0
+        self.handshakes = 0
+        self.longpolls = 0
+        self.stats = {'sessions_rejected': 0, 'ip_rejected': 0, 'overflow_served': 0, 'requests_rejected': 0,
+                      'longpoll_rejected': 0}
+
+    def client_address(self, environ):
+        if self.trusted_proxies:
+            forwarded = [entry.strip() for entry in environ.get('HTTP_X_FORWARDED_FOR', '').split(',') if entry.strip()]
+            if len(forwarded) >= self.trusted_proxies:
+                return forwarded[-self.trusted_proxies]
+        return environ.get('REMOTE_ADDR', '')
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if path in self.exempt:
+            return self.app(environ, start_response)
+        if path.startswith(self.realtime_prefix):
+            if 'sid=' in environ.get('QUERY_STRING', ''):
+                return self.app(environ, start_response)
+            return self._handshake(environ, start_response)
+        if path in self.longpoll_paths and 'wait=' in environ.get('QUERY_STRING', ''):
+            return self._longpoll(environ, start_response)
+        return self._request(path, environ, start_response)
+
+    def _handshake(self, environ, start_response):
+        address = self.client_address(environ)
+        with self.lock:
+            addresses = list(self.session_addresses())
+            # Handshakes still in progress are not in the session table yet
+            if len(addresses) + self.handshakes >= self.max_sessions:
+                self.stats['sessions_rejected'] += 1
+                return self._busy(start_response, b'Too many live sessions\n')
+            if addresses.count(address) >= self.max_sessions_per_ip:
+                self.stats['ip_rejected'] += 1
+                return self._busy(start_response, b'Too many sessions from this address\n')
+            self.handshakes += 1
+        try:
+            return self.app(environ, start_response)
+        finally:
+            with self.lock:
+                self.handshakes -= 1
+
+    def _longpoll(self, environ, start_response):
+        with self.lock:
+            admitted = self.longpolls < self.max_longpoll
+            if admitted:
+                self.longpolls += 1
+            else:
+                self.stats['longpoll_rejected'] += 1
+        if not admitted:
+            return self._busy(start_response, b'Too many waiting requests\n')
+        try:
+            return ClosingIterator(self.app(environ, start_response), self._release_longpoll)
+        except BaseException:
+            self._release_longpoll()
+            raise
+
+    def _release_longpoll(self):
+        with self.lock:
+            self.longpolls -= 1
+
+    def _request(self, path, environ, start_response):
+        with self.lock:
+            admitted = self.inflight < self.max_inflight
+            if admitted:
+                self.inflight += 1
+        if not admitted:
+            snapshot = self.overflow[path]() if path in self.overflow else None
+            if snapshot is not None:
+                self.stats['overflow_served'] += 1
+                body, content_type = snapshot
+                return self._busy(start_response, body, content_type)
+            self.stats['requests_rejected'] += 1
+            return self._busy(start_response, b'Server busy, try again shortly\n')
+
+        try:
+            # Streaming responses (exports) stay counted until their body is closed
+            return ClosingIterator(self.app(environ, start_response), self._release)
+        except BaseException:
+            self._release()
+            raise
+
+    def _release(self):
+        with self.lock:
+            self.inflight -= 1
+
+    def _busy(self, start_response, body, content_type='text/plain'):
+        start_response('503 Service Unavailable', [
+            ('Content-Type', content_type),
+            ('Content-Length', str(len(body))),
+            ('Retry-After', self.retry_after),
+            ('Cache-Control', 'no-store'),
+        ])
+        return [body]
+
+    def snapshot_stats(self):
+        with self.lock:
+            return dict(self.stats, inflight=self.inflight, handshakes=self.handshakes, longpolls=self.longpolls)
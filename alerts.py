@@ -0,0 +1,198 @@
+"""Alert delivery for status transitions.
+
+The probe loop only ever calls AlertDispatcher.notify(), which does a
+non-blocking put onto each channel's bounded queue and returns. Every
+channel has its own worker thread that:
+
+    batches alerts arriving within `batch_window` seconds,
+    collapses alerts with the same key to the newest one,
+    waits for its token bucket (rate limit per channel),
+    retries failed sends with exponential backoff and jitter.
+
+A full queue drops the alert and counts it rather than blocking the probe.
+"""
+import logging
+import queue
+import random
+import threading
+import time
+from collections import namedtuple
+
+import requests
+
+from eventlog import log_event
+
+Alert = namedtuple('Alert', ['key', 'text', 'created'])
+
+
+class AlertDeliveryError(Exception):
+    pass
+
+
+class AlertChannel:
+    """One destination with its own queue, rate limit and retry policy"""
+    name = 'channel'
+
+    def __init__(self, rate_per_minute=20, burst=5, queue_size=100, batch_window=2.0,
+                 max_batch=20, max_retries=5, backoff_base=1.0, backoff_max=60.0, timeout=10.0):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self.tokens_updated = time.monotonic()
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.stats = {'queued': 0, 'dropped': 0, 'collapsed': 0, 'batches': 0, 'sent': 0, 'retries': 0, 'failed': 0}
+        self._stop = threading.Event()
+        self.thread = None
+
+    def send_batch(self, alerts):
+        """Deliver a list of alerts in one request, or raise AlertDeliveryError"""
+        raise NotImplementedError
+
+    def offer(self, alert):
+        try:
+            self.queue.put_nowait(alert)
+            self.stats['queued'] += 1
+        except queue.Full:
+            self.stats['dropped'] += 1
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True, name=f"alerts-{self.name}")
+        self.thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        try:
+            self.queue.put_nowait(None)  # Wake the worker
+        except queue.Full:
+            pass
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def _collect_batch(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                alert = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if alert is None:
+                break
+            batch.append(alert)
+
+        # Keep only the newest alert per key, in order of first appearance
+        newest = {}
+        for alert in batch:
+            newest.pop(alert.key, None)
+            newest[alert.key] = alert
+        self.stats['collapsed'] += len(batch) - len(newest)
+        return list(newest.values())
+
+    def _take_token(self):
+        """Block the channel worker (never the caller) until the rate limit allows a send"""
+        while not self._stop.is_set():
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.tokens_updated) * self.rate)
+            self.tokens_updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            self._stop.wait((1 - self.tokens) / self.rate)
+        return False
+
+    def _deliver(self, alerts):
+        for attempt in range(self.max_retries + 1):
+            if not self._take_token():
+                return
+            try:
+                self.send_batch(alerts)
+                self.stats['sent'] += len(alerts)
+                return
+            except AlertDeliveryError as e:
+                if attempt == self.max_retries:
+                    log_event('alert_failed', logging.WARNING, channel=self.name, error=str(e))
+                    break
+                self.stats['retries'] += 1
+                delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+                if self._stop.wait(delay * random.uniform(0.5, 1.0)):
+                    break
+        self.stats['failed'] += len(alerts)
+
+    def _run(self):
+        while not self._stop.is_set():
+            first = self.queue.get()
+            if first is None:
+                continue
+            alerts = self._collect_batch(first)
+            self.stats['batches'] += 1
+            self._deliver(alerts)
+
+
+class TelegramChannel(AlertChannel):
+    """Telegram Bot API sendMessage; api_base can point at a local stand-in"""
+    name = 'telegram'
+
+    def __init__(self, token, chat_id, api_base='https://api.telegram.org', **options):
+        self.url = f"{api_base.rstrip('/')}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        super().__init__(**options)
+
+    def send_batch(self, alerts):
+        text = '\n'.join(alert.text for alert in alerts)
+        try:
+            response = requests.post(self.url, json={'chat_id': self.chat_id, 'text': text}, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise AlertDeliveryError(str(e))
+        if response.status_code != 200:
+            raise AlertDeliveryError(f"status {response.status_code}")
+
+
+class WebhookChannel(AlertChannel):
+    """POST a JSON batch to a generic webhook"""
+    name = 'webhook'
+
+    def __init__(self, url, **options):
+        self.url = url
+        super().__init__(**options)
+
+    def send_batch(self, alerts):
+        body = {'alerts': [{'key': alert.key, 'text': alert.text, 'created': alert.created} for alert in alerts]}
+        try:
+            response = requests.post(self.url, json=body, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise AlertDeliveryError(str(e))
+        if response.status_code >= 300:
+            raise AlertDeliveryError(f"status {response.status_code}")
+
+
+class AlertDispatcher:
+    """Fan alerts out to every channel without ever blocking the caller"""
+
+    def __init__(self, channels):
+        self.channels = list(channels)
+
+    def start(self):
+        for channel in self.channels:
+            channel.start()
+        return self
+
+    def stop(self):
+        for channel in self.channels:
+            channel.stop()
+
+    def notify(self, key, text, created=None):
+        alert = Alert(key, text, time.time() if created is None else created)
+        for channel in self.channels:
+            channel.offer(alert)
+
+    def stats(self):
+        return {channel.name: dict(channel.stats, depth=channel.queue.qsize()) for channel in self.channels}
@@ -0,0 +1,101 @@
+"""Streaming detection of a degraded (slow or flaky, but up) bot.
+
+DegradationDetector keeps, per probe and in O(1):
+
+    a slow EWMA baseline of latency and its EW variance (successful
+    probes only; a failed probe's latency is just the timeout),
+    a fast EWMA of latency, the "current" level,
+    a fast EWMA of the error fraction: failed checks / checks for a probe
+    that passed, 1.0 for the first failed probe of a run. A long outage
+    is already offline and counts as one error, so the bot comes back
+    online rather than degraded; it is flapping that adds up.
+
+The stream is degraded when the fast latency sits `enter_z` standard
+deviations above the baseline (the deviation of the fast EWMA itself,
+much smaller than a single probe's), or the error EWMA reaches
+`enter_error_rate`. It recovers only below the lower `exit_z` and
+`exit_error_rate`, so it does not flap on the threshold.
+
+Each sample is clipped to `clip_z` standard deviations before it updates
+either average, so a lone spike can neither blow up the variance nor
+tip the fast EWMA over on its own; a sustained shift still gets
+through, one clipped step at a time. While
+degraded the baseline learns `degraded_slowdown` times slower: a
+slowdown is not absorbed as the new normal within minutes, but a
+permanent change still is, eventually.
+"""
+import math
+
+
+class DegradationDetector:
+    def __init__(self, baseline_alpha=0.005, fast_alpha=0.05, error_alpha=0.05, enter_z=5.0, exit_z=2.5,
+                 enter_error_rate=0.15, exit_error_rate=0.05, min_std_ms=10.0, min_std_share=0.1,
+                 clip_z=3.0, warmup=60, degraded_slowdown=10.0):
+        self.baseline_alpha = baseline_alpha
+        self.fast_alpha = fast_alpha
+        self.error_alpha = error_alpha
+        self.enter_z = enter_z
+        self.exit_z = exit_z
+        self.enter_error_rate = enter_error_rate
+        self.exit_error_rate = exit_error_rate
+        self.min_std_ms = min_std_ms  # Floors keep a very steady baseline from flagging tiny wobbles
+        self.min_std_share = min_std_share
+        self.clip_z = clip_z
+        # Steady-state standard deviation of the fast EWMA relative to that of single samples
+        self.fast_std_ratio = math.sqrt(fast_alpha / (2 - fast_alpha))
+        self.warmup = warmup  # Successful probes needed before latency can flag anything
+        self.degraded_slowdown = degraded_slowdown
+        self.samples = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.fast = 0.0
+        self.error_rate = 0.0
+        self.z = 0.0
+        self.degraded = False
+        self.failing = False
+
+    def update(self, ok, latency_ms, error_fraction=None):
+        """Feed one probe; return whether the stream is degraded now. A latency of None (no reading) only counts toward errors"""
+        if not ok:
+            error_fraction = 0.0 if self.failing else 1.0
+        elif error_fraction is None:
+            error_fraction = 0.0
+        self.failing = not ok
+        self.error_rate += self.error_alpha * (error_fraction - self.error_rate)
+
+        if ok and latency_ms is not None:
+            self.samples += 1
+            if self.samples == 1:
+                self.mean = self.fast = latency_ms
+            else:
+                # A plain running average until there are enough samples for the EWMA to settle
+                alpha = max(self.baseline_alpha, 1.0 / self.samples)
+                if self.degraded:
+                    alpha /= self.degraded_slowdown
+                # Incremental exponentially weighted mean and variance of the clipped sample
+                limit = self.clip_z * self.std()
+                diff = min(max(latency_ms - self.mean, -limit), limit)
+                increment = alpha * diff
+                self.mean += increment
+                self.variance = (1 - alpha) * (self.variance + diff * increment)
+                self.fast += self.fast_alpha * (min(latency_ms, self.mean + limit) - self.fast)
+            self.z = (self.fast - self.mean) / (self.std() * self.fast_std_ratio) if self.samples >= self.warmup else 0.0
+
+        if self.degraded:
+            self.degraded = self.z >= self.exit_z or self.error_rate >= self.exit_error_rate
+        else:
+            self.degraded = self.z >= self.enter_z or self.error_rate >= self.enter_error_rate
+        return self.degraded
+
+    def std(self):
+        return max(math.sqrt(self.variance), self.min_std_ms, self.min_std_share * self.mean)
+
+    def as_dict(self):
+        return {
+            'degraded': self.degraded,
+            'latency_baseline_ms': round(self.mean, 1),
+            'latency_std_ms': round(math.sqrt(self.variance), 1),
+            'latency_recent_ms': round(self.fast, 1),
+            'latency_z': round(self.z, 2),
+            'error_rate': round(self.error_rate, 3)
+        }
@@ -1,21 +1,39 @@
-from flask import Flask, render_template_string
-from flask_socketio import SocketIO
+from flask import Flask, render_template_string, request, Response
+from flask_socketio import SocketIO, join_room, leave_room
 import requests
 import time
 import threading
 from datetime import datetime, timedelta
+from collections import deque
+import hashlib
+import hmac
+import json
+import logging
+import math
+import multiprocessing
+import zlib
+from probe_store import ProbeStore
+from checks import CheckRunner, build_check
+from alerts import AlertDispatcher, TelegramChannel, WebhookChannel
 import os
 import platform
-import pytz
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
-import atexit
+from functools import lru_cache
+import tempfile
+from scheduler import Scheduler
+from realtime import OutboundQueues
+from admission import AdmissionControl
+from eventlog import EventLog, log_event
+from anomaly import DegradationDetector
+from maintenance import MaintenanceSchedule
+from common import MAX_PROBE_GAP, PH_UTC_OFFSET, parse_time
 import requests
 import re
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'ptastatus-secret-key'
 
+POLLING_COMPRESSION_THRESHOLD = 128  # Polling responses at least this many bytes are gzipped
+
 # Initialize socketio differently based on environment
 is_production = os.environ.get('RENDER', False)
 if is_production:
@@ -25,11 +43,29 @@ if is_production:
                        async_mode='threading',
                        transport=['polling'],
                        allow_upgrades=False,  # Prevent upgrading from polling to WebSockets
+                       http_compression=True,
+                       compression_threshold=POLLING_COMPRESSION_THRESHOLD,
                        engineio_logger=False,
                        logger=False)
 else:
     # In development: use default settings
-    socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+    socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading',
+                        http_compression=True, compression_threshold=POLLING_COMPRESSION_THRESHOLD)
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_QUEUE_SIZE = 10000  # JSON lines waiting for stdout; past this they are dropped, never waited for
+LOG_LIMITS = {
+    'client_connected': {'sample': 10, 'rate': 1.0, 'burst': 5},  # Fires on every polling reconnect
+    'probe_error': {'rate': 0.1, 'burst': 3},
+    'record_error': {'rate': 0.1, 'burst': 3},
+    'probe_store_error': {'rate': 0.1, 'burst': 3},
+    'push_failed': {'rate': 0.1, 'burst': 3},
+    'ingest_stale_results': {'rate': 0.1, 'burst': 3},
+    'quorum_capped': {'rate': 1 / 600, 'burst': 1}  # A misconfiguration, reported every 10 minutes at most
+}
+
+# Log calls only enqueue; a listener thread writes the JSON lines
+event_log = EventLog(LOG_LIMITS, queue_size=LOG_QUEUE_SIZE, level=getattr(logging, LOG_LEVEL, logging.INFO)).start()
 
 def get_bot_version():
     """Fetch the bot version from GitHub repository"""
@@ -47,7 +83,7 @@ def get_bot_version():
         # Fallback to environment variable if GitHub fetch fails
         return os.environ.get('BOT_VERSION', 'Alpha Release 4.1')
     except Exception as e:
-        print(f"Error fetching bot version: {e}")
+        log_event('bot_version_fetch_failed', logging.WARNING, error=str(e))
         # Return a default or environment value as fallback
         return os.environ.get('BOT_VERSION', 'Alpha Release 4.1')
 
@@ -59,187 +95,842 @@ TELEGRAM_BOT_LINK = "https://t.me/PTAStudentBot"  # Add this line - note: no @ s
 CHECK_INTERVAL = 1  # Check every 10 seconds for more responsive updates
 MAX_HISTORY_ENTRIES = 100
 APP_URL = os.environ.get('APP_URL', "https://ptabot-status-website.onrender.com/")
-
-# Status tracking
+DAILY_BAR_DAYS = 90  # Number of daily availability bars shown on the page
+PAGE_CACHE_TTL = 5  # Seconds a rendered status page is reused between state changes
+PROBE_STORE_PATH = os.environ.get('PROBE_STORE_PATH', 'probes.dat')  # Raw probe log used for exports
+HEALTHZ_URL = APP_URL.rstrip('/') + '/healthz'  # Keep-alive target; avoids rendering the full page
+UPTIME_RESET_INTERVAL = 4 * 3600  # Seconds between reset_uptime_calculation runs
+DEGRADED_SHARE_MINOR = 0.01  # A day this long degraded cannot show as a 'good' bar
+MAINTENANCE_WINDOWS = json.loads(os.environ.get('MAINTENANCE') or 'null') or []  # Format in maintenance.py
+MAINTENANCE_FILE = os.environ.get('MAINTENANCE_FILE')  # The same JSON list in a file, for long schedules
+MAINTENANCE_REFRESH = 3600  # Seconds between re-expansions of the recurring windows
+UPCOMING_MAINTENANCE = 3  # Windows listed on the page and in /api/status
+READY_MAX_PROBE_LAG = 15  # Seconds the probe loop may fall behind before /readyz fails
+# JSON list of check configs (see checks.py); defaults to a hedged "GET BOT_URL returns 200"
+CHECKS = json.loads(os.environ.get('CHECKS') or 'null') or [{'type': 'http', 'url': BOT_URL, 'timeout': 5, 'hedge': True}]
+ARCHIVE_PATH = os.environ.get('ARCHIVE_PATH')  # Optional bit-packed long-term archive (needs numpy)
+TELEGRAM_ALERT_TOKEN = os.environ.get('TELEGRAM_ALERT_TOKEN')  # Bot token used to send outage alerts
+TELEGRAM_ALERT_CHAT_ID = os.environ.get('TELEGRAM_ALERT_CHAT_ID')
+TELEGRAM_API_BASE = os.environ.get('TELEGRAM_API_BASE', 'https://api.telegram.org')
+ALERT_WEBHOOK_URL = os.environ.get('ALERT_WEBHOOK_URL')
+PROBER_MODE = os.environ.get('PROBER_MODE', 'local')  # 'remote' pushes results to AGGREGATOR_URL instead of serving
+PROBER_LOCATION = os.environ.get('PROBER_LOCATION', 'render')  # Name of this prober's location
+AGGREGATOR_URL = os.environ.get('AGGREGATOR_URL')  # Where a remote prober sends its results
+INGEST_TOKEN = os.environ.get('INGEST_TOKEN')  # Shared secret for /ingest; ingest is disabled without it
+QUORUM = int(os.environ.get('QUORUM', 0))  # Fresh locations that must report down; 0 means a majority
+LOCATION_STALE_AFTER = 30  # Seconds before a location's last report stops counting toward quorum
+PUSH_INTERVAL = 5  # Seconds between batched pushes from a remote prober
+REMOTE_BUFFER_SIZE = 10000  # Results a remote prober keeps while the aggregator is unreachable
+MAX_INGEST_BATCH = 10000  # Results accepted in one /ingest request
+MAX_INGEST_AGE = 86400  # Seconds; older results are refused, a prober that was cut off longer starts over
+MAX_INGEST_SKEW = 300  # Seconds a prober's clock may run ahead of ours
+LOCATION_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,32}$')
+OUTBOUND_QUEUE_LIMIT = 16  # Packets a slow client may have pending; status updates coalesce to the newest
+UPDATE_TIERS = ('transitions', '10s', '1s')  # Socket.IO rooms a client can subscribe to, slowest first
+DEFAULT_UPDATE_TIER = '1s'
+MAX_REALTIME_SESSIONS = int(os.environ.get('MAX_REALTIME_SESSIONS', 48))  # Each polling session parks a waitress thread
+MAX_SESSIONS_PER_IP = int(os.environ.get('MAX_SESSIONS_PER_IP', 4))
+MAX_INFLIGHT_REQUESTS = int(os.environ.get('MAX_INFLIGHT_REQUESTS', 12))  # Past this, / is served from the cached page
+MAX_LONGPOLL_WAITERS = int(os.environ.get('MAX_LONGPOLL_WAITERS', 8))  # /api/status?wait= requests parked on the state change
+MAX_LONGPOLL_WAIT = 55  # Seconds; stays under the usual 60 s proxy idle timeout
+WAITRESS_THREADS = int(os.environ.get('WAITRESS_THREADS', 72))  # Room for every session, long-poll, the in-flight cap and health checks
+WAITRESS_CONNECTION_LIMIT = int(os.environ.get('WAITRESS_CONNECTION_LIMIT', 500))
+# Reverse proxies in front of the app that append to X-Forwarded-For (Render has one); 0 uses the socket address
+TRUST_FORWARDED_FOR = int(os.environ.get('TRUST_FORWARDED_FOR', '1' if os.environ.get('RENDER') else '0'))
+EMBED_MAX_AGE = 30  # Seconds browsers and CDNs may reuse /badge.svg and /widget.js
+EMBED_CACHE_TTL = 60  # Seconds a rendered embed is reused while the state is unchanged
+BADGE_WINDOWS = {'1d': 1, '7d': 7, '30d': 30, '90d': 90}  # ?window= for /badge.svg, in days of daily bars
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR')  # Write index.html, status.json and badge.svg here for nginx/CDN to serve
+SNAPSHOT_REFRESH = 60  # Seconds between snapshot rewrites while the state is unchanged
+EVENT_RING_SIZE = 256  # Recent transitions kept so reconnecting clients can catch up
+UPDATE_ENCODINGS = ('json', 'compact')  # status_update objects, or positional status_compact arrays
+PROBER_PROCESS = os.environ.get('PROBER_PROCESS') == '1'  # Probe and keep state in a child process, away from web load
+IS_PROBER_CHILD = os.environ.get('PTASTATUS_PROBER_CHILD') == '1'  # Set by the web process on the child it spawns
+OWNS_STATE = IS_PROBER_CHILD or not PROBER_PROCESS  # Only this process probes, alerts and runs the uptime reset
+
+ENVIRONMENT_INFO = f"{platform.system()} {platform.release()}"
+
+# Wall clock for the state machine; replay.py swaps in a virtual clock
+clock = time.time
+
+# Status tracking; every timestamp is a Unix epoch (UTC) and is only formatted for display
 last_check = None
 is_online = False
 last_online = None
+is_degraded = False  # Up, but slow or flaky against its own baseline; only meaningful while is_online
 status_history = []
 uptime_percentage = 100.0
-start_time = datetime.now()
+start_epoch = clock()
+state_version = 0  # Bumped whenever the history or uptime changes
+state_changed = threading.Condition()  # Notified on every state_version change; /api/status long-polls wait on it
+last_probe_epoch = None
+last_probe_monotonic = None  # When the probe loop last finished an iteration
+last_check_results = []
+# Sequence number of the newest transition. It starts at the boot time in milliseconds, so after a
+# restart every seq a client kept from the old process is below the new ring and resumes as a gap.
+event_seq = int(clock() * 1000)
+event_ring = deque(maxlen=EVENT_RING_SIZE)  # (seq, epoch, state) for the latest transitions
+degradation = DegradationDetector()
+degradation_stats = {}  # The prober child's detector state, in process mode
+alert_stats = {}  # The prober child's alert delivery counters, in process mode
+location_stats = []  # The prober child's locations_payload(), in process mode
+in_maintenance = False  # The latest probe fell inside a scheduled maintenance window
+
+if MAINTENANCE_FILE:
+    with open(MAINTENANCE_FILE) as f:
+        MAINTENANCE_WINDOWS = MAINTENANCE_WINDOWS + json.load(f)
+maintenance = MaintenanceSchedule(MAINTENANCE_WINDOWS).refresh(clock())
+locations = {}  # Location name -> latest report, transitions and raw store
+locations_lock = threading.Lock()
+prober_snapshots = None  # In the prober child: pipe the state snapshots are published on
+prober_commands = None  # In the web process: pipe used to forward ingested results to the child
+prober_commands_lock = threading.Lock()
+_latest_snapshot = [None]  # In the prober child: newest (state, payloads) waiting to be published
+_snapshot_ready = threading.Event()
+check_runner = CheckRunner(build_check(config) for config in CHECKS)
+
+
+class DailyBars:
+    """Rolling per-day availability aggregates, updated incrementally by the probe loop"""
+
+    def __init__(self, days):
+        self.days = days
+        # Each entry is [day_number, up_seconds, down_seconds, incidents, degraded_seconds, maintenance_seconds];
+        # degraded time is up time too and is also counted in up_seconds, maintenance is neither up nor down
+        self.entries = deque(maxlen=days)
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def record(self, epoch, status, elapsed, new_incident=False, degraded=False, maintenance=False):
+        """Credit `elapsed` seconds of up (possibly degraded), down or maintenance time to the day containing `epoch`"""
+        day = ph_day_number(epoch)
+        with self.lock:
+            if not self.entries or self.entries[-1][0] != day:
+                self.entries.append([day, 0.0, 0.0, 0, 0.0, 0.0])
+            entry = self.entries[-1]
+            if maintenance:
+                entry[5] += elapsed
+            elif status:
+                entry[1] += elapsed
+                if degraded:
+                    entry[4] += elapsed
+            else:
+                entry[2] += elapsed
+            if new_incident:
+                entry[3] += 1
+            self.version += 1
+
+    def snapshot(self, now=None):
+        """Return one bar per day for the last `days` days, oldest first"""
+        today = ph_day_number(clock() if now is None else now)
+        with self.lock:
+            by_day = {entry[0]: tuple(entry) for entry in self.entries}
+            version = self.version
+
+        bars = []
+        for day in range(today - self.days + 1, today + 1):
+            _, up, down, incidents, degraded, maintenance_time = by_day.get(day, (day, 0.0, 0.0, 0, 0.0, 0.0))
+            total = up + down
+            uptime = round(up / total * 100, 2) if total else None
+            bars.append({
+                'date': datetime.utcfromtimestamp(day * 86400).strftime('%Y-%m-%d'),
+                'up_seconds': int(up),
+                'down_seconds': int(down),
+                'degraded_seconds': int(degraded),
+                'maintenance_seconds': int(maintenance_time),
+                'incidents': incidents,
+                'uptime': uptime,
+                'level': bar_level(uptime, incidents, degraded / total if total else 0.0)
+            })
+        return version, bars
+
+    def dump(self):
+        """Copy of the raw aggregates, for publishing to another process"""
+        with self.lock:
+            return self.version, [list(entry) for entry in self.entries]
+
+    def load(self, version, entries):
+        """Replace the aggregates with a copy published by the prober process"""
+        with self.lock:
+            self.entries = deque(entries, maxlen=self.days)
+            self.version = version
+
+
+def ph_day_number(epoch):
+    """Number of whole Philippine-time days since the Unix epoch"""
+    return int((epoch + PH_UTC_OFFSET) // 86400)
+
+
+def bar_level(uptime, incidents=0, degraded_share=0.0):
+    """CSS class used to color a daily bar"""
+    if uptime is None:
+        return 'nodata'
+    if uptime >= 99.9 and not incidents and degraded_share < DEGRADED_SHARE_MINOR:
+        return 'good'
+    if uptime >= 99.0:
+        return 'minor'
+    if uptime >= 95.0:
+        return 'partial'
+    return 'major'
+
+
+daily_bars = DailyBars(DAILY_BAR_DAYS)
+outbound_queues = OutboundQueues(coalesce_events=('status_update', 'status_compact'), limit=OUTBOUND_QUEUE_LIMIT).install(socketio.server.eio)
+_daily_json_cache = {'version': None, 'body': b'', 'etag': None}
+_page_cache = {'key': None, 'rendered_at': 0.0, 'html': None}
+_static_snapshot = {'version': None, 'rendered_at': 0.0, 'digests': {}, 'written': 0, 'unchanged': 0}
+_embed_cache = {}  # (name, params) -> {'key', 'rendered_at', 'body', 'etag'}
+_tier_state = {'state': None, 'ten_second_sent': 0.0, 'payloads': None}
+client_subscriptions = {}  # Socket.IO sid -> (tier, encoding)
+
+
+def realtime_session_addresses():
+    return [admission.client_address(environ) for environ in list(socketio.server.environ.values())]
+
+def cached_page_snapshot():
+    """The last rendered status page, however old, for requests turned away under load"""
+    html = _page_cache['html']
+    return (html.encode(), 'text/html; charset=utf-8') if html else None
+
+admission = AdmissionControl(
+    app.wsgi_app,
+    realtime_session_addresses,
+    max_sessions=MAX_REALTIME_SESSIONS,
+    max_sessions_per_ip=MAX_SESSIONS_PER_IP,
+    max_inflight=MAX_INFLIGHT_REQUESTS,
+    max_longpoll=MAX_LONGPOLL_WAITERS,
+    longpoll_paths=('/api/status',),
+    trusted_proxies=TRUST_FORWARDED_FOR,
+    overflow={'/': cached_page_snapshot}
+)
+app.wsgi_app = admission
+probe_store = ProbeStore(PROBE_STORE_PATH)
+alert_channels = []
+if TELEGRAM_ALERT_TOKEN and TELEGRAM_ALERT_CHAT_ID:
+    alert_channels.append(TelegramChannel(TELEGRAM_ALERT_TOKEN, TELEGRAM_ALERT_CHAT_ID, api_base=TELEGRAM_API_BASE))
+if ALERT_WEBHOOK_URL:
+    alert_channels.append(WebhookChannel(ALERT_WEBHOOK_URL))
+alert_dispatcher = AlertDispatcher(alert_channels).start() if alert_channels and OWNS_STATE else None
+probe_archive = None
+if ARCHIVE_PATH and OWNS_STATE:
+    from archive import ProbeArchive
+    probe_archive = ProbeArchive(ARCHIVE_PATH)
+
+def seed_daily_bars():
+    """Rebuild the daily bars from the raw probe store, so a restart does not wipe the strip.
+
+    Up/down time, incidents and maintenance (from the configured windows)
+    are recomputed; degraded time is not in the raw store and starts at 0.
+    """
+    global last_probe_epoch
+    from backfill import load_store, rollup
+    now = clock()
+    first_day = ph_day_number(now) - DAILY_BAR_DAYS + 1
+    columns = load_store(PROBE_STORE_PATH, start=first_day * 86400 - PH_UTC_OFFSET)
+    if len(columns.epoch) == 0:
+        return
+    history = MaintenanceSchedule(maintenance.windows, horizon=0, lookback=now - columns.epoch[0]).refresh(now)
+    days = rollup(columns, max_gap=MAX_PROBE_GAP, maintenance=history.mask(columns.epoch))
+    daily_bars.load(0, [
+        [int(day), float(up), float(down), int(incidents), 0.0, float(maintenance_time)]
+        for day, up, down, incidents, maintenance_time in zip(
+            days['bucket'], days['up_seconds'], days['down_seconds'], days['incidents'], days['maintenance_seconds'])
+    ])
+    last_probe_epoch = float(columns.epoch[-1])
+
+if OWNS_STATE:
+    started = time.perf_counter()
+    seed_daily_bars()
+    log_event('daily_bars_seeded', days=len(daily_bars.entries), ms=round((time.perf_counter() - started) * 1000, 1))
+
+
+def bump_state_version():
+    global state_version
+    with state_changed:
+        state_version += 1
+        state_changed.notify_all()
+
+
+def record_daily_probe(now, status, new_incident=False, degraded=False, maintenance=False):
+    """Feed one probe result into the daily availability bars"""
+    global last_probe_epoch
+    elapsed = 0.0
+    if last_probe_epoch is not None:
+        elapsed = min(now - last_probe_epoch, MAX_PROBE_GAP)
+    last_probe_epoch = now
+    daily_bars.record(now, status, elapsed, new_incident, degraded, maintenance)
+
+def record_raw_probe(now, status, latency_ms):
+    """Append one probe result to the raw probe store and the long-term archive"""
+    try:
+        probe_store.append(now, status, math.nan if latency_ms is None else latency_ms)
+        if probe_archive is not None:
+            probe_archive.write(now, status, latency_ms)
+    except (OSError, ValueError) as e:
+        log_event('probe_store_error', logging.ERROR, error=str(e))
 
-# Initialize the scheduler
-scheduler = BackgroundScheduler()
+# One monotonic scheduler runs the probe and every other periodic job
+scheduler = Scheduler()
 
 # Function to ping our own app and keep it alive
 def ping_self():
+    # Render only counts inbound traffic, so this still goes through the public URL,
+    # but it hits /healthz instead of rendering the whole status page
     try:
-        print(f"Self-ping: Pinging {APP_URL} to keep server alive...")
-        response = requests.get(APP_URL, timeout=10)
-        print(f"Self-ping result: {response.status_code}")
+        response = requests.get(HEALTHZ_URL, timeout=10)
+        log_event('self_ping', url=HEALTHZ_URL, status=response.status_code)
     except Exception as e:
-        print(f"Self-ping error: {e}")
+        log_event('self_ping_failed', logging.WARNING, url=HEALTHZ_URL, error=str(e))
 
 # Add this new function after ping_self() function
 def reset_uptime_calculation():
     """Reset the uptime percentage calculation every 4 hours"""
     global status_history, uptime_percentage
     
-    print("Scheduled task: Resetting uptime calculation...")
-    
     # Keep the full history for display purposes, but only count recent entries for uptime
     if status_history:
         # Calculate new uptime based on entries from the last 4 hours only
-        now = datetime.now(pytz.timezone('Asia/Manila'))
-        four_hours_ago = now - timedelta(hours=4)
+        four_hours_ago = clock() - 4 * 3600
+        recent_entries = [entry for entry in status_history if entry['timestamp'] >= four_hours_ago]
         
-        # Ensure all timestamps in status_history are timezone-aware
-        recent_entries = [
-            entry for entry in status_history 
-            if entry['timestamp'].replace(tzinfo=pytz.timezone('Asia/Manila')) >= four_hours_ago
-        ]
-        
-        if recent_entries:
-            online_count = sum(1 for entry in recent_entries if entry['status'])
-            uptime_percentage = (online_count / len(recent_entries)) * 100
+        recent_uptime = history_uptime(recent_entries)
+        if recent_uptime is not None:
+            uptime_percentage = recent_uptime
         else:
             # If no entries in last 4 hours, reset to default
             uptime_percentage = 100.0 if is_online else 0.0
             
-        print(f"Uptime calculation reset. New uptime: {uptime_percentage:.2f}%")
     else:
         # If no history at all, set based on current status
         uptime_percentage = 100.0 if is_online else 0.0
 
-# Add this after the existing ping_self scheduler job
-scheduler.add_job(
-    func=reset_uptime_calculation,
-    trigger=IntervalTrigger(hours=4),
-    id='reset_uptime_job',
-    name='Reset uptime calculation every 4 hours',
-    replace_existing=True
-)
+    log_event('uptime_reset', uptime_percentage=round(uptime_percentage, 2))
+    bump_state_version()
 
-# Add the job to the scheduler - ping every 14 minutes (same as your JS example)
-scheduler.add_job(
-    func=ping_self,
-    trigger=IntervalTrigger(minutes=14),
-    id='ping_job',
-    name='Ping self every 14 minutes to keep alive',
-    replace_existing=True
-)
+def history_uptime(entries):
+    """Percentage of history entries that are up, leaving out maintenance; None when nothing counts"""
+    counted = online_count = 0
+    for entry in entries:
+        if entry['state'] != 'maintenance':
+            counted += 1
+            online_count += entry['status']
+    return online_count / counted * 100 if counted else None
+
+def refresh_maintenance():
+    """Re-expand the recurring maintenance windows so the index keeps covering the days ahead"""
+    maintenance.refresh(clock())
+
+# Reset uptime every 4 hours
+if OWNS_STATE:
+    scheduler.add_job('reset_uptime', reset_uptime_calculation, UPTIME_RESET_INTERVAL)
+
+# Every process that probes or renders the page looks windows up
+if maintenance.windows:
+    scheduler.add_job('maintenance_refresh', refresh_maintenance, MAINTENANCE_REFRESH)
+
+# Ping every 14 minutes (same as your JS example)
+if not IS_PROBER_CHILD:
+    scheduler.add_job('ping_self', ping_self, 14 * 60)
 
 # Start the scheduler when the app starts
 scheduler.start()
 
-# Shut down the scheduler when exiting the app
-atexit.register(lambda: scheduler.shutdown())
-
-def ph_time_format(dt):
-    """Convert datetime to Philippine time and format in 12-hour format"""
-    if dt is None:
+def ph_time_format(epoch):
+    """Format a Unix epoch as Philippine time in 12-hour format, e.g. 2026-10-16 01:02:03 PM"""
+    if epoch is None:
         return 'Never'
+    return _ph_time_format(int(epoch))
+
+@lru_cache(maxsize=256)
+def _ph_time_format(second):
+    # Asia/Manila has no DST, so a fixed offset is exact and skips the tz database
+    return time.strftime('%Y-%m-%d %I:%M:%S %p', time.gmtime(second + PH_UTC_OFFSET))
+
+def check_results_payload():
+    return [
+        {
+            'name': result.name,
+            'ok': result.ok,
+            'latency_ms': round(result.latency_ms, 1),
+            'detail': result.detail
+        }
+        for result in last_check_results
+    ]
+
+def build_status_payload():
+    """The status_update payload for the current state.
+
+    Times are integer Unix epochs (null means never) and uptime is in
+    seconds; the browser formats them in Asia/Manila.
+    """
+    return {
+        'is_online': is_online,
+        'is_degraded': is_degraded,
+        'in_maintenance': in_maintenance,
+        'state': current_state(),
+        'last_online': None if last_online is None else int(last_online),
+        'last_check': None if last_check is None else int(last_check),
+        'uptime_percentage': round(uptime_percentage, 2),
+        'server_time': ENVIRONMENT_INFO,
+        'uptime': int(clock() - start_epoch),
+        'recent_history': [
+            {
+                'timestamp': int(entry['timestamp']),
+                'status': entry['status'],
+                'state': entry['state']
+            }
+            for entry in status_history[:-11:-1]
+        ],
+        'checks': check_results_payload(),
+        'locations': current_locations(),
+        'seq': event_seq
+    }
+
+STATE_CODES = {'offline': 0, 'online': 1, 'degraded': 2, 'maintenance': 3}
+
+def status_state(online, degraded, maintenance=False):
+    """'maintenance', 'online', 'degraded' or 'offline'; degraded only qualifies a bot that is up"""
+    if maintenance:
+        return 'maintenance'
+    if not online:
+        return 'offline'
+    return 'degraded' if degraded else 'online'
+
+def current_state():
+    return status_state(is_online, is_degraded, in_maintenance)
+
+def epoch_or_zero(epoch):
+    return int(epoch) if epoch is not None else 0
+
+def build_compact_payload():
+    """The status_compact frame: what the status page shows, as a positional array.
+
+    [4, flags, last_check, last_online, uptime_centipercent, uptime_seconds, history, seq]
+    flags bit 0 is online, bit 1 degraded, bit 2 maintenance; times are
+    integer Unix epochs (0 means never); history is [epoch, state, epoch,
+    state, ...] for the last 10 changes, newest first, with state 0
+    offline, 1 online, 2 degraded and 3 maintenance; seq is the newest
+    transition's sequence number. The leading 4 is the layout version.
+    """
+    history = []
+    for entry in status_history[:-11:-1]:
+        history += [int(entry['timestamp']), STATE_CODES[entry['state']]]
+    return [
+        4,
+        (1 if is_online else 0) | (2 if is_degraded else 0) | (4 if in_maintenance else 0),
+        epoch_or_zero(last_check),
+        epoch_or_zero(last_online),
+        int(round(uptime_percentage * 100)),
+        int(clock() - start_epoch),
+        history,
+        event_seq
+    ]
+
+# Event name and payload builder for each negotiated encoding
+ENCODING_EVENTS = {
+    'json': ('status_update', build_status_payload),
+    'compact': ('status_compact', build_compact_payload)
+}
+
+def broadcast_status():
+    """Emit real-time update to subscribed clients, or hand it to the web process when running as the prober child"""
+    if prober_snapshots is not None:
+        # Latest wins: a web process that falls behind skips snapshots instead of stalling probes
+        payloads = {encoding: build() for encoding, (_, build) in ENCODING_EVENTS.items()}
+        _latest_snapshot[0] = (state_snapshot(), payloads)
+        _snapshot_ready.set()
+        return
+    emit_status(due_tiers(current_state()))
+
+def tier_room(tier, encoding):
+    return tier if encoding == 'json' else f"{tier}:{encoding}"
+
+def events_since(since):
+    """Transitions after sequence number `since`, or None when the ring no longer reaches back that far"""
+    ring = list(event_ring)
+    if since > event_seq:
+        return None  # Not a seq this server handed out
+    if since == event_seq:
+        return []
+    if not ring or ring[0][0] > since + 1:
+        return None
+    return [[seq, round(epoch, 3), state] for seq, epoch, state in ring if seq > since]
+
+def room_size(room):
+    return len(socketio.server.manager.rooms.get('/', {}).get(room, ()))
+
+def emit_status(tiers, payloads=None):
+    """Emit to the non-empty rooms of the given tiers, building each encoding's payload at most once"""
+    for encoding, (event, build) in ENCODING_EVENTS.items():
+        rooms = [tier_room(tier, encoding) for tier in tiers if room_size(tier_room(tier, encoding))]
+        if rooms:
+            socketio.emit(event, payloads[encoding] if payloads else build(), to=rooms)
+
+def due_tiers(state):
+    """Tiers owed this tick's update.
+
+    '1s' gets every tick, '10s' every ten seconds and 'transitions' only
+    when the state (online, degraded, offline) changes (the faster tiers
+    get the change too). A payload
+    is only built when a due tier has subscribers, so the per-tick cost
+    follows the number of fast subscribers rather than the number of
+    connections.
+    """
+    changed = state != _tier_state['state']
+    _tier_state['state'] = state
+    now = clock()
+    due = ['1s']
+    if changed or now - _tier_state['ten_second_sent'] >= 10:
+        _tier_state['ten_second_sent'] = now
+        due.append('10s')
+    if changed:
+        due.append('transitions')
+    return due
+
+def state_snapshot():
+    """Everything the web process needs to serve pages without probing itself"""
+    return {
+        'is_online': is_online,
+        'is_degraded': is_degraded,
+        'in_maintenance': in_maintenance,
+        'degradation': degradation.as_dict(),
+        'alerts': alert_dispatcher.stats() if alert_dispatcher is not None else {},
+        'locations': locations_payload(),
+        'last_check': last_check,
+        'last_online': last_online,
+        'status_history': status_history,
+        'uptime_percentage': uptime_percentage,
+        'state_version': state_version,
+        'last_check_results': last_check_results,
+        'daily_bars': daily_bars.dump(),
+        'event_seq': event_seq,
+        'event_ring': list(event_ring)
+    }
+
+def apply_snapshot(snapshot, payloads):
+    """Adopt a snapshot from the prober child and pass its update on to clients"""
+    global is_online, is_degraded, in_maintenance, degradation_stats, alert_stats, location_stats, last_check, last_online
+    global status_history, uptime_percentage, state_version, last_check_results, last_probe_monotonic, event_seq, event_ring
+    is_online = snapshot['is_online']
+    is_degraded = snapshot['is_degraded']
+    in_maintenance = snapshot['in_maintenance']
+    degradation_stats = snapshot['degradation']
+    alert_stats = snapshot['alerts']
+    location_stats = snapshot['locations']
+    last_check = snapshot['last_check']
+    last_online = snapshot['last_online']
+    status_history = snapshot['status_history']
+    uptime_percentage = snapshot['uptime_percentage']
+    with state_changed:
+        if state_version != snapshot['state_version']:
+            state_version = snapshot['state_version']
+            state_changed.notify_all()
+    last_check_results = snapshot['last_check_results']
+    daily_bars.load(*snapshot['daily_bars'])
+    event_seq = snapshot['event_seq']
+    event_ring = deque(snapshot['event_ring'], maxlen=EVENT_RING_SIZE)
+    last_probe_monotonic = time.monotonic()
+    _tier_state['payloads'] = payloads
+    emit_status(due_tiers(current_state()), payloads)
+
+def publish_snapshots():
+    """In the prober child: send the newest snapshot to the web process whenever there is one"""
+    while True:
+        _snapshot_ready.wait()
+        _snapshot_ready.clear()
+        try:
+            prober_snapshots.send(_latest_snapshot[0])
+        except OSError:
+            log_event('prober_orphaned', logging.WARNING)
+            event_log.stop()
+            os._exit(0)
+
+def run_prober_process(snapshots, commands):
+    """Entry point of the prober child: probe, keep the state and publish it after every probe"""
+    global prober_snapshots
+    prober_snapshots = snapshots
+    threading.Thread(target=publish_snapshots, daemon=True).start()
+    threading.Thread(target=receive_prober_commands, args=(commands,), daemon=True).start()
+    start_probing()
+    scheduler.join()
+
+def receive_prober_commands(commands):
+    """In the prober child: apply results the web process received on /ingest"""
+    while True:
+        try:
+            location, rows = commands.recv()
+        except EOFError:
+            log_event('prober_orphaned', logging.WARNING)
+            event_log.stop()
+            os._exit(0)
+        update_location(location, rows)
+
+def supervise_prober_process():
+    """In the web process: run the prober child, apply its snapshots and restart it if it dies"""
+    global prober_commands
+    context = multiprocessing.get_context('spawn')
+    while True:
+        snapshots_in, snapshots_out = context.Pipe(duplex=False)
+        commands_in, commands_out = context.Pipe(duplex=False)
+        # The child re-imports this module; the flag keeps it from starting a web-side scheduler job
+        os.environ['PTASTATUS_PROBER_CHILD'] = '1'
+        process = context.Process(target=run_prober_process, args=(snapshots_out, commands_in), daemon=True, name='prober')
+        process.start()
+        del os.environ['PTASTATUS_PROBER_CHILD']
+        snapshots_out.close()
+        commands_in.close()
+        with prober_commands_lock:
+            prober_commands = commands_out
+
+        while True:
+            try:
+                snapshot, payloads = snapshots_in.recv()
+            except EOFError:
+                break
+            apply_snapshot(snapshot, payloads)
+
+        process.join(5)
+        log_event('prober_restarted', logging.WARNING, exitcode=process.exitcode)
+        with prober_commands_lock:
+            prober_commands = None
+        time.sleep(1)
+
+STATE_ALERT_TEXT = {'online': "back ONLINE", 'degraded': "DEGRADED (slow or failing checks)", 'offline': "OFFLINE"}
+
+def send_status_alert(state, check_time):
+    """Queue a transition alert; never blocks the probe loop"""
+    if alert_dispatcher is None:
+        return
+    alert_dispatcher.notify('status', f"{BOT_NAME} is {STATE_ALERT_TEXT[state]} as of {ph_time_format(check_time)}", check_time)
+
+def failed_check_share(check_results):
+    """Share of this probe's checks that failed (optional checks can fail while the bot is up)"""
+    if not check_results:
+        return 0.0
+    return sum(1 for result in check_results if not result.ok) / len(check_results)
+
+def bot_latency(check_results, latency_ms):
+    """Latency of the bot itself: the slowest required HTTP check, else the slowest required check.
+
+    The probe's wall time is that of its slowest check, which may be a DNS or
+    TLS lookup against someone else's host; only without check results
+    (replays) is it used as is.
+    """
+    required = [result for result in check_results if result.required]
+    http = [result for result in required if result.kind == 'http']
+    if http or required:
+        return max(result.latency_ms for result in http or required)
+    return latency_ms
+
+def record_probe(current_status, latency_ms, check_results=()):
+    """Feed one probe outcome through the history, uptime, daily bars and broadcast.
+
+    Everything reads time from clock(), so replay mode can drive this with
+    recorded outcomes on a virtual clock.
+    """
+    global last_check, is_online, is_degraded, in_maintenance, last_online, status_history, uptime_percentage
+    global last_check_results, event_seq
+
+    # Record check time
+    now = clock()
+    last_check = now
+    last_check_results = list(check_results)
+    record_raw_probe(now, current_status, latency_ms)
     
-    # Convert to Philippine time
-    ph_tz = pytz.timezone('Asia/Manila')
+    # Update status info
+    if current_status:
+        last_online = now
+        
+    # Planned maintenance is one bisect per probe; the index is only rebuilt here when the
+    # clock has left the expanded range (replay), normally the hourly job keeps it current
+    if maintenance.windows and maintenance.stale(now):
+        maintenance.refresh(now)
+    under_maintenance = maintenance.window_at(now) is not None
+
+    # O(1) per probe; a latency or error-rate excursion marks a bot that is up as degraded.
+    # Deploys are slow on purpose, so maintenance never feeds the detector's baseline.
+    degraded = not under_maintenance and degradation.update(
+        current_status, bot_latency(check_results, latency_ms), failed_check_share(check_results)) and current_status
+    state = status_state(current_status, degraded, under_maintenance)
+
+    # Only add to history if the state changed
+    previous_state = current_state()
+    status_changed = not status_history or previous_state != state
+    # No alerts for going into maintenance or coming out of it healthy
+    if status_changed and status_history and state != 'maintenance' and not (previous_state == 'maintenance' and state == 'online'):
+        send_status_alert(state, now)
+    if status_changed:
+        status_history.append({
+            'timestamp': now,
+            'status': current_status,
+            'state': state
+        })
+        
+        # Keep history at reasonable size
+        if len(status_history) > MAX_HISTORY_ENTRIES:
+            status_history.pop(0)
+
+        event_seq += 1
+        event_ring.append((event_seq, now, state))
     
-    # Make sure datetime is timezone-aware
-    if dt.tzinfo is None:
-        # If no timezone info, assume it's in server local time
-        # and convert to UTC first
-        dt = datetime.fromtimestamp(dt.timestamp(), pytz.UTC)
+    is_online = current_status
+    is_degraded = degraded
+    in_maintenance = under_maintenance
+    record_daily_probe(now, current_status, new_incident=status_changed and state == 'offline', degraded=degraded,
+                       maintenance=under_maintenance)
     
-    # Convert to Philippine time
-    dt_ph = dt.astimezone(ph_tz)
+    # Calculate uptime based on history, leaving maintenance out
+    if len(status_history) > 1:
+        history_percentage = history_uptime(status_history)
+        if history_percentage is not None:
+            uptime_percentage = history_percentage
+
+    if status_changed:
+        bump_state_version()
     
-    # Format in 12-hour format with AM/PM
-    return dt_ph.strftime('%Y-%m-%d %I:%M:%S %p')
+    broadcast_status()
+
+def location_store_path(name):
+    return f"{PROBE_STORE_PATH}.{name}"
+
+def update_location(name, results, store=True):
+    """Apply a time-ordered batch of (epoch, ok, latency_ms) results from one location.
+
+    The whole batch is applied under one lock acquisition and written to the
+    location's raw store with a single write. For stored locations, results
+    at or before the newest one (a re-sent batch) are dropped, so the store
+    stays in time order for its binary search. Returns how many were applied.
+    """
+    with locations_lock:
+        location = locations.get(name)
+        if location is None:
+            location_store = ProbeStore(location_store_path(name)) if store else None
+            location = locations[name] = {
+                'timestamp': location_store.last_epoch() if location_store is not None else None,
+                'ok': None,
+                'latency_ms': None,
+                'received': None,
+                'store': location_store
+            }
+        if location['store'] is not None and location['timestamp'] is not None:
+            fresh = [result for result in results if result[0] > location['timestamp']]
+            if len(fresh) < len(results):
+                log_event('ingest_stale_results', logging.WARNING, location=name, dropped=len(results) - len(fresh))
+            results = fresh
+        if not results:
+            return 0
+        location['timestamp'], location['ok'], location['latency_ms'] = results[-1]
+        location['received'] = time.monotonic()
+        location_store = location['store']
+
+    if location_store is not None:
+        location_store.append_many(results)
+    return len(results)
+
+def quorum_status(local_status):
+    """Combine the fresh locations: down only when QUORUM (default a majority, at most all) of them say so"""
+    now = time.monotonic()
+    with locations_lock:
+        fresh = [location['ok'] for location in locations.values()
+                 if location['received'] is not None and now - location['received'] <= LOCATION_STALE_AFTER]
+    if len(fresh) <= 1:
+        return local_status
+    if QUORUM > len(fresh):
+        # More votes than there are locations would never let the bot be reported down
+        log_event('quorum_capped', logging.WARNING, quorum=QUORUM, fresh_locations=len(fresh))
+    needed = min(QUORUM, len(fresh)) if QUORUM else len(fresh) // 2 + 1
+    down_votes = sum(1 for ok in fresh if not ok)
+    return down_votes < needed
+
+def locations_payload():
+    now = time.monotonic()
+    with locations_lock:
+        return [
+            {
+                'name': name,
+                'ok': location['ok'],
+                'age': round(now - location['received'], 1),
+                'latency_ms': round(location['latency_ms'], 1)
+            }
+            for name, location in sorted(locations.items())
+        ]
+
+def current_locations():
+    """locations_payload() here, or from the prober child's latest snapshot in process mode"""
+    return locations_payload() if OWNS_STATE else location_stats
 
 def check_bot_status():
-    global last_check, is_online, last_online, status_history, uptime_percentage
+    """One probe: run the checks, let remote locations vote and record the outcome"""
+    global last_probe_monotonic
     
-    while True:
-        try:
-            # Record check time
-            check_time = datetime.now(pytz.timezone('Asia/Manila'))
-            last_check = check_time
-            
-            # Try to reach the bot URL
-            response = requests.get(BOT_URL, timeout=5)
-            current_status = response.status_code == 200
-            
-            # Update status info
-            if current_status:
-                last_online = check_time
-                
-            # Only add to history if status changed
-            if not status_history or is_online != current_status:
-                status_history.append({
-                    'timestamp': check_time,
-                    'status': current_status
-                })
-                
-                # Keep history at reasonable size
-                if len(status_history) > MAX_HISTORY_ENTRIES:
-                    status_history.pop(0)
-            
-            is_online = current_status
-            
-            # Calculate uptime based on history
-            if len(status_history) > 1:
-                online_count = sum(1 for entry in status_history if entry['status'])
-                uptime_percentage = (online_count / len(status_history)) * 100
-            
-            # Emit real-time update to all clients
-            socketio.emit('status_update', {
-                'is_online': is_online,
-                'last_online': ph_time_format(last_online),
-                'last_check': ph_time_format(last_check),
-                'uptime_percentage': round(uptime_percentage, 2),
-                'server_time': f"{platform.system()} {platform.release()}",  # Update this line
-                'uptime': str(datetime.now() - start_time).split('.')[0],
-                'recent_history': [
-                    {
-                        'timestamp': ph_time_format(entry['timestamp']),
-                        'status': entry['status']
-                    }
-                    for entry in list(reversed(status_history))[:10]
-                ]
-            })
-            
-        except Exception as e:
-            print(f"Error checking status: {e}")
-            is_online = False
-            
-            # Add to history if this is a change
-            if not status_history or status_history[-1]['status'] != False:
-                status_history.append({
-                    'timestamp': datetime.now(),
-                    'status': False
-                })
-                
-                # Keep history at reasonable size
-                if len(status_history) > MAX_HISTORY_ENTRIES:
-                    status_history.pop(0)
-                    
-            # Emit error update
-            socketio.emit('status_update', {
-                'is_online': False,
-                'last_online': ph_time_format(last_online),
-                'last_check': ph_time_format(last_check),
-                'uptime_percentage': round(uptime_percentage, 2),
-                'server_time': f"{platform.system()} {platform.release()}",  # Update this line
-                'uptime': str(datetime.now() - start_time).split('.')[0],
-                'recent_history': [
-                    {
-                        'timestamp': ph_time_format(entry['timestamp']),
-                        'status': entry['status']
-                    }
-                    for entry in list(reversed(status_history))[:10]
-                ]
-            })
-        
-        time.sleep(CHECK_INTERVAL)
+    probe_started = time.perf_counter()
+    try:
+        # Run every configured check concurrently
+        current_status, check_results = check_runner.run()
+    except Exception as e:
+        log_event('probe_error', logging.ERROR, error=str(e))
+        current_status, check_results = False, []
+    latency_ms = (time.perf_counter() - probe_started) * 1000
+
+    try:
+        # Our own result is one vote; remote probers may outvote it
+        update_location(PROBER_LOCATION, [(clock(), current_status, latency_ms)], store=False)
+        current_status = quorum_status(current_status)
+        record_probe(current_status, latency_ms, check_results)
+    except Exception as e:
+        log_event('record_error', logging.ERROR, exc_info=True, error=str(e))
+    
+    last_probe_monotonic = time.monotonic()
+
+def start_probing():
+    """Probe every CHECK_INTERVAL seconds on the scheduler's grid, starting now"""
+    scheduler.add_job('probe', check_bot_status, CHECK_INTERVAL, delay=0)
+
+remote_pending = deque(maxlen=REMOTE_BUFFER_SIZE)  # Results a remote prober has not pushed yet
+remote_pending_lock = threading.Lock()
+remote_session = requests.Session()
+
+def remote_probe():
+    """Probe like check_bot_status, but queue the result for the aggregator instead of serving it"""
+    probe_started = time.perf_counter()
+    try:
+        current_status, _ = check_runner.run()
+    except Exception as e:
+        log_event('probe_error', logging.ERROR, error=str(e))
+        current_status = False
+    latency_ms = (time.perf_counter() - probe_started) * 1000
+    with remote_pending_lock:
+        remote_pending.append([round(time.time(), 3), current_status, round(latency_ms, 1)])
+
+def push_remote_results():
+    """Send queued results in one batch; keep them (newest first to survive) when the push fails"""
+    with remote_pending_lock:
+        batch = list(remote_pending)
+        remote_pending.clear()
+    if not batch:
+        return
+    try:
+        response = remote_session.post(
+            AGGREGATOR_URL.rstrip('/') + '/ingest',
+            json={'location': PROBER_LOCATION, 'results': batch},
+            headers={'Authorization': f"Bearer {INGEST_TOKEN}"},
+            timeout=10
+        )
+        pushed = response.status_code == 200
+        if not pushed:
+            log_event('push_failed', logging.WARNING, status=response.status_code, pending=len(batch))
+    except requests.RequestException as e:
+        log_event('push_failed', logging.WARNING, error=str(e), pending=len(batch))
+        pushed = False
+    if not pushed:
+        with remote_pending_lock:
+            retained = batch + list(remote_pending)
+            remote_pending.clear()
+            remote_pending.extend(retained)
+
+def start_remote_prober():
+    scheduler.add_job('remote_probe', remote_probe, CHECK_INTERVAL, delay=0)
+    scheduler.add_job('push_results', push_remote_results, PUSH_INTERVAL)
 
 # HTML template for status page (enhanced with real-time updates)
 STATUS_PAGE = '''
@@ -248,6 +939,7 @@ STATUS_PAGE = '''
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    {% if static_snapshot %}<meta http-equiv="refresh" content="30">{% endif %}
     <title>PTA Bot Status</title>
     <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0-beta3/css/all.min.css">
     <style>
@@ -258,6 +950,10 @@ STATUS_PAGE = '''
             --success-light: rgba(0, 200, 83, 0.15);
             --danger: #ff3d00;         /* Bright red for negative indicators */
             --danger-light: rgba(255, 61, 0, 0.15);
+            --warning: #ffab00;        /* Amber for degraded service */
+            --warning-light: rgba(255, 171, 0, 0.15);
+            --info: #2f81f7;           /* Blue for scheduled maintenance */
+            --info-light: rgba(47, 129, 247, 0.15);
             --background: #0d1117;     /* Darker black for background */
             --card-bg: #161b22;        /* Elevated card background */
             --card-bg-hover: #21262d;  /* Hover state for cards */
@@ -422,6 +1118,18 @@ STATUS_PAGE = '''
             border-color: var(--danger);
         }
 
+        .status-indicator.degraded {
+            background-color: var(--warning-light);
+            color: var(--warning);
+            border-color: var(--warning);
+        }
+
+        .status-indicator.maintenance {
+            background-color: var(--info-light);
+            color: var(--info);
+            border-color: var(--info);
+        }
+
         .status-indicator::after {
             content: '';
             position: absolute;
@@ -514,6 +1222,42 @@ STATUS_PAGE = '''
             z-index: 2;
         }
 
+        /* 90-day availability strip */
+        .daily-bars-section {
+            margin-bottom: 1.25rem;
+        }
+
+        .daily-bars {
+            display: flex;
+            gap: 2px;
+            height: 34px;
+            align-items: stretch;
+        }
+
+        .daily-bar {
+            flex: 1;
+            border-radius: 2px;
+            background-color: var(--accent);
+        }
+
+        .daily-bar:hover {
+            filter: brightness(1.3);
+        }
+
+        .daily-bar.good { background-color: var(--success); }
+        .daily-bar.minor { background-color: #9be34d; }
+        .daily-bar.partial { background-color: #ffb300; }
+        .daily-bar.major { background-color: var(--danger); }
+
+        .daily-bars-legend {
+            display: flex;
+            justify-content: space-between;
+            color: var(--text-muted);
+            font-size: 0.75rem;
+            margin-top: 0.35rem;
+            font-family: 'Fira Code', monospace;
+        }
+
         /* Information sections styled like trading terminals */
         .info-section {
             background-color: #1a1d24;
@@ -541,6 +1285,27 @@ STATUS_PAGE = '''
             pointer-events: none;
         }
 
+        .maintenance-entry {
+            display: flex;
+            justify-content: space-between;
+            gap: 1rem;
+            padding: 0.4rem 0.6rem;
+            border-left: 3px solid var(--info);
+            margin-bottom: 0.4rem;
+            font-size: 0.85rem;
+            position: relative;
+            z-index: 1;
+        }
+
+        .maintenance-entry.active {
+            background-color: var(--info-light);
+        }
+
+        .maintenance-time {
+            color: var(--text-muted);
+            font-family: 'Fira Code', monospace;
+        }
+
         .info-section h2 {
             font-size: 1rem; /* Reduced from 1.1rem */
             margin-bottom: 0.75rem; /* Reduced from 1rem */
@@ -762,6 +1527,14 @@ STATUS_PAGE = '''
             border-left-color: var(--danger);
         }
 
+        .history-entry.degraded {
+            border-left-color: var(--warning);
+        }
+
+        .history-entry.maintenance {
+            border-left-color: var(--info);
+        }
+
         @keyframes slideIn {
             from {
                 opacity: 0;
@@ -807,6 +1580,18 @@ STATUS_PAGE = '''
             border: 1px solid var(--danger);
         }
 
+        .history-status.degraded {
+            color: var(--warning);
+            background-color: var(--warning-light);
+            border: 1px solid var(--warning);
+        }
+
+        .history-status.maintenance {
+            color: var(--info);
+            background-color: var(--info-light);
+            border: 1px solid var(--info);
+        }
+
         .history-status i {
             margin-right: 0.25rem;
         }
@@ -1044,13 +1829,13 @@ STATUS_PAGE = '''
         
         <div class="content">
             <div class="status-card">
-                <div id="status" class="status-indicator {{ 'online' if is_online else 'offline' }}">
-                    <i class="fas {{ 'fa-circle-check' if is_online else 'fa-circle-exclamation' }} mr-2"></i>
-                    {{ "ONLINE" if is_online else "OFFLINE" }}
+                <div id="status" class="status-indicator {{ state }}">
+                    <i class="fas {{ state_icons[state] }} mr-2"></i>
+                    {{ state|upper }}
                 </div>
                 
                 <p id="status-message" class="status-message">
-                    {{ "The PTA Student Bot is currently running and serving members." if is_online else "The PTA Bot is currently offline or experiencing issues." }}
+                    {{ state_messages[state] }}
                 </p>
                 
                 <div id="last-seen-container" style="{{ 'display: none;' if is_online else '' }}">
@@ -1062,6 +1847,30 @@ STATUS_PAGE = '''
                 <div id="uptime-fill" class="uptime-fill" style="width: {{ uptime_percentage }}%;"></div>
                 <div id="uptime-text" class="uptime-text">{{ "%.2f"|format(uptime_percentage) }}% Uptime</div>
             </div>
+
+            <div class="daily-bars-section">
+                <div id="daily-bars" class="daily-bars">
+                    {% for bar in daily_bars %}
+                        <div class="daily-bar {{ bar.level }}" title="{{ bar.date }}: {{ 'No data' if bar.uptime is none else '%.2f%% uptime, %d incident(s)'|format(bar.uptime, bar.incidents) }}{% if bar.degraded_seconds %}, {{ (bar.degraded_seconds / 60)|round|int }} min degraded{% endif %}{% if bar.maintenance_seconds %}, {{ (bar.maintenance_seconds / 60)|round|int }} min maintenance{% endif %}"></div>
+                    {% endfor %}
+                </div>
+                <div class="daily-bars-legend">
+                    <span>{{ daily_bars|length }} days ago</span>
+                    <span>Today</span>
+                </div>
+            </div>
+            
+            {% if upcoming_maintenance %}
+            <div class="info-section">
+                <h2><i class="fas fa-screwdriver-wrench"></i> Scheduled Maintenance</h2>
+                {% for window in upcoming_maintenance %}
+                    <div class="maintenance-entry{{ ' active' if window.active else '' }}">
+                        <span>{{ window.titles|join(', ') }}{{ ' (in progress)' if window.active else '' }}</span>
+                        <span class="maintenance-time">{{ ph_time_format(window.start) }} – {{ ph_time_format(window.end) }}</span>
+                    </div>
+                {% endfor %}
+            </div>
+            {% endif %}
             
             <div class="info-section">
                 <h2><i class="fas fa-info-circle"></i> System Information</h2>
@@ -1087,7 +1896,7 @@ STATUS_PAGE = '''
                     
                     <div class="info-item">
                         <span class="info-label"><i class="fas fa-hourglass-half"></i> System Uptime</span>
-                        <span id="uptime" class="info-value">{{ str(datetime.now() - start_time).split('.')[0] }}</span>
+                        <span id="uptime" class="info-value">{{ uptime }}</span>
                     </div>
                 </div>
             </div>
@@ -1100,11 +1909,11 @@ STATUS_PAGE = '''
                 <div id="history-entries" class="history-entries collapsed">
                     {% for entry in status_history|reverse %}
                         {% if loop.index <= 10 %}
-                            <div class="history-entry {{ 'online' if entry.status else 'offline' }}" style="animation-delay: {{ loop.index * 0.1 }}s;">
+                            <div class="history-entry {{ entry.state }}" style="animation-delay: {{ loop.index * 0.1 }}s;">
                                 <span class="history-timestamp">{{ ph_time_format(entry.timestamp) }}</span>
-                                <span class="history-status {{ 'online' if entry.status else 'offline' }}">
-                                    <i class="fas {{ 'fa-circle-check' if entry.status else 'fa-circle-exclamation' }}"></i>
-                                    {{ "ONLINE" if entry.status else "OFFLINE" }}
+                                <span class="history-status {{ entry.state }}">
+                                    <i class="fas {{ state_icons[entry.state] }}"></i>
+                                    {{ entry.state|upper }}
                                 </span>
                             </div>
                         {% endif %}
@@ -1114,7 +1923,7 @@ STATUS_PAGE = '''
             
             <div class="connection-status">
                 <div>
-                    <i class="fas fa-clock"></i> Last update: <span id="last-update">{{ ph_time_format(datetime.now()).split(' ')[1] }}</span>
+                    <i class="fas fa-clock"></i> Last update: <span id="last-update">{{ ph_time_format(now).split(' ', 1)[1] }}</span>
                 </div>
                 <div id="connection-status" class="connected">
                     <i class="fas fa-plug"></i> Connecting to server...
@@ -1122,7 +1931,7 @@ STATUS_PAGE = '''
             </div>
 
             <div class="footer">
-                <p>© {{ datetime.now().year }} Prodigy Trading Academy | Bot Version: {{ bot_version }}</p>
+                <p>© {{ ph_time_format(now)[:4] }} Prodigy Trading Academy | Bot Version: {{ bot_version }}</p>
             </div>
         </div>
     </div>
@@ -1130,12 +1939,23 @@ STATUS_PAGE = '''
     <script>
         document.addEventListener('DOMContentLoaded', function() {
             // Create socket with polling transport only
+            // Sequence number of the newest transition we have seen, sent on reconnect to catch up
+            let lastSeq = null;
+            
+            // A static snapshot served by nginx/CDN has no Socket.IO server behind it; it reloads itself instead
+            const staticSnapshot = {{ 'true' if static_snapshot else 'false' }};
+            
             const socket = io({
+                autoConnect: !staticSnapshot,
                 transports: ['polling'],
-                upgrade: false  // Disable transport upgrades
+                upgrade: false,  // Disable transport upgrades
+                reconnectionDelayMax: 10000,  // Keep retrying with backoff instead of giving up
+                auth: (cb) => cb({
+                    encoding: 'compact',  // Positional status_compact frames instead of status_update objects
+                    tier: document.hidden ? 'transitions' : '1s',
+                    since: lastSeq
+                })
             });
-            let reconnectAttempts = 0;
-            const maxReconnectAttempts = 5;
             
             // Apply dynamic animation to history entries
             const historyEntries = document.querySelectorAll('.history-entry');
@@ -1143,47 +1963,127 @@ STATUS_PAGE = '''
                 entry.style.animationDelay = `${index * 0.1}s`;
             });
             
+            // Hidden tabs only need to hear about transitions; visible ones get every tick
+            function subscribeForVisibility() {
+                socket.emit('subscribe', {tier: document.hidden ? 'transitions' : '1s'});
+            }
+            document.addEventListener('visibilitychange', function() {
+                if (socket.connected) {
+                    subscribeForVisibility();
+                }
+            });
+            
             socket.on('connect', function() {
                 const connectionStatus = document.getElementById('connection-status');
                 connectionStatus.innerHTML = '<i class="fas fa-plug"></i> Connected to server';
                 connectionStatus.className = 'connected';
-                reconnectAttempts = 0;
             });
             
-            socket.on('disconnect', function() {
+            socket.on('resume', function(data) {
+                const connectionStatus = document.getElementById('connection-status');
+                if (data.gap) {
+                    connectionStatus.innerHTML = '<i class="fas fa-plug"></i> Reconnected, status reloaded';
+                } else if (data.events.length) {
+                    const changes = data.events.length === 1 ? 'status change' : 'status changes';
+                    connectionStatus.innerHTML = `<i class="fas fa-plug"></i> Reconnected, caught up on ${data.events.length} ${changes}`;
+                }
+                lastSeq = data.seq;
+            });
+            
+            socket.on('disconnect', function(reason) {
                 const connectionStatus = document.getElementById('connection-status');
                 connectionStatus.innerHTML = '<i class="fas fa-plug-circle-exclamation"></i> Disconnected, attempting to reconnect...';
                 connectionStatus.className = 'disconnected';
                 
-                if (reconnectAttempts < maxReconnectAttempts) {
-                    reconnectAttempts++;
-                    setTimeout(() => {
-                        socket.connect();
-                    }, 2000);
-                } else {
-                    connectionStatus.textContent = 'Failed to reconnect. Please refresh the page.';
+                // The client retries network failures by itself, but not a disconnect the server asked for
+                if (reason === 'io server disconnect') {
+                    setTimeout(() => socket.connect(), 2000);
                 }
             });
             
-            socket.on('status_update', function(data) {
+            // Format epoch seconds the way the server does, e.g. 2026-10-16 01:02:03 PM (Manila time)
+            const phFormatter = new Intl.DateTimeFormat('en-US', {
+                timeZone: 'Asia/Manila',
+                year: 'numeric', month: '2-digit', day: '2-digit',
+                hour: '2-digit', minute: '2-digit', second: '2-digit',
+                hour12: true
+            });
+            function formatPH(epoch) {
+                if (!epoch) {
+                    return 'Never';
+                }
+                const parts = {};
+                phFormatter.formatToParts(new Date(epoch * 1000)).forEach(part => parts[part.type] = part.value);
+                return `${parts.year}-${parts.month}-${parts.day} ${parts.hour}:${parts.minute}:${parts.second} ${parts.dayPeriod}`;
+            }
+            
+            // Same text as Python's str(timedelta), e.g. "2 days, 3:04:05"
+            function formatDuration(seconds) {
+                const days = Math.floor(seconds / 86400);
+                const hours = Math.floor(seconds % 86400 / 3600);
+                const clock = `${hours}:${String(Math.floor(seconds % 3600 / 60)).padStart(2, '0')}:${String(seconds % 60).padStart(2, '0')}`;
+                return days ? `${days} day${days === 1 ? '' : 's'}, ${clock}` : clock;
+            }
+            
+            const COMPACT_STATES = ['offline', 'online', 'degraded', 'maintenance'];
+            const STATE_ICONS = {{ state_icons|tojson }};
+            const STATE_MESSAGES = {{ state_messages|tojson }};
+            
+            // Expand a status_compact frame into the status_update shape
+            function decodeCompact(frame) {
+                const [version, flags, lastCheck, lastOnline, uptimeCenti, uptimeSeconds, history, seq] = frame;
+                const recentHistory = [];
+                for (let i = 0; i < history.length; i += 2) {
+                    const state = COMPACT_STATES[history[i + 1]];
+                    recentHistory.push({timestamp: history[i], status: state !== 'offline', state: state});
+                }
+                return {
+                    is_online: (flags & 1) === 1,
+                    is_degraded: (flags & 2) === 2,
+                    in_maintenance: (flags & 4) === 4,
+                    state: (flags & 4) ? 'maintenance' : (flags & 1) ? ((flags & 2) ? 'degraded' : 'online') : 'offline',
+                    last_check: lastCheck,
+                    last_online: lastOnline,
+                    uptime_percentage: uptimeCenti / 100,
+                    uptime: uptimeSeconds,
+                    server_time: document.getElementById('server-time').textContent,
+                    recent_history: recentHistory,
+                    seq: seq
+                };
+            }
+            
+            socket.on('status_compact', function(frame) {
+                applyStatus(decodeCompact(frame));
+            });
+            
+            socket.on('status_update', applyStatus);
+            
+            function applyStatus(status) {
+                // The server sends epochs and seconds; format them for display here
+                const data = Object.assign({}, status, {
+                    last_check: formatPH(status.last_check),
+                    last_online: formatPH(status.last_online),
+                    uptime: formatDuration(status.uptime),
+                    recent_history: status.recent_history.map(entry => ({timestamp: formatPH(entry.timestamp), status: entry.status, state: entry.state}))
+                });
+                lastSeq = data.seq;
+                
                 // Update status indicator
                 const statusElement = document.getElementById('status');
                 const statusMessageElement = document.getElementById('status-message');
                 const lastSeenContainer = document.getElementById('last-seen-container');
                 
-                // Check if status changed
-                if (statusElement.className !== `status-indicator ${data.is_online ? 'online' : 'offline'}`) {
-                    // Update class name to reflect new status
-                    statusElement.className = `status-indicator ${data.is_online ? 'online' : 'offline'}`;
+                // Check if state changed
+                if (statusElement.className !== `status-indicator ${data.state}`) {
+                    // Update class name to reflect new state
+                    statusElement.className = `status-indicator ${data.state}`;
                     
                     // Update icon and text
-                    statusElement.innerHTML = `<i class="fas ${data.is_online ? 'fa-circle-check' : 'fa-circle-exclamation'} mr-2"></i>
-                                            ${data.is_online ? 'ONLINE' : 'OFFLINE'}`;
+                    statusElement.innerHTML = `<i class="fas ${STATE_ICONS[data.state]} mr-2"></i>
+                                            ${data.state.toUpperCase()}`;
                     
                     // Update status message
-                    statusMessageElement.textContent = data.is_online ? 
-                        "The PTA Student Bot is currently running and serving members." : 
-                        "The PTA Student Bot is currently offline or experiencing issues.";
+                    statusMessageElement.textContent = STATE_MESSAGES[data.state];
                         
                     // Show/hide last seen container
                     lastSeenContainer.style.display = data.is_online ? 'none' : '';
@@ -1272,7 +2172,7 @@ STATUS_PAGE = '''
                     
                     data.recent_history.forEach((entry, index) => {
                         const entryElement = document.createElement('div');
-                        entryElement.className = `history-entry ${entry.status ? 'online' : 'offline'}`;
+                        entryElement.className = `history-entry ${entry.state}`;
                         
                         // Only apply animation class if first load or new entry
                         if (previousTimestamps.length === 0 || !previousTimestamps.includes(entry.timestamp)) {
@@ -1285,8 +2185,8 @@ STATUS_PAGE = '''
                         timestampSpan.textContent = entry.timestamp;
                         
                         const statusSpan = document.createElement('span');
-                        statusSpan.className = `history-status ${entry.status ? 'online' : 'offline'}`;
-                        statusSpan.innerHTML = `<i class="fas ${entry.status ? 'fa-circle-check' : 'fa-circle-exclamation'}"></i> ${entry.status ? 'ONLINE' : 'OFFLINE'}`;
+                        statusSpan.className = `history-status ${entry.state}`;
+                        statusSpan.innerHTML = `<i class="fas ${STATE_ICONS[entry.state]}"></i> ${entry.state.toUpperCase()}`;
                         
                         entryElement.appendChild(timestampSpan);
                         entryElement.appendChild(statusSpan);
@@ -1302,39 +2202,31 @@ STATUS_PAGE = '''
                     hour12: true,
                     timeZone: 'Asia/Manila'
                 }).format(new Date());
-            });
-
-            // Update history with animation only on changes
-            const historyContainer = document.getElementById('history-entries');
-            const isCurrentlyExpanded = document.getElementById('history-toggle').getAttribute('data-expanded') === 'true';
-            const previousTimestamps = Array.from(historyContainer.querySelectorAll('.history-entry')).map(
-                entry => entry.querySelector('.history-timestamp').textContent
-            );
-
-            // Don't clear and rebuild on every update
-            if (historyContainer.childElementCount === 0 || 
-                data.recent_history.some(entry => !previousTimestamps.includes(entry.timestamp))) {
-                
-                // Only rebuild if there are new entries
-                historyContainer.innerHTML = '';
-                
-                data.recent_history.forEach((entry, index) => {
-                    // Create entries as before...
+            }
 
-                    // Make sure entries stay collapsed if that was the current state
-                    if (!isCurrentlyExpanded) {
-                        historyContainer.classList.add('collapsed');
-                    }
-                });
+            // Refresh the daily availability strip; the browser revalidates with the ETag
+            function refreshDailyBars() {
+                fetch('/api/uptime/daily')
+                    .then(response => response.json())
+                    .then(data => {
+                        const container = document.getElementById('daily-bars');
+                        container.innerHTML = '';
+                        data.days.forEach(bar => {
+                            const barElement = document.createElement('div');
+                            barElement.className = `daily-bar ${bar.level}`;
+                            barElement.title = bar.uptime === null ?
+                                `${bar.date}: No data` :
+                                `${bar.date}: ${bar.uptime.toFixed(2)}% uptime, ${bar.incidents} incident(s)` +
+                                (bar.degraded_seconds ? `, ${Math.round(bar.degraded_seconds / 60)} min degraded` : '') +
+                                (bar.maintenance_seconds ? `, ${Math.round(bar.maintenance_seconds / 60)} min maintenance` : '');
+                            container.appendChild(barElement);
+                        });
+                    })
+                    .catch(() => {});
+            }
+            if (!staticSnapshot) {
+                setInterval(refreshDailyBars, 5 * 60 * 1000);
             }
-            
-            // Manual refresh button
-            document.getElementById('refresh-btn').addEventListener('click', function() {
-                this.innerHTML = '<i class="fas fa-sync-alt fa-spin"></i> Refreshing...';
-                setTimeout(() => {
-                    location.reload();
-                }, 500);
-            });
 
             document.querySelectorAll('.info-item').forEach((item, index) => {
                 setTimeout(() => {
@@ -1365,12 +2257,38 @@ STATUS_PAGE = '''
 
 @app.route('/')
 def home():
-    # Get environment information
-    environment_info = f"{platform.system()} {platform.release()}"
+    return render_status_page()
+
+def render_status_page():
+    """Render the status page, reusing the cached copy until the state changes or it ages out"""
+    cache_key = state_version
+    now = time.time()
+    if _page_cache['key'] == cache_key and now - _page_cache['rendered_at'] < PAGE_CACHE_TTL:
+        return _page_cache['html']
+
+    html = render_status_html()
+    _page_cache.update(key=cache_key, rendered_at=now, html=html)
+    return html
+
+STATE_ICONS = {'online': 'fa-circle-check', 'degraded': 'fa-triangle-exclamation', 'offline': 'fa-circle-exclamation',
+               'maintenance': 'fa-screwdriver-wrench'}
+STATE_MESSAGES = {
+    'online': "The PTA Student Bot is currently running and serving members.",
+    'degraded': "The PTA Student Bot is running, but responding slower or less reliably than usual.",
+    'offline': "The PTA Student Bot is currently offline or experiencing issues.",
+    'maintenance': "Scheduled maintenance is in progress; the PTA Student Bot may be briefly unavailable."
+}
+
+def render_status_html(static_snapshot=False):
+    _, bars = daily_bars.snapshot()
     
-    return render_template_string(
+    html = render_template_string(
         STATUS_PAGE,
         is_online=is_online,
+        state=current_state(),
+        state_icons=STATE_ICONS,
+        state_messages=STATE_MESSAGES,
+        upcoming_maintenance=maintenance.upcoming(clock(), UPCOMING_MAINTENANCE),
         last_online=last_online,
         last_check=last_check,
         bot_url=BOT_URL,
@@ -1379,23 +2297,439 @@ def home():
         check_interval=CHECK_INTERVAL,
         status_history=status_history,
         uptime_percentage=uptime_percentage,
-        start_time=start_time,
-        datetime=datetime,
-        str=str,
-        environment_info=environment_info,
+        now=clock(),
+        uptime=str(timedelta(seconds=int(clock() - start_epoch))),
+        environment_info=ENVIRONMENT_INFO,
         ph_time_format=ph_time_format,
-        bot_version=BOT_VERSION
+        bot_version=BOT_VERSION,
+        daily_bars=bars,
+        static_snapshot=static_snapshot
     )
+    return html
+
+def write_if_changed(name, body):
+    """Atomically replace SNAPSHOT_DIR/name with body (temp file + rename) unless it already holds it"""
+    digest = hashlib.md5(body).hexdigest()
+    if _static_snapshot['digests'].get(name) == digest:
+        _static_snapshot['unchanged'] += 1
+        return False
+    fd, temp_path = tempfile.mkstemp(dir=SNAPSHOT_DIR, prefix=f'.{name}.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(body)
+        os.chmod(temp_path, 0o644)  # mkstemp creates 0600; the web server needs to read it
+        os.replace(temp_path, os.path.join(SNAPSHOT_DIR, name))
+    except OSError:
+        os.unlink(temp_path)
+        raise
+    _static_snapshot['digests'][name] = digest
+    _static_snapshot['written'] += 1
+    return True
+
+def write_static_snapshot(force=False):
+    """Re-render the read-only views after a state change (or SNAPSHOT_REFRESH) and write the changed ones"""
+    now = time.time()
+    if not force and _static_snapshot['version'] == state_version and now - _static_snapshot['rendered_at'] < SNAPSHOT_REFRESH:
+        return
+    with app.app_context():
+        html = render_status_html(static_snapshot=True)
+    files = {
+        'index.html': html.encode(),
+        'status.json': json.dumps(status_document()).encode(),
+        'badge.svg': render_badge('30d')
+    }
+    for name, body in files.items():
+        write_if_changed(name, body)
+    _static_snapshot.update(version=state_version, rendered_at=now)
+
+if SNAPSHOT_DIR and OWNS_STATE:
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    scheduler.add_job('static_snapshot', write_static_snapshot, 1, delay=0)
+
+def status_document():
+    """The status payload plus its state version, the degradation detector's view and upcoming maintenance"""
+    stats = degradation.as_dict() if OWNS_STATE else degradation_stats
+    return dict(build_status_payload(), version=state_version, degradation=stats,
+                maintenance=maintenance.upcoming(clock(), UPCOMING_MAINTENANCE))
+
+def wait_for_state_change(since, timeout):
+    """Block until state_version differs from `since` or the timeout expires"""
+    with state_changed:
+        state_changed.wait_for(lambda: state_version != since, timeout)
+
+@app.route('/api/status')
+def api_status():
+    """Current status as JSON with an ETag from the state version.
+
+    With ?wait=<seconds>&since=<version> the request is held until the
+    version moves past `since` or the wait runs out, so a watcher only
+    makes one request per change (or per timeout). The ETag is weak: it
+    changes with the state, not with every probe's last_check.
+    """
+    wait = request.args.get('wait', type=float)
+    since = request.args.get('since', type=int)
+    # float() takes "nan", which the clamp below passes through and wait_for() treats as no timeout
+    if wait is not None and not math.isfinite(wait):
+        return Response('wait must be a finite number of seconds\n', status=400, mimetype='text/plain')
+    if wait is not None and since is not None:
+        wait_for_state_change(since, min(max(wait, 0.0), MAX_LONGPOLL_WAIT))
+
+    response = Response(json.dumps(status_document()), mimetype='application/json')
+    response.set_etag(f'v{state_version}', weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+@app.route('/api/uptime/daily')
+def daily_uptime():
+    """Daily availability aggregates as JSON, serialized once per update and served with an ETag"""
+    if _daily_json_cache['version'] != daily_bars.version:
+        version, bars = daily_bars.snapshot()
+        body = json.dumps({'days': bars}, separators=(',', ':')).encode()
+        _daily_json_cache.update(version=version, body=body, etag=hashlib.md5(body).hexdigest())
+
+    response = Response(_daily_json_cache['body'], mimetype='application/json')
+    response.set_etag(_daily_json_cache['etag'])
+    response.headers['Cache-Control'] = 'public, max-age=30'
+    return response.make_conditional(request)
+
+def window_uptime(days):
+    """Uptime percentage over the last `days` daily bars, or None without data"""
+    _, bars = daily_bars.snapshot()
+    up = sum(bar['up_seconds'] for bar in bars[-days:])
+    down = sum(bar['down_seconds'] for bar in bars[-days:])
+    return up / (up + down) * 100 if up + down else None
+
+def cached_embed(name, params, render):
+    """Serve an embed from memory, re-rendering it only when the state changes or it ages out"""
+    cache_key = (name, params)
+    entry = _embed_cache.get(cache_key)
+    now = time.time()
+    if entry is None or entry['key'] != state_version or now - entry['rendered_at'] >= EMBED_CACHE_TTL:
+        body = render()
+        entry = _embed_cache[cache_key] = {
+            'key': state_version,
+            'rendered_at': now,
+            'body': body,
+            'etag': hashlib.md5(body).hexdigest()
+        }
+    return entry
+
+def embed_response(entry, mimetype):
+    response = Response(entry['body'], mimetype=mimetype)
+    response.set_etag(entry['etag'])
+    response.headers['Cache-Control'] = f'public, max-age={EMBED_MAX_AGE}'
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    return response.make_conditional(request)
+
+BADGE_TEMPLATE = '''<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="20" role="img" aria-label="{label}: {value}">
+<title>{label}: {value}</title>
+<linearGradient id="s" x2="0" y2="100%"><stop offset="0" stop-color="#bbb" stop-opacity=".1"/><stop offset="1" stop-opacity=".1"/></linearGradient>
+<clipPath id="r"><rect width="{width}" height="20" rx="3" fill="#fff"/></clipPath>
+<g clip-path="url(#r)"><rect width="{label_width}" height="20" fill="#555"/><rect x="{label_width}" width="{value_width}" height="20" fill="{color}"/><rect width="{width}" height="20" fill="url(#s)"/></g>
+<g fill="#fff" text-anchor="middle" font-family="Verdana,Geneva,DejaVu Sans,sans-serif" font-size="11">
+<text x="{label_x}" y="14">{label}</text><text x="{value_x}" y="14">{value}</text></g>
+</svg>
+'''
+
+BADGE_COLORS = {'online': '#4c1', 'degraded': '#dfb317', 'offline': '#e05d44', 'maintenance': '#007ec6'}  # shields.io palette
+
+def render_badge(window):
+    """Flat shields-style badge: bot name, then status and uptime over the window"""
+    uptime = window_uptime(BADGE_WINDOWS[window])
+    state = current_state()
+    value = f"{state} | {uptime:.2f}% {window}" if uptime is not None else state
+    label = 'PTA Bot'
+    # Verdana 11px averages close to 7px per character
+    label_width = len(label) * 7 + 10
+    value_width = len(value) * 7 + 10
+    return BADGE_TEMPLATE.format(
+        width=label_width + value_width,
+        label_width=label_width,
+        value_width=value_width,
+        label_x=label_width / 2,
+        value_x=label_width + value_width / 2,
+        label=label,
+        value=value,
+        color=BADGE_COLORS[state]
+    ).encode()
+
+@app.route('/badge.svg')
+def badge():
+    """Status badge for READMEs and course pages: /badge.svg?window=30d"""
+    window = request.args.get('window', '30d')
+    if window not in BADGE_WINDOWS:
+        return Response(f"window must be one of {', '.join(BADGE_WINDOWS)}\n", status=400, mimetype='text/plain')
+    return embed_response(cached_embed('badge', window, lambda: render_badge(window)), 'image/svg+xml')
+
+WIDGET_SCRIPT = '''(function () {
+  var data = %s;
+  var script = document.currentScript;
+  var link = document.createElement('a');
+  link.href = data.url;
+  link.target = '_blank';
+  link.rel = 'noopener';
+  link.style.cssText = 'display:inline-flex;align-items:center;gap:6px;padding:4px 10px;border-radius:12px;' +
+    'font:13px/1.4 system-ui,sans-serif;text-decoration:none;color:#fff;background:' +
+    (data.maintenance ? '#1f6feb' : data.online ? (data.degraded ? '#b26a00' : '#2e7d32') : '#c62828');
+  link.textContent = data.name + ' is ' +
+    (data.maintenance ? 'under maintenance' : data.online ? (data.degraded ? 'degraded' : 'online') : 'offline') +
+    (data.uptime === null ? '' : ' \u00b7 ' + data.uptime.toFixed(2) + '%% (30d)');
+  link.title = 'Last checked ' + data.last_check + ' (Philippine time)';
+  if (script && script.parentNode) {
+    script.parentNode.insertBefore(link, script);
+  } else {
+    document.body.appendChild(link);
+  }
+})();
+'''
+
+def render_widget():
+    """Self-contained script that inserts a status pill where it is included; no requests of its own"""
+    data = {
+        'name': BOT_NAME,
+        'online': is_online,
+        'degraded': is_degraded,
+        'maintenance': in_maintenance,
+        'uptime': window_uptime(30),
+        'last_check': ph_time_format(last_check),  # Cached per second, and the widget itself is cached per state
+        'url': APP_URL
+    }
+    # Escape '<' so the data can never close the surrounding <script> element
+    return (WIDGET_SCRIPT % json.dumps(data).replace('<', '\\u003c')).encode()
+
+@app.route('/widget.js')
+def widget():
+    """Embed with <script src=".../widget.js" async></script>"""
+    return embed_response(cached_embed('widget', None, render_widget), 'application/javascript')
+
+HEALTHZ_BODY = b'ok\n'
+HEALTHZ_HEADERS = {'Content-Type': 'text/plain', 'Cache-Control': 'no-store'}
+
+@app.route('/healthz')
+def healthz():
+    """Liveness: the web process is answering requests"""
+    return HEALTHZ_BODY, 200, HEALTHZ_HEADERS
+
+def probe_loop_lag():
+    """Seconds the probe loop is behind its next expected iteration, or None before the first one"""
+    if last_probe_monotonic is None:
+        return None
+    return max(0.0, time.monotonic() - last_probe_monotonic - CHECK_INTERVAL)
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: probes are fresh and the scheduler thread is alive"""
+    lag = probe_loop_lag()
+    probe_fresh = lag is not None and lag < READY_MAX_PROBE_LAG
+    scheduler_alive = scheduler.running
+    ready = probe_fresh and scheduler_alive
+    body = '{"ready":%s,"probe_fresh":%s,"scheduler_alive":%s,"probe_lag":%s}\n' % (
+        'true' if ready else 'false',
+        'true' if probe_fresh else 'false',
+        'true' if scheduler_alive else 'false',
+        'null' if lag is None else '%.3f' % lag,
+    )
+    return body, 200 if ready else 503, {'Content-Type': 'application/json', 'Cache-Control': 'no-store'}
+
+@app.route('/api/realtime')
+def realtime_stats():
+    """Outbound queue depth per connected client, coalesced/dropped totals, admission, log and alert delivery counters"""
+    if OWNS_STATE:
+        alerts = alert_dispatcher.stats() if alert_dispatcher is not None else {}
+    else:
+        alerts = alert_stats
+    body = json.dumps(dict(outbound_queues.stats(), admission=admission.snapshot_stats(), log=event_log.stats(),
+                           alerts=alerts))
+    return body, 200, {'Content-Type': 'application/json', 'Cache-Control': 'no-store'}
+
+@app.route('/api/scheduler')
+def scheduler_stats():
+    """Per-job run counts, missed ticks and start-lag / run-time histograms (milliseconds)"""
+    body = json.dumps({'running': scheduler.running, 'jobs': scheduler.stats()})
+    return body, 200, {'Content-Type': 'application/json', 'Cache-Control': 'no-store'}
+
+def parse_export_time(value):
+    """Accept epoch seconds or ISO 8601 (naive values are Philippine time)"""
+    if value is None or value == '':
+        return None
+    return parse_time(value)
+
+# Backfilled logs without a latency column are stored as NaN; exports write an empty field / null
+def export_csv_rows(store, start, end):
+    yield 'timestamp,time_utc,status,latency_ms\n'
+    for chunk in store.iter_chunks(start, end):
+        yield ''.join(
+            f"{epoch:.3f},{datetime.utcfromtimestamp(epoch).isoformat()}Z,{'up' if status else 'down'},"
+            f"{format(latency_ms, '.1f') if math.isfinite(latency_ms) else ''}\n"
+            for epoch, status, latency_ms in chunk
+        )
+
+def export_ndjson_rows(store, start, end):
+    for chunk in store.iter_chunks(start, end):
+        yield ''.join(
+            f'{{"timestamp":{epoch:.3f},"status":{"true" if status else "false"},'
+            f'"latency_ms":{format(latency_ms, ".1f") if math.isfinite(latency_ms) else "null"}}}\n'
+            for epoch, status, latency_ms in chunk
+        )
+
+def gzip_stream(chunks):
+    """Compress a stream of text chunks on the fly"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+EXPORT_FORMATS = {
+    'csv': (export_csv_rows, 'text/csv'),
+    'ndjson': (export_ndjson_rows, 'application/x-ndjson'),
+}
+
+@app.route('/export/probes.<fmt>')
+def export_probes(fmt):
+    """Stream raw probe history as CSV or NDJSON, optionally limited by ?start=&end=.
+
+    ?location=<name> exports what that remote prober reported instead of
+    this server's own probes.
+    """
+    if fmt not in EXPORT_FORMATS:
+        return Response('Unsupported export format\n', status=404, mimetype='text/plain')
+    try:
+        start = parse_export_time(request.args.get('start'))
+        end = parse_export_time(request.args.get('end'))
+    except ValueError:
+        return Response('start and end must be epoch seconds or ISO 8601\n', status=400, mimetype='text/plain')
+
+    location = request.args.get('location')
+    if location is None:
+        store, filename = probe_store, f"probes.{fmt}"
+    elif LOCATION_NAME_PATTERN.match(location) and os.path.exists(location_store_path(location)):
+        store, filename = ProbeStore(location_store_path(location), writable=False), f"probes-{location}.{fmt}"
+    else:
+        return Response('Unknown location\n', status=404, mimetype='text/plain')
+
+    row_generator, mimetype = EXPORT_FORMATS[fmt]
+    rows = row_generator(store, start, end)
+    headers = {'Content-Disposition': f'attachment; filename={filename}'}
+
+    gzip_param = request.args.get('gzip')
+    accepts_gzip = 'gzip' in request.headers.get('Accept-Encoding', '')
+    if gzip_param == '1' or (gzip_param != '0' and accepts_gzip):
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+        return Response(gzip_stream(rows), mimetype=mimetype, headers=headers)
+    return Response(rows, mimetype=mimetype, headers=headers)
 
 # Start monitoring thread
+@app.route('/ingest', methods=['POST'])
+def ingest():
+    """Accept a batch of results from a remote prober: {"location": "sg", "results": [[epoch, ok, latency_ms], ...]}"""
+    if not INGEST_TOKEN:
+        return Response('Ingest is disabled\n', status=404, mimetype='text/plain')
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {INGEST_TOKEN}"):
+        return Response('Unauthorized\n', status=401, mimetype='text/plain')
+
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return Response('Body must be a JSON object\n', status=400, mimetype='text/plain')
+    location = body.get('location')
+    results = body.get('results')
+    if not isinstance(location, str) or not LOCATION_NAME_PATTERN.match(location) or location == PROBER_LOCATION:
+        return Response('Invalid location\n', status=400, mimetype='text/plain')
+    if not isinstance(results, list):
+        return Response('results must be a list\n', status=400, mimetype='text/plain')
+    if len(results) > MAX_INGEST_BATCH:
+        return Response('Batch too large\n', status=413, mimetype='text/plain')
+    try:
+        rows = sorted((float(epoch), ok, float(latency_ms)) for epoch, ok, latency_ms in results)
+    except (TypeError, ValueError):
+        return Response('Each result must be [epoch, ok, latency_ms]\n', status=400, mimetype='text/plain')
+    if not all(isinstance(ok, bool) for _, ok, _ in rows):
+        return Response('ok must be true or false\n', status=400, mimetype='text/plain')
+    # float() takes "nan" and "inf", which would end up as bare NaN in the JSON sent to browsers
+    if not all(math.isfinite(epoch) and math.isfinite(latency_ms) for epoch, _, latency_ms in rows):
+        return Response('epoch and latency_ms must be finite numbers\n', status=400, mimetype='text/plain')
+    now = clock()
+    if rows and (rows[0][0] < now - MAX_INGEST_AGE or rows[-1][0] > now + MAX_INGEST_SKEW):
+        return Response('epoch is too old or in the future\n', status=400, mimetype='text/plain')
+
+    # Results older than the location's newest are dropped by update_location(); in process mode
+    # that happens in the prober child, so the count there is what was queued
+    with prober_commands_lock:
+        if prober_commands is not None:
+            prober_commands.send((location, rows))
+            accepted = len(rows)
+        else:
+            accepted = update_location(location, rows)
+    return Response(json.dumps({'accepted': accepted}), mimetype='application/json')
+
 @socketio.on('connect')
-def handle_connect():
-    print("Client connected")
+def handle_connect(auth=None):
+    auth = auth if isinstance(auth, dict) else {}
+    tier = auth.get('tier') if auth.get('tier') in UPDATE_TIERS else DEFAULT_UPDATE_TIER
+    encoding = auth.get('encoding') if auth.get('encoding') in UPDATE_ENCODINGS else 'json'
+    log_event('client_connected', tier=tier, encoding=encoding, resumed='since' in auth)
+    client_subscriptions[request.sid] = (tier, encoding)
+    join_room(tier_room(tier, encoding))
+
+    # A reconnecting client says which transition it saw last; replay the ones it missed
+    since = auth.get('since')
+    if isinstance(since, int) and not isinstance(since, bool):
+        events = events_since(since)
+        socketio.emit('resume', {'events': events or [], 'gap': events is None, 'seq': event_seq}, to=request.sid)
+        send_current_status(request.sid, encoding)
+
+@socketio.on('disconnect')
+def handle_disconnect():
+    client_subscriptions.pop(request.sid, None)
+
+@socketio.on('subscribe')
+def handle_subscribe(data):
+    """Move this client to another update tier or encoding and send it the current state right away"""
+    data = data if isinstance(data, dict) else {}
+    current_tier, current_encoding = client_subscriptions.get(request.sid, (DEFAULT_UPDATE_TIER, 'json'))
+    tier = data.get('tier', current_tier)
+    encoding = data.get('encoding', current_encoding)
+    if tier not in UPDATE_TIERS:
+        return {'ok': False, 'error': f"tier must be one of {', '.join(UPDATE_TIERS)}"}
+    if encoding not in UPDATE_ENCODINGS:
+        return {'ok': False, 'error': f"encoding must be one of {', '.join(UPDATE_ENCODINGS)}"}
+    leave_room(tier_room(current_tier, current_encoding))
+    join_room(tier_room(tier, encoding))
+    client_subscriptions[request.sid] = (tier, encoding)
+    send_current_status(request.sid, encoding)
+    return {'ok': True, 'tier': tier, 'encoding': encoding}
+
+def send_current_status(sid, encoding):
+    """Send one client the current state in its encoding"""
+    # The prober child owns the state in process mode, so reuse the last payloads it sent
+    event, build = ENCODING_EVENTS[encoding]
+    if PROBER_PROCESS:
+        payload = _tier_state['payloads'][encoding] if _tier_state['payloads'] else None
+    else:
+        payload = build()
+    if payload is not None:
+        socketio.emit(event, payload, to=sid)
 
 if __name__ == '__main__':
-    # Start the monitoring thread
-    monitor_thread = threading.Thread(target=check_bot_status, daemon=True)
-    monitor_thread.start()
+    if PROBER_MODE == 'remote':
+        # A remote prober only probes and pushes; the aggregator serves the page
+        log_event('remote_prober_started', location=PROBER_LOCATION, aggregator=AGGREGATOR_URL)
+        start_remote_prober()
+        try:
+            scheduler.join()
+        except KeyboardInterrupt:
+            pass
+        scheduler.shutdown()
+        event_log.stop()
+        raise SystemExit(0)
+
+    # Start probing, or the prober process that does it for us
+    if PROBER_PROCESS:
+        threading.Thread(target=supervise_prober_process, daemon=True).start()
+    else:
+        start_probing()
     
     # This will run without warnings
     port = int(os.environ.get('PORT', 8081))
@@ -1404,7 +2738,6 @@ if __name__ == '__main__':
     is_production = os.environ.get('RENDER', False)
     
     # Silence logging
-    import logging
     log = logging.getLogger('werkzeug')
     log.setLevel(logging.ERROR)
     
@@ -1416,10 +2749,18 @@ if __name__ == '__main__':
         
         # Use Waitress in production
         from waitress import serve
-        print(f"Starting production server on port {port}")
+        log_event('server_started', port=port, threads=WAITRESS_THREADS)
         
         # Serve the application with Waitress
-        serve(app, host='0.0.0.0', port=port)
+        try:
+            serve(app, host='0.0.0.0', port=port, threads=WAITRESS_THREADS, connection_limit=WAITRESS_CONNECTION_LIMIT)
+        finally:
+            scheduler.shutdown()
+            event_log.stop()
     else:
         # Use development server locally
-        socketio.run(app, host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
+        try:
+            socketio.run(app, host='0.0.0.0', port=port, debug=False)
+        finally:
+            scheduler.shutdown()
+            event_log.stop()
\ No newline at end of file
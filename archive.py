@@ -0,0 +1,257 @@
+"""Memory-mapped long-term probe archive.
+
+Each target gets one file made of a page-aligned header followed by
+fixed-size day segments. A segment holds one slot per second of the
+(Philippine) day:
+
+    status bits   86400 bits, 1 = online
+    known bits    86400 bits, 1 = a probe landed in this second
+    latency       86400 bytes, log-quantized milliseconds (0 = no reading)
+
+That is 108,000 bytes per day padded to 110,592 (27 pages), or about
+40 MB for a year at a 1-second cadence. A range read maps the file and
+slices only the bytes for the requested seconds, so only those pages are
+touched.
+
+A new archive starts at the first day written to it. Writing an older
+day (backfill of old logs) prepends segments and moves the start back;
+writing a newer one appends. Either way the file only covers days
+between the oldest and newest probe, and is sparse where nobody wrote.
+The monitor and backfill may have the same file open: every operation
+holds an flock and re-reads the header and file size first, so a start
+moved by one process is seen by the other before it touches the map.
+"""
+import fcntl
+import math
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from common import PH_UTC_OFFSET
+
+SECONDS_PER_DAY = 86400
+PAGE_SIZE = mmap.PAGESIZE
+
+BITS_BYTES = SECONDS_PER_DAY // 8
+STATUS_OFFSET = 0
+KNOWN_OFFSET = STATUS_OFFSET + BITS_BYTES
+LATENCY_OFFSET = KNOWN_OFFSET + BITS_BYTES
+SEGMENT_DATA_SIZE = LATENCY_OFFSET + SECONDS_PER_DAY
+SEGMENT_SIZE = -(-SEGMENT_DATA_SIZE // PAGE_SIZE) * PAGE_SIZE
+
+MAGIC = b'PTAARC1\0'
+HEADER = struct.Struct('<8sIqI')  # magic, format version, base day, segment size
+HEADER_SIZE = PAGE_SIZE
+FORMAT_VERSION = 1
+ZERO_SEGMENT = bytes(SEGMENT_SIZE)
+
+# Latency code = 1 + round(LATENCY_SCALE * log2(1 + ms)), about 2% resolution up to ~17 s
+LATENCY_SCALE = 18.0
+MAX_LATENCY_CODE = 255
+
+
+def day_and_second(epoch):
+    """Philippine day number and second within that day"""
+    local = int(epoch) + PH_UTC_OFFSET
+    return local // SECONDS_PER_DAY, local % SECONDS_PER_DAY
+
+
+def encode_latency(latency_ms):
+    if latency_ms is None or latency_ms != latency_ms or latency_ms < 0:
+        return 0
+    return min(MAX_LATENCY_CODE, 1 + int(round(LATENCY_SCALE * math.log2(1 + latency_ms))))
+
+
+def encode_latencies(latency_ms):
+    """Vectorized encode_latency"""
+    latency_ms = np.asarray(latency_ms, dtype=np.float64)
+    valid = ~np.isnan(latency_ms) & (latency_ms >= 0)
+    codes = 1 + np.rint(LATENCY_SCALE * np.log2(1 + np.where(valid, latency_ms, 0)))
+    return np.where(valid, np.minimum(codes, MAX_LATENCY_CODE), 0).astype(np.uint8)
+
+
+def decode_latencies(codes):
+    codes = np.asarray(codes, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        return np.where(codes > 0, np.exp2((codes - 1) / LATENCY_SCALE) - 1, np.nan)
+
+
+class ProbeArchive:
+    """One target's archive file, mapped into memory and grown a day segment at a time at either end"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._mm = None
+
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size >= HEADER_SIZE:
+                with os.fdopen(os.dup(self._fd), 'rb') as f:
+                    magic, version, self.base_day, segment_size = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC or version != FORMAT_VERSION or segment_size != SEGMENT_SIZE:
+                    raise ValueError(f"{path} is not a compatible probe archive")
+            else:
+                # No segments yet; the first write sets the real base day
+                self.base_day = 0
+                os.ftruncate(self._fd, HEADER_SIZE)
+                os.pwrite(self._fd, HEADER.pack(MAGIC, FORMAT_VERSION, 0, SEGMENT_SIZE), 0)
+            self._remap()
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @property
+    def days(self):
+        return (len(self._mm) - HEADER_SIZE) // SEGMENT_SIZE
+
+    def _remap(self):
+        if self._mm is not None:
+            self._mm.close()
+        self._mm = mmap.mmap(self._fd, os.fstat(self._fd).st_size)
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive against other threads and other processes; picks up their resizes and base day moves"""
+        with self.lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(self._fd).st_size != len(self._mm):
+                    self._remap()
+                self.base_day = HEADER.unpack_from(self._mm, 0)[2]
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _set_base_day(self, day):
+        HEADER.pack_into(self._mm, 0, MAGIC, FORMAT_VERSION, day, SEGMENT_SIZE)
+        self.base_day = day
+
+    def _prepend(self, count):
+        """Move every segment `count` days later in the file and clear the freed head"""
+        data_size = len(self._mm) - HEADER_SIZE
+        shift = count * SEGMENT_SIZE
+        os.ftruncate(self._fd, len(self._mm) + shift)
+        self._remap()
+        self._mm.move(HEADER_SIZE + shift, HEADER_SIZE, data_size)
+        # Only the part the old segments occupied needs clearing; the rest is fresh from ftruncate
+        for offset in range(HEADER_SIZE, HEADER_SIZE + min(shift, data_size), SEGMENT_SIZE):
+            self._mm[offset:offset + SEGMENT_SIZE] = ZERO_SEGMENT
+        self._set_base_day(self.base_day - count)
+
+    def _segment_offset(self, day, grow=False):
+        index = day - self.base_day
+        if self.days == 0:
+            if not grow:
+                return None
+            self._set_base_day(day)
+            index = 0
+        elif index < 0:
+            if not grow:
+                return None
+            self._prepend(-index)
+            index = 0
+        if index >= self.days:
+            if not grow:
+                return None
+            # Sparse extension: unwritten days cost no disk until touched
+            os.ftruncate(self._fd, HEADER_SIZE + (index + 1) * SEGMENT_SIZE)
+            self._remap()
+        return HEADER_SIZE + index * SEGMENT_SIZE
+
+    def write(self, epoch, status, latency_ms=None):
+        """Record one probe in its second slot"""
+        day, second = day_and_second(epoch)
+        byte, mask = second >> 3, 1 << (second & 7)
+        with self._locked():
+            base = self._segment_offset(day, grow=True)
+            mm = self._mm
+            if status:
+                mm[base + STATUS_OFFSET + byte] |= mask
+            else:
+                mm[base + STATUS_OFFSET + byte] &= ~mask & 0xFF
+            mm[base + KNOWN_OFFSET + byte] |= mask
+            mm[base + LATENCY_OFFSET + second] = encode_latency(latency_ms)
+
+    def write_many(self, epoch, status, latency_ms):
+        """Vectorized bulk write, one day segment at a time"""
+        epoch = np.asarray(epoch, dtype=np.float64)
+        if epoch.size == 0:
+            return
+        status = np.asarray(status, dtype=bool)
+        codes = encode_latencies(latency_ms)
+        local = epoch.astype(np.int64) + PH_UTC_OFFSET
+        order = np.argsort(local, kind='stable')
+        local, status, codes = local[order], status[order], codes[order]
+        days = local // SECONDS_PER_DAY
+        seconds = local % SECONDS_PER_DAY
+        starts = np.concatenate(([0], np.flatnonzero(days[1:] != days[:-1]) + 1, [len(days)]))
+
+        with self._locked():
+            # Grow at both ends up front so the mapping is stable while views exist
+            self._segment_offset(int(days[0]), grow=True)
+            self._segment_offset(int(days[-1]), grow=True)
+            for lo, hi in zip(starts[:-1], starts[1:]):
+                base = self._segment_offset(int(days[lo]))
+                segment = np.frombuffer(self._mm, dtype=np.uint8, count=SEGMENT_DATA_SIZE, offset=base)
+                try:
+                    secs = seconds[lo:hi]
+                    status_bits = np.unpackbits(segment[STATUS_OFFSET:KNOWN_OFFSET], bitorder='little')
+                    known_bits = np.unpackbits(segment[KNOWN_OFFSET:LATENCY_OFFSET], bitorder='little')
+                    status_bits[secs] = status[lo:hi]
+                    known_bits[secs] = 1
+                    segment[STATUS_OFFSET:KNOWN_OFFSET] = np.packbits(status_bits, bitorder='little')
+                    segment[KNOWN_OFFSET:LATENCY_OFFSET] = np.packbits(known_bits, bitorder='little')
+                    segment[LATENCY_OFFSET + secs] = codes[lo:hi]
+                finally:
+                    # The mapping cannot be resized while a view into it exists
+                    del segment
+
+    def read_range(self, start, end):
+        """Per-second arrays (epoch, known, status, latency_ms) for start <= t < end"""
+        start, end = int(start), int(math.ceil(end))
+        parts = []
+        second = start
+        with self._locked():
+            while second < end:
+                day, first = day_and_second(second)
+                count = min(SECONDS_PER_DAY - first, end - second)
+                parts.append(self._read_day(day, first, count, second))
+                second += count
+
+        if not parts:
+            empty = np.empty(0)
+            return empty.astype(np.int64), empty.astype(bool), empty.astype(bool), empty
+        return tuple(np.concatenate(column) for column in zip(*parts))
+
+    def _read_day(self, day, first, count, first_epoch):
+        epochs = np.arange(first_epoch, first_epoch + count, dtype=np.int64)
+        base = self._segment_offset(day)
+        if base is None:
+            return epochs, np.zeros(count, bool), np.zeros(count, bool), np.full(count, np.nan)
+
+        # Slice only the bytes covering [first, first + count) from each region
+        bit_lo, bit_hi = first >> 3, (first + count + 7) >> 3
+        shift = first & 7
+        status = np.unpackbits(np.frombuffer(self._mm[base + STATUS_OFFSET + bit_lo:base + STATUS_OFFSET + bit_hi], np.uint8), bitorder='little')
+        known = np.unpackbits(np.frombuffer(self._mm[base + KNOWN_OFFSET + bit_lo:base + KNOWN_OFFSET + bit_hi], np.uint8), bitorder='little')
+        codes = np.frombuffer(self._mm[base + LATENCY_OFFSET + first:base + LATENCY_OFFSET + first + count], np.uint8)
+        return (
+            epochs,
+            known[shift:shift + count].astype(bool),
+            status[shift:shift + count].astype(bool),
+            decode_latencies(codes),
+        )
+
+    def flush(self):
+        with self.lock:
+            self._mm.flush()
+
+    def close(self):
+        with self.lock:
+            self._mm.close()
+            os.close(self._fd)
@@ -0,0 +1,313 @@
+"""Bulk import of historical probe logs and vectorized analytics over them.
+
+Old monitor logs are parsed in chunks into columnar NumPy arrays
+(timestamp, status, latency), merged into the raw probe store, and
+summarized without per-row Python loops:
+
+    python backfill.py old_monitor.csv [--store probes.dat] [--archive bot.arc] [--dry-run]
+"""
+import argparse
+import os
+import time
+import warnings
+from collections import namedtuple
+
+import numpy as np
+
+from common import MAX_PROBE_GAP, PH_UTC_OFFSET, UP_VALUES
+from probe_store import RECORD_SIZE, ProbeStore
+
+# Same layout as probe_store.RECORD, so the store can be read with np.fromfile
+PROBE_DTYPE = np.dtype([('epoch', '<f8'), ('status', 'u1'), ('_pad', 'V3'), ('latency_ms', '<f4')])
+assert PROBE_DTYPE.itemsize == RECORD_SIZE
+
+CSV_CHUNK_ROWS = 1_000_000
+UP_TOKENS = [value.encode() for value in sorted(UP_VALUES)]  # The CSV columns are read as bytes
+
+TIMESTAMP_HEADERS = ('timestamp', 'time', 'epoch', 'ts')
+STATUS_HEADERS = ('status', 'state', 'online', 'up')
+LATENCY_HEADERS = ('latency_ms', 'latency', 'response_time', 'rtt_ms')
+
+ProbeColumns = namedtuple('ProbeColumns', ['epoch', 'status', 'latency_ms'])
+
+
+def make_columns(epoch, status, latency_ms):
+    """Build time-sorted columns from any array-likes"""
+    epoch = np.asarray(epoch, dtype=np.float64)
+    status = np.asarray(status, dtype=bool)
+    latency_ms = np.asarray(latency_ms, dtype=np.float32)
+    order = np.argsort(epoch, kind='stable')
+    if np.any(order[1:] < order[:-1]):
+        epoch, status, latency_ms = epoch[order], status[order], latency_ms[order]
+    return ProbeColumns(epoch, status, latency_ms)
+
+
+def parse_timestamps(values):
+    """Vectorized parse of epoch seconds or ISO 8601; naive ISO values are Philippine time, as in the app"""
+    try:
+        return values.astype(np.float64)
+    except ValueError:
+        pass
+    text = np.char.strip(values).astype('U40')
+    # Z or an explicit offset (a '+', or a third '-' after the date's two) means the value is already absolute
+    zoned = np.char.endswith(text, 'Z') | (np.char.count(text, '+') > 0) | (np.char.count(text, '-') > 2)
+    with warnings.catch_warnings():
+        # datetime64 converts offsets to UTC but warns that it does
+        warnings.simplefilter('ignore', UserWarning)
+        epochs = np.char.rstrip(text, 'Z').astype('datetime64[ms]').astype(np.int64) / 1000.0
+    return np.where(zoned, epochs, epochs - PH_UTC_OFFSET)
+
+
+def parse_latencies(values):
+    """Latency text to float32 milliseconds; an empty field (no reading) becomes NaN"""
+    latency_ms = np.full(values.size, np.nan, dtype=np.float32)
+    present = np.char.strip(values) != b''
+    latency_ms[present] = values[present].astype(np.float32)
+    return latency_ms
+
+
+def detect_columns(header):
+    """Find the timestamp, status and latency column indexes from a CSV header"""
+    names = [name.strip().lower() for name in header.split(',')]
+
+    def find(candidates):
+        for candidate in candidates:
+            if candidate in names:
+                return names.index(candidate)
+        return None
+
+    timestamp_col = find(TIMESTAMP_HEADERS)
+    status_col = find(STATUS_HEADERS)
+    if timestamp_col is None or status_col is None:
+        raise ValueError(f"Cannot find timestamp and status columns in header: {header.strip()}")
+    return timestamp_col, status_col, find(LATENCY_HEADERS)
+
+
+def load_csv(path, columns=None, chunk_rows=CSV_CHUNK_ROWS):
+    """Parse a CSV probe log into columns, CSV_CHUNK_ROWS rows at a time"""
+    epochs, statuses, latencies = [], [], []
+    with open(path, 'r') as f:
+        header = f.readline()
+        if columns is None:
+            columns = detect_columns(header)
+        timestamp_col, status_col, latency_col = columns
+
+        usecols = [timestamp_col, status_col] + ([latency_col] if latency_col is not None else [])
+        dtype = [('timestamp', 'S32'), ('status', 'S8')]
+        if latency_col is not None:
+            dtype.append(('latency_ms', 'S16'))  # Parsed after loading so empty fields can become NaN
+
+        while True:
+            with warnings.catch_warnings():
+                # loadtxt warns when the previous chunk ended exactly at EOF
+                warnings.simplefilter('ignore', UserWarning)
+                chunk = np.loadtxt(f, delimiter=',', usecols=usecols, dtype=dtype, max_rows=chunk_rows, ndmin=1)
+            if chunk.size == 0:
+                break
+            epochs.append(parse_timestamps(chunk['timestamp']))
+            statuses.append(np.isin(np.char.lower(np.char.strip(chunk['status'])), UP_TOKENS))
+            if latency_col is not None:
+                latencies.append(parse_latencies(chunk['latency_ms']))
+            else:
+                latencies.append(np.full(chunk.size, np.nan, dtype=np.float32))
+            if chunk.size < chunk_rows:
+                break
+
+    if not epochs:
+        return make_columns([], [], [])
+    return make_columns(np.concatenate(epochs), np.concatenate(statuses), np.concatenate(latencies))
+
+
+def load_store(path, start=None):
+    """Read the raw probe store into columns, from `start` (epoch seconds) or the beginning"""
+    if not os.path.exists(path):
+        return make_columns([], [], [])
+    first = ProbeStore(path, writable=False).first_index(start) if start is not None else 0
+    records = np.fromfile(path, dtype=PROBE_DTYPE, offset=first * RECORD_SIZE)
+    return make_columns(records['epoch'], records['status'].astype(bool), records['latency_ms'])
+
+
+def to_records(columns):
+    records = np.zeros(len(columns.epoch), dtype=PROBE_DTYPE)
+    records['epoch'] = columns.epoch
+    records['status'] = columns.status
+    records['latency_ms'] = columns.latency_ms
+    return records
+
+
+def ingest(columns, store_path):
+    """Merge columns into the probe store, keeping existing samples on duplicate timestamps.
+
+    The merged store is written to a temporary file and swapped in, so run
+    this while the monitor is stopped; a running monitor keeps appending to
+    the file it already has open.
+    """
+    existing = np.fromfile(store_path, dtype=PROBE_DTYPE) if os.path.exists(store_path) else np.empty(0, PROBE_DTYPE)
+    merged = np.concatenate([existing, to_records(columns)])
+    merged = merged[np.argsort(merged['epoch'], kind='stable')]
+    if merged.size:
+        keep = np.ones(merged.size, dtype=bool)
+        keep[1:] = merged['epoch'][1:] != merged['epoch'][:-1]
+        merged = merged[keep]
+
+    tmp_path = f"{store_path}.tmp"
+    merged.tofile(tmp_path)
+    os.replace(tmp_path, store_path)
+    return merged.size - existing.size
+
+
+def probe_durations(columns, max_gap=MAX_PROBE_GAP):
+    """Seconds credited to each sample: time since the previous probe, capped at max_gap"""
+    durations = np.zeros(len(columns.epoch))
+    if len(columns.epoch) > 1:
+        durations[1:] = np.minimum(np.diff(columns.epoch), max_gap)
+    return durations
+
+
+def rollup(columns, bucket_seconds=86400, offset=PH_UTC_OFFSET, max_gap=MAX_PROBE_GAP, maintenance=None):
+    """Per-bucket sample counts, up/down seconds, incidents and mean latency (daily by default).
+
+    `maintenance` is an optional boolean mask of samples taken during
+    scheduled maintenance; their time is counted as maintenance_seconds
+    instead of up or down, and going down during maintenance is no incident.
+    """
+    if len(columns.epoch) == 0:
+        empty = np.empty(0)
+        return {'bucket': empty.astype(np.int64), 'samples': empty, 'up_seconds': empty,
+                'down_seconds': empty, 'maintenance_seconds': empty, 'incidents': empty, 'mean_latency_ms': empty}
+
+    # Epochs are sorted, so buckets are contiguous runs and reduceat avoids a sort
+    buckets = ((columns.epoch + offset) * (1.0 / bucket_seconds)).astype(np.int64)
+    starts = np.concatenate(([0], np.flatnonzero(buckets[1:] != buckets[:-1]) + 1))
+    bucket_ids = buckets[starts]
+    durations = probe_durations(columns, max_gap)
+    samples = np.diff(np.append(starts, len(buckets)))
+    if maintenance is None:
+        maintenance = np.zeros(len(columns.status), dtype=bool)
+    counted = np.where(maintenance, 0.0, durations)
+    up_seconds = np.add.reduceat(np.where(columns.status, counted, 0.0), starts)
+    down_seconds = np.add.reduceat(np.where(columns.status, 0.0, counted), starts)
+    maintenance_seconds = np.add.reduceat(np.where(maintenance, durations, 0.0), starts)
+
+    went_down = np.zeros(len(columns.status), dtype=np.int64)
+    went_down[0] = not columns.status[0]
+    went_down[1:] = columns.status[:-1] & ~columns.status[1:]
+    went_down &= ~maintenance
+    incidents = np.add.reduceat(went_down, starts)
+
+    has_latency = ~np.isnan(columns.latency_ms)
+    latency = np.where(has_latency, columns.latency_ms, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_latency = np.add.reduceat(latency, starts) / np.add.reduceat(has_latency.astype(np.int64), starts)
+
+    return {
+        'bucket': bucket_ids,
+        'samples': samples,
+        'up_seconds': up_seconds,
+        'down_seconds': down_seconds,
+        'maintenance_seconds': maintenance_seconds,
+        'incidents': incidents,
+        'mean_latency_ms': mean_latency,
+    }
+
+
+def incidents(columns):
+    """Down periods as (start_epoch, end_epoch, duration_seconds); end is NaN if still down"""
+    status = columns.status
+    if len(status) == 0:
+        return np.empty((0, 3))
+    padded = np.concatenate(([True], status, [True])).astype(np.int8)
+    edges = np.diff(padded)
+    starts = np.flatnonzero(edges == -1)
+    ends = np.flatnonzero(edges == 1)
+
+    start_epochs = columns.epoch[starts]
+    end_epochs = np.full(len(ends), np.nan)
+    recovered = ends < len(status)
+    end_epochs[recovered] = columns.epoch[ends[recovered]]
+    return np.column_stack([start_epochs, end_epochs, end_epochs - start_epochs])
+
+
+def availability_windows(columns, window_seconds, max_gap=MAX_PROBE_GAP):
+    """Trailing availability (percent) over window_seconds, evaluated at every sample"""
+    if len(columns.epoch) == 0:
+        return np.empty(0)
+    durations = probe_durations(columns, max_gap)
+    cum_total = np.concatenate(([0.0], np.cumsum(durations)))
+    cum_up = np.concatenate(([0.0], np.cumsum(durations * columns.status)))
+
+    # Samples strictly after (t - window) contribute to the window ending at t
+    window_start = np.searchsorted(columns.epoch, columns.epoch - window_seconds, side='right')
+    end = np.arange(1, len(columns.epoch) + 1)
+    total = cum_total[end] - cum_total[window_start]
+    up = cum_up[end] - cum_up[window_start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(total > 0, up / total * 100, np.where(columns.status, 100.0, 0.0))
+
+
+def summarize(columns):
+    """Headline numbers printed after an import"""
+    if len(columns.epoch) == 0:
+        return {'samples': 0}
+    durations = probe_durations(columns)
+    total = durations.sum()
+    down_periods = incidents(columns)
+    recovered = down_periods[~np.isnan(down_periods[:, 2]), 2]
+    summary = {
+        'samples': int(len(columns.epoch)),
+        'first': float(columns.epoch[0]),
+        'last': float(columns.epoch[-1]),
+        'availability': float((durations * columns.status).sum() / total * 100) if total else None,
+        'incidents': int(len(down_periods)),
+        'longest_incident_seconds': float(recovered.max()) if len(recovered) else None,
+    }
+    for label, seconds in (('24h', 86400), ('7d', 7 * 86400), ('30d', 30 * 86400)):
+        windows = availability_windows(columns, seconds)
+        summary[f'availability_{label}_min'] = float(windows.min())
+        summary[f'availability_{label}_latest'] = float(windows[-1])
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import historical probe logs into the raw probe store")
+    parser.add_argument('logs', nargs='+', help="CSV probe logs with a header row")
+    parser.add_argument('--store', default=os.environ.get('PROBE_STORE_PATH', 'probes.dat'))
+    parser.add_argument('--columns', help="Timestamp, status and latency column indexes, e.g. 0,2,3")
+    parser.add_argument('--archive', default=os.environ.get('ARCHIVE_PATH'), help="Also write into this long-term archive")
+    parser.add_argument('--dry-run', action='store_true', help="Parse and summarize without writing the store")
+    args = parser.parse_args()
+
+    columns = None
+    if args.columns:
+        parts = [int(part) if part != '' else None for part in args.columns.split(',')]
+        columns = tuple(parts + [None] * (3 - len(parts)))[:3]
+
+    started = time.perf_counter()
+    loaded = [load_csv(path, columns) for path in args.logs]
+    data = make_columns(
+        np.concatenate([c.epoch for c in loaded]),
+        np.concatenate([c.status for c in loaded]),
+        np.concatenate([c.latency_ms for c in loaded]),
+    )
+    parsed = time.perf_counter()
+    print(f"Parsed {len(data.epoch):,} samples in {parsed - started:.2f}s")
+
+    if not args.dry_run:
+        added = ingest(data, args.store)
+        print(f"Merged {added:,} new samples into {args.store} in {time.perf_counter() - parsed:.2f}s")
+
+    if args.archive and not args.dry_run and len(data.epoch):
+        from archive import ProbeArchive
+        archived = time.perf_counter()
+        # Logs older than the archive's first day move its start back
+        probe_archive = ProbeArchive(args.archive)
+        probe_archive.write_many(data.epoch, data.status, data.latency_ms)
+        probe_archive.close()
+        print(f"Archived {len(data.epoch):,} samples into {args.archive} in {time.perf_counter() - archived:.2f}s")
+
+    for key, value in summarize(data).items():
+        print(f"{key}: {value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+"""Benchmarks and local stand-ins for the bot and the alert endpoints.
+
+Run them from the repository root so the app's modules are importable:
+
+    python -m bench.bench_storm --users 20
+    python -m bench.fakebot --port 8081
+"""
@@ -0,0 +1,91 @@
+"""Benchmark for the bulk backfill path.
+
+Synthesizes a year-scale probe trace, then times CSV parsing, merging it
+into a probe store, and the vectorized rollups, incidents and
+availability windows:
+
+    python -m bench.bench_backfill [--samples 30000000] [--csv-samples 1000000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import backfill
+
+TARGET_SECONDS = 10.0  # Budget for ingest plus analytics of the full sample count
+
+
+def synthetic_trace(samples, seed=2810):
+    """One probe per second with occasional outages and noisy latency"""
+    rng = np.random.default_rng(seed)
+    epoch = 1.7e9 + np.arange(samples, dtype=np.float64)
+    status = np.ones(samples, dtype=bool)
+    outage_starts = rng.integers(0, samples, size=max(1, samples // 200_000))
+    for start in outage_starts:
+        status[start:start + int(rng.integers(5, 600))] = False
+    latency_ms = rng.gamma(2.0, 40.0, size=samples).astype(np.float32)
+    return backfill.ProbeColumns(epoch, status, latency_ms)
+
+
+def write_csv(path, columns):
+    with open(path, 'w') as f:
+        f.write('timestamp,status,latency_ms\n')
+        np.savetxt(
+            f,
+            np.column_stack([
+                columns.epoch.astype(np.int64).astype(str),
+                np.where(columns.status, 'up', 'down'),
+                np.round(columns.latency_ms, 1).astype(str),
+            ]),
+            fmt='%s',
+            delimiter=',',
+        )
+
+
+def timed(label, func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed:8.3f}s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--samples', type=int, default=30_000_000)
+    parser.add_argument('--csv-samples', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'old_monitor.csv')
+        store_path = os.path.join(tmp, 'probes.dat')
+
+        write_csv(csv_path, synthetic_trace(args.csv_samples))
+        _, csv_seconds = timed(f"parse {args.csv_samples:,} CSV rows", backfill.load_csv, csv_path)
+        csv_rate = args.csv_samples / csv_seconds
+        print(f"{'CSV parse rate':<28} {csv_rate:12,.0f} rows/s "
+              f"(~{args.samples / csv_rate:.1f}s for {args.samples:,})")
+
+        trace = synthetic_trace(args.samples)
+        total = 0.0
+        _, elapsed = timed(f"ingest {args.samples:,} samples", backfill.ingest, trace, store_path)
+        total += elapsed
+        columns, elapsed = timed("load store", backfill.load_store, store_path)
+        total += elapsed
+        _, elapsed = timed("daily rollup", backfill.rollup, columns)
+        total += elapsed
+        down_periods, elapsed = timed("incidents", backfill.incidents, columns)
+        total += elapsed
+        _, elapsed = timed("24h availability windows", backfill.availability_windows, columns, 86400)
+        total += elapsed
+
+        print(f"{'incidents found':<28} {len(down_periods):8,}")
+        print(f"{'total (excluding CSV)':<28} {total:8.3f}s  "
+              f"{'PASS' if total <= TARGET_SECONDS else 'FAIL'} (target {TARGET_SECONDS:.0f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""Degradation detector over a long probe trace.
+
+Synthesizes `--days` of 1 Hz probes with a daily latency cycle, isolated
+latency spikes and failures, full outages and labelled "limp" episodes
+(5-60 minutes slower by 1.5-4x, flapping, or both; a third of them end
+in an outage). Everything is fed through anomaly.DegradationDetector
+exactly as record_probe() does, and reported:
+
+    cost per probe (the detector alone),
+    episodes caught and time to detection, by kind,
+    share of episode time flagged,
+    false positives: degraded time and episodes outside the labelled
+    episodes (the 5 minutes after an episode are counted separately).
+
+    python -m bench.bench_degraded [--days 30]
+    python -m bench.bench_degraded --trace probes.dat   # a recorded trace: cost and degraded time only
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from anomaly import DegradationDetector
+
+RECOVERY_GRACE = 300  # Seconds after an episode during which flags count as its tail, not false positives
+
+
+def synthetic_trace(days, seed=2810):
+    """(epoch, ok, latency_ms, episode_id) arrays, episode_id -1 outside labelled episodes"""
+    rng = np.random.default_rng(seed)
+    samples = days * 86400
+    t = np.arange(samples, dtype=np.float64)
+    latency = rng.gamma(4.0, 20.0, size=samples) * (1 + 0.3 * np.sin(2 * np.pi * t / 86400))
+    spikes = rng.random(samples) < 0.002
+    latency[spikes] *= rng.uniform(3, 10, size=spikes.sum())
+    ok = rng.random(samples) >= 0.0002
+    episode = np.full(samples, -1, dtype=np.int64)
+    kinds = []
+
+    starts = np.sort(rng.choice(np.arange(3600, samples - 7200, 7200), size=days * 2, replace=False))
+    for index, start in enumerate(starts):
+        length = int(rng.integers(5, 61)) * 60
+        kind = ('slow', 'flaky', 'both')[index % 3]
+        span = slice(start, start + length)
+        if kind in ('slow', 'both'):
+            latency[span] *= rng.uniform(1.5, 4.0)
+        if kind in ('flaky', 'both'):
+            ok[span] &= rng.random(length) >= 0.2
+        episode[span] = index
+        kinds.append(kind)
+        if index % 3 == 2:
+            ok[start + length:start + length + int(rng.integers(60, 900))] = False
+
+    for start in rng.choice(samples - 1200, size=days, replace=False):
+        if episode[start] == -1:
+            ok[start:start + int(rng.integers(30, 1200))] = False
+
+    return 1.79e9 + t, ok, latency, episode, kinds
+
+
+def readings(latency):
+    """Latency list for the detector, with missing readings (NaN) as None"""
+    return [None if math.isnan(value) else value for value in latency.tolist()]
+
+
+def run_detector(ok, latency):
+    detector = DegradationDetector()
+    flags = np.zeros(len(ok), dtype=bool)
+    update = detector.update
+    ok_list, latency_list = ok.tolist(), readings(latency)
+    started = time.perf_counter()
+    for i in range(len(ok_list)):
+        flags[i] = update(ok_list[i], latency_list[i]) and ok_list[i]
+    return flags, time.perf_counter() - started
+
+
+def detector_cost(ok, latency):
+    """Detector time per probe without the bookkeeping of run_detector"""
+    detector = DegradationDetector()
+    update = detector.update
+    pairs = list(zip(ok.tolist(), readings(latency)))
+    started = time.perf_counter()
+    for probe_ok, latency_ms in pairs:
+        update(probe_ok, latency_ms)
+    return (time.perf_counter() - started) / len(pairs)
+
+
+def episodes_of(flags):
+    """(start, end) index pairs of runs of True"""
+    edges = np.diff(np.concatenate(([0], flags.astype(np.int8), [0])))
+    return list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+
+
+def report_synthetic(args):
+    _, ok, latency, episode, kinds = synthetic_trace(args.days)
+    per_probe = detector_cost(ok, latency)
+    flags, _ = run_detector(ok, latency)
+    print(f"{len(ok):,} probes ({args.days} days), {len(kinds)} labelled episodes")
+    print(f"detector cost:    {per_probe * 1e9:,.0f} ns/probe")
+
+    print(f"{'kind':<7} {'episodes':>8} {'caught':>7} {'detect p50':>11} {'detect p90':>11} {'flagged':>8}")
+    for kind in ('slow', 'flaky', 'both'):
+        delays, flagged, total = [], 0, 0
+        ids = [index for index, k in enumerate(kinds) if k == kind]
+        for index in ids:
+            span = np.flatnonzero(episode == index)
+            up = ok[span]
+            hits = np.flatnonzero(flags[span])
+            if len(hits):
+                delays.append(hits[0])
+            flagged += int(flags[span].sum())
+            total += int(up.sum())
+        p50 = f"{np.percentile(delays, 50):.0f}s" if delays else '-'
+        p90 = f"{np.percentile(delays, 90):.0f}s" if delays else '-'
+        print(f"{kind:<7} {len(ids):>8} {len(delays):>7} {p50:>11} {p90:>11} {flagged / max(total, 1):>8.1%}")
+
+    labelled = episode >= 0
+    tail = np.zeros_like(labelled)
+    for start, end in episodes_of(labelled):
+        tail[end:end + RECOVERY_GRACE] = True
+    tail &= ~labelled
+    healthy = ~labelled & ~tail & ok
+    false_flags = flags & healthy
+    false_episodes = sum(1 for start, end in episodes_of(flags) if not (labelled[start:end] | tail[start:end]).any())
+    print(f"false positives:  {false_flags.sum():,}s of {healthy.sum():,}s healthy ({false_flags.sum() / healthy.sum():.3%}), "
+          f"{false_episodes} episode(s) ({false_episodes / args.days:.2f}/day)")
+    print(f"recovery tail:    {int((flags & tail).sum()):,}s flagged within {RECOVERY_GRACE}s after episodes")
+
+
+def report_trace(args):
+    from replay import iter_trace
+    rows = list(iter_trace(args.trace))
+    ok = np.array([row[1] for row in rows], dtype=bool)
+    latency = np.array([np.nan if row[2] is None else row[2] for row in rows], dtype=np.float64)
+    flags, elapsed = run_detector(ok, latency)
+    runs = episodes_of(flags)
+    print(f"{len(rows):,} probes from {args.trace}")
+    print(f"detector cost:    {detector_cost(ok, latency) * 1e9:,.0f} ns/probe")
+    print(f"degraded:         {flags.sum():,} probes ({flags.sum() / max(ok.sum(), 1):.3%} of up probes) in {len(runs)} episode(s)")
+    if runs:
+        lengths = [end - start for start, end in runs]
+        print(f"episode length:   p50 {np.percentile(lengths, 50):.0f}, max {max(lengths)} probes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--trace', help="probes.dat, or a CSV/NDJSON file from /export, instead of a synthetic trace")
+    args = parser.parse_args()
+    if args.trace:
+        report_trace(args)
+    else:
+        report_synthetic(args)
+
+
+if __name__ == '__main__':
+    main()
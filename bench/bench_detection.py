@@ -0,0 +1,101 @@
+"""End-to-end detection latency benchmark and regression gate.
+
+Points the monitor at a local fake bot (fakebot.py), connects a simulated
+Socket.IO client, then injects each fault in turn and measures the time
+from "bot goes down" to the first `status_update` with is_online false.
+It also reports probe CPU cost per check:
+
+    python -m bench.bench_detection [--rounds 3] [--max-detect 2.5]
+
+Exits non-zero if any fault takes longer than --max-detect seconds.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from bench.fakebot import FakeBot
+
+FAULTS = [
+    ('error', {'status': 503}),
+    ('reset', {}),
+    ('hang', {}),
+    ('flap', {'period': 3}),
+]
+
+
+def drain(client):
+    client.get_received()
+
+
+def wait_for_status(client, online, timeout):
+    """Block until a status_update with the given is_online arrives; return its arrival time"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        for packet in client.get_received():
+            if packet['name'] == 'status_update' and packet['args'][0]['is_online'] == online:
+                return time.perf_counter()
+        time.sleep(0.005)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=1.0, help="Check timeout budget in seconds")
+    parser.add_argument('--max-detect', type=float, default=2.5)
+    parser.add_argument('--cpu-window', type=float, default=10.0)
+    args = parser.parse_args()
+
+    bot = FakeBot().start()
+    workdir = tempfile.mkdtemp(prefix='ptastatus-bench-')
+    os.environ['BOT_URL'] = bot.url
+    os.environ['PROBE_STORE_PATH'] = os.path.join(workdir, 'probes.dat')
+    os.environ['CHECKS'] = json.dumps([{'type': 'http', 'url': bot.url, 'timeout': args.timeout, 'hedge': True}])
+
+    import app
+    app.start_probing()
+    client = app.socketio.test_client(app.app)
+
+    if wait_for_status(client, True, 10) is None:
+        print("Monitor never reported the fake bot online")
+        return 1
+
+    # Probe CPU cost while healthy, with no client polling in the window
+    probes_before = app.probe_store.count()
+    cpu_before = time.process_time()
+    time.sleep(args.cpu_window)
+    probes = app.probe_store.count() - probes_before
+    cpu_ms = (time.process_time() - cpu_before) * 1000
+    print(f"probe CPU: {cpu_ms / max(probes, 1):.2f} ms per probe ({probes} probes in {args.cpu_window:.0f}s)")
+
+    worst = 0.0
+    print(f"{'fault':<8} {'detect (s)':>40}")
+    for mode, params in FAULTS:
+        timings = []
+        for _ in range(args.rounds):
+            bot.set_mode('ok')
+            drain(client)
+            wait_for_status(client, True, 10)
+            drain(client)
+
+            down_at = time.perf_counter()
+            bot.set_mode(mode, **params)
+            seen_at = wait_for_status(client, False, 15)
+            timings.append(float('inf') if seen_at is None else seen_at - down_at)
+        worst = max(worst, max(timings))
+        print(f"{mode:<8} {' '.join(f'{t:6.2f}' for t in timings):>40}   max {max(timings):.2f}")
+
+    bot.set_mode('ok')
+    client.disconnect()
+    bot.stop()
+
+    passed = worst <= args.max_detect
+    print(f"worst detection {worst:.2f}s: {'PASS' if passed else 'FAIL'} (limit {args.max_detect:.2f}s)")
+    return 0 if passed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
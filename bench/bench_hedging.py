@@ -0,0 +1,68 @@
+"""Measure how hedged probes change false-down rate and time-to-detect.
+
+The fake bot (fakebot.py) answers quickly but stalls a small share of
+requests (a lost packet, from the prober's point of view). Each
+configuration probes it for a while to count false downs, then the server
+starts hanging every request and we time how long until a probe reports
+the outage:
+
+    python -m bench.bench_hedging [--probes 300] [--stall-rate 0.03]
+"""
+import argparse
+import random
+import time
+
+from checks import CheckRunner, HttpCheck
+from bench.fakebot import FakeBot
+
+
+def run_config(bot, hedge, timeout, probes, interval):
+    check = HttpCheck(bot.url, hedge=hedge, timeout=timeout)
+    runner = CheckRunner([check])
+
+    false_downs = 0
+    for _ in range(probes):
+        ok, _ = runner.run()
+        false_downs += not ok
+        time.sleep(interval)
+
+    # Outage: every request hangs from now on
+    bot.set_mode('hang')
+    outage_started = time.perf_counter()
+    while True:
+        ok, _ = runner.run()
+        if not ok:
+            break
+        time.sleep(interval)
+    detect = time.perf_counter() - outage_started
+    bot.set_mode('ok')
+    runner.shutdown()
+    return false_downs, detect, check.hedges_started, check.hedges_won
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--probes', type=int, default=300)
+    parser.add_argument('--stall-rate', type=float, default=0.03)
+    parser.add_argument('--interval', type=float, default=0.01)
+    args = parser.parse_args()
+
+    random.seed(2810)
+    bot = FakeBot(latency=0.02).start()
+    bot.set_mode('ok', stall_rate=args.stall_rate)
+
+    configs = [
+        ('plain, 1.0s timeout', False, 1.0),
+        ('hedged, 1.0s timeout', True, 1.0),
+        ('hedged, 0.3s timeout', True, 0.3),
+    ]
+    print(f"{args.probes} probes per config, {args.stall_rate:.0%} of requests stall")
+    print(f"{'config':<24} {'false downs':>12} {'rate':>7} {'detect':>8} {'hedges':>8} {'won':>5}")
+    for label, hedge, timeout in configs:
+        false_downs, detect, hedges, won = run_config(bot, hedge, timeout, args.probes, args.interval)
+        print(f"{label:<24} {false_downs:>12} {false_downs / args.probes:>7.2%} {detect:>7.2f}s {hedges:>8} {won:>5}")
+    bot.stop()
+
+
+if __name__ == '__main__':
+    main()
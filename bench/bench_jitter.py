@@ -0,0 +1,132 @@
+"""Probe tick jitter with and without a saturated web tier.
+
+Runs the monitor against a local fake bot (fakebot.py) twice, once with
+the probe loop as a thread in the web process and once in its own
+process (PROBER_PROCESS=1). Each run is measured idle, then again while
+worker threads hammer the status page with the page cache turned off:
+
+    python -m bench.bench_jitter [--seconds 20] [--load-threads 8]
+
+"probe" ticks are the probe times recorded in the raw probe store, which
+the prober writes itself; "emit" ticks are `status_update` arrivals at a
+Socket.IO client of the web process. Jitter is the deviation of each tick
+interval from the median interval.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from bench.fakebot import FakeBot
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def jitter_stats(ticks):
+    intervals = [b - a for a, b in zip(ticks, ticks[1:])]
+    if len(intervals) < 2:
+        return {'ticks': len(ticks), 'p50': None, 'p99': None, 'max': None}
+    median = percentile(intervals, 0.5)
+    jitter = [abs(interval - median) * 1000 for interval in intervals]
+    return {'ticks': len(ticks), 'p50': percentile(jitter, 0.5), 'p99': percentile(jitter, 0.99), 'max': max(jitter)}
+
+
+def measure_ticks(app_module, client, seconds):
+    """Return (probe ticks, emit ticks) jitter for the next `seconds`"""
+    started = time.time()
+    arrivals = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for packet in client.get_received():
+            if packet['name'] == 'status_update':
+                arrivals.append(time.perf_counter())
+        time.sleep(0.002)
+    probes = [epoch for chunk in app_module.probe_store.iter_chunks(started, time.time()) for epoch, _, _ in chunk]
+    return jitter_stats(probes), jitter_stats(arrivals)
+
+
+def hammer(app_module, stop, counter):
+    client = app_module.app.test_client()
+    paths = ['/', '/api/uptime/daily', '/readyz']
+    i = 0
+    while not stop.is_set():
+        client.get(paths[i % len(paths)])
+        counter[0] += 1
+        i += 1
+
+
+def worker(mode, bot_url, seconds, load_threads):
+    """Run one configuration in this process and print its results as JSON"""
+    workdir = tempfile.mkdtemp(prefix='ptastatus-jitter-')
+    os.environ['BOT_URL'] = bot_url
+    os.environ['PROBE_STORE_PATH'] = os.path.join(workdir, 'probes.dat')
+    os.environ['CHECKS'] = json.dumps([{'type': 'http', 'url': bot_url, 'timeout': 1.0}])
+    if mode == 'process':
+        os.environ['PROBER_PROCESS'] = '1'
+
+    import app
+    if mode == 'process':
+        threading.Thread(target=app.supervise_prober_process, daemon=True, name='prober').start()
+    else:
+        app.start_probing()
+    app.PAGE_CACHE_TTL = 0  # Every page request renders the template
+    client = app.socketio.test_client(app.app)
+    time.sleep(3)
+    client.get_received()
+
+    results = {}
+    results['idle probe'], results['idle emit'] = measure_ticks(app, client, seconds)
+    stop = threading.Event()
+    counter = [0]
+    threads = [threading.Thread(target=hammer, args=(app, stop, counter), daemon=True) for _ in range(load_threads)]
+    for thread in threads:
+        thread.start()
+    results['loaded probe'], results['loaded emit'] = measure_ticks(app, client, seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    results['loaded emit']['requests_per_second'] = counter[0] / seconds
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=20.0)
+    parser.add_argument('--load-threads', type=int, default=8)
+    parser.add_argument('--worker', choices=['thread', 'process'], help=argparse.SUPPRESS)
+    parser.add_argument('--bot-url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return worker(args.worker, args.bot_url, args.seconds, args.load_threads)
+
+    # The fake bot lives here, outside the loaded process, so it always answers promptly
+    bot = FakeBot().start()
+    print(f"{args.seconds:.0f}s per phase, {args.load_threads} load threads")
+    print(f"{'prober':<8} {'phase':<13} {'ticks':>6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'req/s':>8}")
+    for mode in ('thread', 'process'):
+        # A fresh interpreter per mode, since the app module reads its config at import
+        output = subprocess.run(
+            [sys.executable, '-m', __spec__.name, '--worker', mode, '--bot-url', bot.url, '--seconds', str(args.seconds),
+             '--load-threads', str(args.load_threads)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        # The app's JSON log lines share stdout with the worker's result line
+        results = json.loads([line for line in output.splitlines() if line.startswith('{"idle probe"')][-1])
+        for phase in ('idle probe', 'idle emit', 'loaded probe', 'loaded emit'):
+            row = results[phase]
+            rate = f"{row['requests_per_second']:.0f}" if 'requests_per_second' in row else '-'
+            cells = ' '.join(f"{row[key]:>8.1f}" if row[key] is not None else f"{'-':>8}" for key in ('p50', 'p99', 'max'))
+            print(f"{mode:<8} {phase:<13} {row['ticks']:>6} {cells} {rate:>8}")
+    bot.stop()
+
+
+if __name__ == '__main__':
+    main()
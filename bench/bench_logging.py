@@ -0,0 +1,93 @@
+"""What a log call costs the caller when stdout is slow.
+
+Simulates a log drain that takes `--write-ms` per line and, for
+`--seconds`, runs a 1 Hz "probe" thread that logs one event per tick
+while other threads log client_connected at `--connect-rate` per second.
+Compares plain print() with eventlog.log_event() (queue + listener,
+with the app's limits on client_connected) and reports how long each
+probe-thread log call held the probe:
+
+    python -m bench.bench_logging [--seconds 10] [--write-ms 20] [--connect-rate 200]
+"""
+import argparse
+import threading
+import time
+
+from eventlog import EventLog, log_event
+
+
+class SlowStream:
+    """A stdout whose every write takes `delay` seconds, serialized like a pipe"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.lines = 0
+
+    def write(self, text):
+        with self.lock:
+            time.sleep(self.delay)
+            self.lines += text.count('\n')
+
+    def flush(self):
+        pass
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def run(mode, args):
+    stream = SlowStream(args.write_ms / 1000)
+    if mode == 'print':
+        def emit(event, **fields):
+            print(event, fields, file=stream, flush=True)
+        event_log = None
+    else:
+        limits = {'client_connected': {'sample': 10, 'rate': 1.0, 'burst': 5}}
+        event_log = EventLog(limits, stream=stream).start()
+        emit = log_event
+
+    stop = threading.Event()
+
+    def connects():
+        while not stop.is_set():
+            emit('client_connected', tier='1s', encoding='compact', resumed=False)
+            time.sleep(4 / args.connect_rate)
+
+    threads = [threading.Thread(target=connects, daemon=True) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    held_ms = []
+    for tick in range(int(args.seconds)):
+        started = time.perf_counter()
+        emit('probe', tick=tick, ok=True)
+        held_ms.append((time.perf_counter() - started) * 1000)
+        time.sleep(1)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    stats = event_log.stats() if event_log else {'dropped': 0, 'suppressed': 0}
+    if event_log:
+        event_log.stop()
+    print(f"{mode:<10} {percentile(held_ms, 0.5):>10.3f} {max(held_ms):>10.3f} {stream.lines:>8} "
+          f"{stats['suppressed']:>11} {stats['dropped']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--write-ms', type=float, default=20)
+    parser.add_argument('--connect-rate', type=float, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.write_ms:.0f} ms per stdout write, {args.connect_rate:.0f} connects/s, {args.seconds:.0f} probe ticks")
+    print(f"{'logger':<10} {'p50 ms':>10} {'max ms':>10} {'written':>8} {'suppressed':>11} {'dropped':>8}")
+    for mode in ('print', 'eventlog'):
+        run(mode, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Cost of the maintenance window index with many recurring windows.
+
+Generates `--windows` random windows (mostly weekly, some daily or
+one-off, 1-10 minutes long, like per-service deploy slots) and reports,
+for the 14-day horizon record_probe() uses:
+
+    refresh():    expanding and merging every occurrence into the index,
+    window_at():  the per-probe "is now in maintenance" bisect,
+    linear scan:  the same question asked of every window directly.
+
+    python -m bench.bench_maintenance [--windows 1000 5000]
+"""
+import argparse
+import random
+import time
+
+from maintenance import MaintenanceSchedule, Window
+
+NOW = 1_790_000_000.0
+
+
+def random_windows(count, seed=5):
+    rng = random.Random(seed)
+    windows = []
+    for index in range(count):
+        every = rng.choice(['weekly', 'weekly', 'weekly', 'daily', None])
+        spec = {'title': f"window {index}", 'start': NOW - rng.uniform(0, 30 * 86400), 'duration': rng.uniform(60, 600)}
+        if every is None:
+            spec['start'] += rng.uniform(0, 60 * 86400)
+        else:
+            spec['every'] = every
+        windows.append(spec)
+    return windows
+
+
+def linear_window_at(windows, epoch):
+    """What a lookup costs without the index: ask each window whether it covers `epoch`"""
+    for window in windows:
+        if window.every is None:
+            if window.start <= epoch < window.start + window.duration:
+                return window
+        elif epoch >= window.start and (window.until is None or epoch < window.until):
+            if (epoch - window.start) % window.every < window.duration:
+                return window
+    return None
+
+
+def per_call_ns(function, epochs):
+    started = time.perf_counter()
+    for epoch in epochs:
+        function(epoch)
+    return (time.perf_counter() - started) / len(epochs) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--windows', type=int, nargs='+', default=[1000, 5000])
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    epochs = [NOW + rng.uniform(0, 14 * 86400) for _ in range(20000)]
+    print(f"{'windows':>8} {'intervals':>10} {'refresh':>10} {'window_at':>10} {'linear':>10} {'covered':>8}")
+    for count in args.windows:
+        schedule = MaintenanceSchedule(random_windows(count))
+        started = time.perf_counter()
+        schedule.refresh(NOW)
+        refresh_ms = (time.perf_counter() - started) * 1000
+        windows = [Window(spec) for spec in random_windows(count)]
+        indexed = per_call_ns(schedule.window_at, epochs)
+        linear = per_call_ns(lambda epoch: linear_window_at(windows, epoch), epochs[:2000])
+        # The index and the scan must agree on every probe time
+        for epoch in epochs[:2000]:
+            assert (schedule.window_at(epoch) is None) == (linear_window_at(windows, epoch) is None), epoch
+        covered = sum(schedule.window_at(epoch) is not None for epoch in epochs) / len(epochs)
+        print(f"{count:>8,} {len(schedule):>10,} {refresh_ms:>8.1f}ms {indexed:>8,.0f}ns {linear:>8,.0f}ns {covered:>8.1%}")
+
+
+if __name__ == '__main__':
+    main()
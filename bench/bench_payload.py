@@ -0,0 +1,88 @@
+"""Bytes per client per hour for each real-time encoding.
+
+Drives an hour of 1 Hz probes (with an outage every `--flap-every`
+seconds) through app.record_probe() on a virtual clock, with one Socket.IO
+test client per encoding and tier. Every frame a client receives is
+re-encoded exactly as it goes over the wire in a polling response (one
+Engine.IO packet per poll at 1 Hz) and counted raw and gzipped, where
+gzip only applies once the response reaches the compression threshold:
+
+    python -m bench.bench_payload [--seconds 3600] [--flap-every 600]
+
+HTTP headers and Engine.IO pings are the same for every encoding and are
+not counted.
+"""
+import argparse
+import gzip
+import os
+import tempfile
+
+from socketio import packet
+
+
+class VirtualClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def wire_bytes(received, threshold):
+    """(raw, on the wire) body bytes for the frames a test client received"""
+    raw = sent = 0
+    for frame in received:
+        body = ('4' + packet.Packet(packet.EVENT, data=[frame['name']] + frame['args']).encode()).encode()
+        raw += len(body)
+        sent += len(gzip.compress(body)) if len(body) >= threshold else len(body)
+    return raw, sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=int, default=3600)
+    parser.add_argument('--flap-every', type=int, default=600)
+    parser.add_argument('--outage', type=int, default=30, help="Seconds each outage lasts")
+    parser.add_argument('--threshold', type=int, help="Compression threshold (default: the app's)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='ptastatus-payload-')
+    os.environ['PROBE_STORE_PATH'] = os.path.join(workdir, 'probes.dat')
+    os.environ.pop('ARCHIVE_PATH', None)
+
+    import app
+    app.scheduler.shutdown()
+    app.alert_dispatcher = None
+    clock = VirtualClock(1_790_000_000.0)
+    app.clock = clock
+    app.start_epoch = clock.now
+
+    clients = {
+        (tier, encoding): app.socketio.test_client(app.app, auth={'tier': tier, 'encoding': encoding})
+        for tier in ('1s', '10s', 'transitions')
+        for encoding in app.UPDATE_ENCODINGS
+    }
+    # Warm up so history holds a few transitions, as it would in production
+    for second in range(-args.flap_every * 10, 0):
+        clock.now += 1
+        app.record_probe(second % args.flap_every >= args.outage, 5.0)
+    for client in clients.values():
+        client.get_received()
+
+    for second in range(args.seconds):
+        clock.now += 1
+        app.record_probe(second % args.flap_every >= args.outage, 5.0)
+
+    hours = args.seconds / 3600
+    threshold = app.POLLING_COMPRESSION_THRESHOLD if args.threshold is None else args.threshold
+    print(f"{args.seconds}s of 1 Hz probes, outage every {args.flap_every}s, gzip at >= {threshold} bytes")
+    print(f"{'tier':<12} {'encoding':<9} {'frames':>7} {'avg bytes':>10} {'raw KB/h':>10} {'wire KB/h':>10}")
+    for (tier, encoding), client in clients.items():
+        received = client.get_received()
+        raw, sent = wire_bytes(received, threshold)
+        average = raw / len(received) if received else 0
+        print(f"{tier:<12} {encoding:<9} {len(received):>7} {average:>10.0f} {raw / hours / 1024:>10.1f} {sent / hours / 1024:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
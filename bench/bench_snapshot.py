@@ -0,0 +1,78 @@
+"""Per-change cost of the static snapshot export (SNAPSHOT_DIR).
+
+Drives state changes through app.record_probe() on a virtual clock and
+times write_static_snapshot() after each one (render index.html,
+status.json and badge.svg, then temp-file + rename for the files whose
+content changed). Also times the calls that find nothing to do and a
+forced refresh whose content is identical:
+
+    python -m bench.bench_snapshot [--changes 500]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+
+class VirtualClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--changes', type=int, default=500)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='ptastatus-snapshot-')
+    os.environ['PROBE_STORE_PATH'] = os.path.join(workdir, 'probes.dat')
+    os.environ['SNAPSHOT_DIR'] = os.path.join(workdir, 'public')
+    os.environ.pop('ARCHIVE_PATH', None)
+
+    import app
+    app.scheduler.shutdown()
+    app.alert_dispatcher = None
+    clock = VirtualClock(1_790_000_000.0)
+    app.clock = clock
+    app.start_epoch = clock.now
+
+    change_ms, idle_ms = [], []
+    for change in range(args.changes):
+        # Five quiet ticks, then a transition
+        for _ in range(5):
+            clock.now += 1
+            app.record_probe(change % 2 == 0, 5.0)
+            started = time.perf_counter()
+            app.write_static_snapshot()
+            idle_ms.append((time.perf_counter() - started) * 1000)
+        clock.now += 1
+        app.record_probe(change % 2 == 1, 5.0)
+        started = time.perf_counter()
+        app.write_static_snapshot()
+        change_ms.append((time.perf_counter() - started) * 1000)
+
+    # A refresh with nothing new renders everything but should write nothing
+    started = time.perf_counter()
+    app.write_static_snapshot(force=True)
+    refresh_ms = (time.perf_counter() - started) * 1000
+
+    sizes = {name: os.path.getsize(os.path.join(app.SNAPSHOT_DIR, name)) for name in sorted(os.listdir(app.SNAPSHOT_DIR))}
+    stats = app._static_snapshot
+    print(f"{args.changes} state changes, {len(idle_ms)} unchanged ticks")
+    print(f"per change:    p50 {percentile(change_ms, 0.5):.2f} ms   p99 {percentile(change_ms, 0.99):.2f} ms")
+    print(f"per idle tick: p50 {percentile(idle_ms, 0.5) * 1000:.1f} us   p99 {percentile(idle_ms, 0.99) * 1000:.1f} us")
+    print(f"forced refresh with no change: {refresh_ms:.2f} ms")
+    print(f"files written {stats['written']}, skipped as unchanged {stats['unchanged']}")
+    print('sizes: ' + ', '.join(f"{name} {size / 1024:.1f} KB" for name, size in sizes.items()))
+
+
+if __name__ == '__main__':
+    main()
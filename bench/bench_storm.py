@@ -0,0 +1,159 @@
+"""Refresh-storm benchmark for admission control.
+
+Starts the app under waitress in a subprocess (production mode, polling
+only) against a local fake bot, then simulates users who load the status
+page and hold a Socket.IO polling session. Each configuration runs a
+baseline of `--users` users and then a spike of ten times as many, while
+a separate thread times /healthz. Reported per phase: page latency, the
+share of pages served from the overflow snapshot, sessions admitted and
+rejected, /healthz latency and the server's peak RSS:
+
+    python -m bench.bench_storm [--users 20] [--seconds 20]
+
+Runs once with the default limits and once with admission control
+effectively off.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from bench.fakebot import FakeBot
+
+UNLIMITED = {'MAX_REALTIME_SESSIONS': '100000', 'MAX_SESSIONS_PER_IP': '100000', 'MAX_INFLIGHT_REQUESTS': '100000'}
+
+
+def percentile(values, share):
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def rss_mb(pid):
+    with open(f'/proc/{pid}/status') as f:
+        return int(re.search(r'VmRSS:\s+(\d+)', f.read()).group(1)) / 1024
+
+
+class Phase:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.page_ms = []
+        self.pages_overflow = 0
+        self.pages_failed = 0
+        self.sessions = 0
+        self.sessions_rejected = 0
+        self.health_ms = []
+        self.peak_rss = 0.0
+
+    def add(self, key, value=1):
+        with self.lock:
+            if isinstance(getattr(self, key), list):
+                getattr(self, key).append(value)
+            else:
+                setattr(self, key, getattr(self, key) + value)
+
+
+def user(base, phase, stop, index):
+    session = requests.Session()
+    # Spread users over 50 addresses, as a proxy would report them
+    headers = {'X-Forwarded-For': f'10.0.0.{index % 50}'}
+    started = time.perf_counter()
+    try:
+        response = session.get(base + '/', headers=headers, timeout=30)
+        phase.add('page_ms', (time.perf_counter() - started) * 1000)
+        if response.status_code == 503:
+            phase.add('pages_overflow')
+    except requests.RequestException:
+        phase.add('pages_failed')
+        return
+
+    polling = base + '/socket.io/?EIO=4&transport=polling'
+    try:
+        response = session.get(polling, headers=headers, timeout=30)
+        if response.status_code != 200:
+            phase.add('sessions_rejected')
+            return
+        sid = json.loads(response.text[1:])['sid']
+        session.post(f'{polling}&sid={sid}', data='40', headers=headers, timeout=30)
+        phase.add('sessions')
+        while not stop.is_set():
+            session.get(f'{polling}&sid={sid}', headers=headers, timeout=40)
+    except (requests.RequestException, ValueError, KeyError):
+        pass
+
+
+def watch(base, pid, phase, stop):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            requests.get(base + '/healthz', timeout=30)
+            phase.add('health_ms', (time.perf_counter() - started) * 1000)
+        except requests.RequestException:
+            pass
+        phase.peak_rss = max(phase.peak_rss, rss_mb(pid))
+        time.sleep(0.2)
+
+
+def run_phase(base, pid, users, seconds):
+    phase = Phase()
+    stop = threading.Event()
+    threads = [threading.Thread(target=watch, args=(base, pid, phase, stop), daemon=True)]
+    threads += [threading.Thread(target=user, args=(base, phase, stop, i), daemon=True) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    return phase
+
+
+def run_config(label, extra_env, bot, args):
+    port = 8800 + (os.getpid() % 100)
+    env = dict(os.environ, RENDER='1', PORT=str(port), BOT_URL=bot.url, APP_URL=f'http://127.0.0.1:{port}/',
+               PROBE_STORE_PATH=os.path.join(tempfile.mkdtemp(prefix='ptastatus-storm-'), 'probes.dat'),
+               CHECKS=json.dumps([{'type': 'http', 'url': bot.url, 'timeout': 1.0}]), **extra_env)
+    server = subprocess.Popen([sys.executable, 'app.py'], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    base = f'http://127.0.0.1:{port}'
+    try:
+        for _ in range(100):
+            try:
+                requests.get(base + '/healthz', timeout=1)
+                break
+            except requests.RequestException:
+                time.sleep(0.2)
+        for name, users in (('baseline', args.users), ('10x spike', args.users * 10)):
+            phase = run_phase(base, server.pid, users, args.seconds)
+            pages = len(phase.page_ms)
+            print(f"{label:<12} {name:<10} {users:>6} {percentile(phase.page_ms, 0.5):>8.0f} {percentile(phase.page_ms, 0.99):>8.0f} "
+                  f"{phase.pages_overflow:>9} {phase.pages_failed:>7} {phase.sessions:>9} {phase.sessions_rejected:>9} "
+                  f"{percentile(phase.health_ms, 0.99):>11.0f} {phase.peak_rss:>8.0f}")
+            time.sleep(45)  # Let abandoned sessions time out before the next phase
+    finally:
+        server.terminate()
+        server.wait(10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--seconds', type=float, default=20.0)
+    args = parser.parse_args()
+
+    bot = FakeBot().start()
+    print(f"{'config':<12} {'phase':<10} {'users':>6} {'page p50':>8} {'page p99':>8} {'overflow':>9} {'failed':>7} "
+          f"{'sessions':>9} {'rejected':>9} {'healthz p99':>11} {'RSS MB':>8}")
+    run_config('admission', {}, bot, args)
+    run_config('unlimited', UNLIMITED, bot, args)
+    bot.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Local stand-in for the Telegram Bot API and alert webhooks.
+
+Records every POSTed JSON body and can fail requests on purpose:
+
+    fail_first  answer the first N requests with `status` (default 503)
+    fail_all    answer every request with `status`
+
+tests/test_alerts.py drives the channels from alerts.py against it. Run
+on its own it listens and prints what arrives:
+
+    python -m bench.fakealerts --port 8082 --fail-first 3   # point TELEGRAM_API_BASE or ALERT_WEBHOOK_URL here
+"""
+import argparse
+import http.server
+import json
+import threading
+import time
+
+
+class FakeAlertHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server.alerts
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with server.lock:
+            server.attempts += 1
+            failing = server.fail_all or server.attempts <= server.fail_first
+            if not failing:
+                server.received.append((self.path, json.loads(body or b'null')))
+        status = server.status if failing else 200
+        reply = json.dumps({'ok': not failing}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeAlertServer:
+    """A threaded HTTP server that accepts alert deliveries and remembers them"""
+
+    def __init__(self, host='127.0.0.1', port=0, fail_first=0, fail_all=False, status=503):
+        self.fail_first = fail_first
+        self.fail_all = fail_all
+        self.status = status
+        self.attempts = 0
+        self.received = []  # (path, body) of every request answered with 200
+        self.lock = threading.Lock()
+
+        self.server = http.server.ThreadingHTTPServer((host, port), FakeAlertHandler)
+        self.server.daemon_threads = True
+        self.server.alerts = self
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True, name='fakealerts')
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Telegram / webhook endpoint for alert delivery")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8082)
+    parser.add_argument('--fail-first', type=int, default=0)
+    parser.add_argument('--status', type=int, default=503)
+    args = parser.parse_args()
+
+    server = FakeAlertServer(args.host, args.port, fail_first=args.fail_first, status=args.status).start()
+    print(f"Fake alert endpoint listening on {server.url}")
+    seen = 0
+    try:
+        while True:
+            time.sleep(0.5)
+            with server.lock:
+                new, seen = server.received[seen:], len(server.received)
+            for path, body in new:
+                print(path, json.dumps(body))
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
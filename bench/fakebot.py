@@ -0,0 +1,164 @@
+"""Local stand-in for the bot's health endpoint with scriptable faults.
+
+Modes:
+    ok       200 after the base latency
+    latency  200 after `delay` seconds
+    error    `status` (default 503) immediately
+    reset    accept, then close with a TCP RST
+    hang     accept and never answer
+    flap     alternate error / ok every `period` seconds, starting with error
+
+A random share of requests can also stall (`stall_rate`) regardless of
+mode. Faults can be driven from Python, from a script of timed steps, or
+over HTTP while it runs:
+
+    python -m bench.fakebot --port 8081 --script "ok:10,hang:5,flap:20"
+    curl "http://localhost:8081/__fault?mode=error&status=502"
+"""
+import argparse
+import http.server
+import json
+import random
+import socket
+import struct
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+MODES = ('ok', 'latency', 'error', 'reset', 'hang', 'flap')
+
+
+class FakeBotHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        bot = self.server.bot
+        url = urlparse(self.path)
+        if url.path == '/__fault':
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            bot.set_mode(params.pop('mode', bot.mode), **params)
+            return self.respond(200, {'mode': bot.mode})
+
+        bot.requests += 1
+        mode = bot.effective_mode()
+        if mode == 'hang' or (bot.stall_rate and random.random() < bot.stall_rate):
+            bot.hung.wait(bot.hang_seconds)
+            self.close_connection = True
+            return
+        if mode == 'reset':
+            # SO_LINGER with a zero timeout turns close() into a RST
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+            self.close_connection = True
+            return
+        if mode == 'error':
+            return self.respond(bot.status, {'ok': False})
+
+        time.sleep(bot.delay if mode == 'latency' else bot.latency)
+        self.respond(200, {'ok': True, 'polling': {'alive': True, 'last_update_age': 1}})
+
+    def respond(self, status, document):
+        body = json.dumps(document).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeBot:
+    """A threaded HTTP server whose behaviour can be changed while it runs"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.01, hang_seconds=60.0):
+        self.mode = 'ok'
+        self.latency = latency
+        self.delay = 1.0
+        self.status = 503
+        self.period = 1.0
+        self.stall_rate = 0.0
+        self.hang_seconds = hang_seconds
+        self.requests = 0
+        self.mode_changed_at = time.monotonic()
+        self.hung = threading.Event()  # Set to release every hanging request at once
+
+        self.server = http.server.ThreadingHTTPServer((host, port), FakeBotHandler)
+        self.server.daemon_threads = True
+        self.server.bot = self
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True, name='fakebot')
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.hung.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def set_mode(self, mode, **params):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode}")
+        for key in ('latency', 'delay', 'period', 'stall_rate', 'hang_seconds'):
+            if key in params:
+                setattr(self, key, float(params[key]))
+        if 'status' in params:
+            self.status = int(params['status'])
+        if mode != 'hang' and self.mode == 'hang':
+            self.hung.set()
+            self.hung = threading.Event()
+        self.mode = mode
+        self.mode_changed_at = time.monotonic()
+
+    def effective_mode(self):
+        if self.mode != 'flap':
+            return self.mode
+        phase = int((time.monotonic() - self.mode_changed_at) / self.period)
+        return 'ok' if phase % 2 else 'error'
+
+    def run_script(self, steps):
+        """Apply (seconds, mode, params) steps in order, in a background thread"""
+        def play():
+            for seconds, mode, params in steps:
+                self.set_mode(mode, **params)
+                time.sleep(seconds)
+        thread = threading.Thread(target=play, daemon=True, name='fakebot-script')
+        thread.start()
+        return thread
+
+
+def parse_script(text):
+    """'ok:10,hang:5,error:3:status=502' -> [(10.0, 'ok', {}), ...]"""
+    steps = []
+    for step in filter(None, text.split(',')):
+        mode, seconds, *params = step.split(':')
+        steps.append((float(seconds), mode, dict(param.split('=', 1) for param in params)))
+    return steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fault-injecting fake bot server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--script', help="Comma-separated mode:seconds[:key=value] steps")
+    args = parser.parse_args()
+
+    bot = FakeBot(args.host, args.port).start()
+    print(f"Fake bot listening on {bot.url}")
+    if args.script:
+        bot.run_script(parse_script(args.script))
+    try:
+        bot.thread.join()
+    except KeyboardInterrupt:
+        bot.stop()
+
+
+if __name__ == '__main__':
+    main()
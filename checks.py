@@ -0,0 +1,301 @@
+"""Pluggable health checks run concurrently on every probe tick.
+
+A check is configured as a small dict, e.g. from the CHECKS environment
+variable:
+
+    [{"type": "http", "url": "http://bot:8081/health", "timeout": 3,
+      "assert": [{"path": "polling.alive", "equals": true},
+                 {"path": "polling.last_update_age", "lt": 120}]},
+     {"type": "tcp", "host": "bot", "port": 8081, "timeout": 1},
+     {"type": "dns", "hostname": "api.telegram.org", "timeout": 2},
+     {"type": "tls", "host": "ptabot-status-website.onrender.com", "min_days": 14}]
+
+Every check gets its own timeout budget. The combined status is online
+only if every required check passes.
+"""
+import socket
+import ssl
+import time
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+
+import requests
+
+CheckResult = namedtuple('CheckResult', ['name', 'kind', 'ok', 'latency_ms', 'detail', 'required'])
+
+
+class CheckFailed(Exception):
+    """Raised by a check with a short human-readable reason"""
+
+
+class Check:
+    kind = None
+
+    def __init__(self, name=None, timeout=5.0, required=True):
+        self.name = name or self.default_name()
+        self.timeout = float(timeout)
+        self.required = required
+
+    def default_name(self):
+        return self.kind
+
+    def run(self):
+        """Return a short detail string, or raise CheckFailed"""
+        raise NotImplementedError
+
+
+class TcpCheck(Check):
+    """Open a raw TCP connection"""
+    kind = 'tcp'
+
+    def __init__(self, host, port, **options):
+        self.host = host
+        self.port = int(port)
+        super().__init__(**options)
+
+    def default_name(self):
+        return f"tcp {self.host}:{self.port}"
+
+    def run(self):
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout):
+                return 'connected'
+        except OSError as e:
+            raise CheckFailed(str(e))
+
+
+def lookup_path(document, path):
+    """Follow a dotted path through nested dicts and lists"""
+    value = document
+    for part in path.split('.'):
+        if isinstance(value, list):
+            value = value[int(part)]
+        else:
+            value = value[part]
+    return value
+
+
+HEDGE_MIN_SAMPLES = 20  # Successful probes needed before the p95 is trusted
+HEDGE_MIN_DELAY = 0.05  # Never hedge sooner than this many seconds
+HEDGE_LATENCY_WINDOW = 200  # Recent successful latencies kept for the p95
+
+
+class HttpCheck(Check):
+    """GET a URL, check the status code and optionally assert on the JSON body.
+
+    With hedge enabled, a second attempt on a fresh connection starts if the
+    first has not answered by the observed p95 latency (or fails early), and
+    the first success wins. A single stalled or reset connection then no
+    longer reads as an outage.
+    """
+    kind = 'http'
+
+    def __init__(self, url, expect_status=200, assertions=None, hedge=False, **options):
+        self.url = url
+        self.expect_status = int(expect_status)
+        self.assertions = assertions or []
+        self.hedge = hedge
+        self.latencies = deque(maxlen=HEDGE_LATENCY_WINDOW)
+        self.hedges_started = 0
+        self.hedges_won = 0
+        self._hedge_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='hedge') if hedge else None
+        super().__init__(**options)
+
+    def default_name(self):
+        return f"http {self.url}"
+
+    def hedge_delay(self):
+        """Seconds to wait for the first attempt before hedging, or None while warming up"""
+        if len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return max(HEDGE_MIN_DELAY, p95)
+
+    def run(self):
+        if not self.hedge:
+            return self.attempt(self.timeout)
+
+        deadline = time.perf_counter() + self.timeout
+        first = self._hedge_executor.submit(self.attempt, self.timeout)
+        delay = self.hedge_delay()
+        if delay is None:
+            return first.result()
+
+        done, _ = wait([first], timeout=min(delay, self.timeout))
+        if done and first.exception() is None:
+            return first.result()
+
+        # Still waiting (or failed fast): race a second attempt on a new connection
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return first.result()
+        self.hedges_started += 1
+        second = self._hedge_executor.submit(self.attempt, remaining)
+        pending = {first, second} - done
+        failure = first.exception() if done else None
+        while pending:
+            finished, pending = wait(pending, timeout=max(0.0, deadline - time.perf_counter()), return_when=FIRST_COMPLETED)
+            if not finished:
+                break
+            for future in finished:
+                if future.exception() is None:
+                    if future is second:
+                        self.hedges_won += 1
+                    return future.result()
+                failure = future.exception()
+        if failure is not None:
+            raise failure
+        raise CheckFailed(f"timed out after {self.timeout:g}s")
+
+    def attempt(self, timeout):
+        """One GET on a fresh connection"""
+        started = time.perf_counter()
+        try:
+            response = requests.get(self.url, timeout=timeout)
+        except requests.RequestException as e:
+            raise CheckFailed(str(e))
+        if response.status_code != self.expect_status:
+            raise CheckFailed(f"status {response.status_code}")
+        self.latencies.append(time.perf_counter() - started)
+        if not self.assertions:
+            return f"status {response.status_code}"
+
+        try:
+            document = response.json()
+        except ValueError:
+            raise CheckFailed("body is not JSON")
+        for assertion in self.assertions:
+            self.check_assertion(document, assertion)
+        return f"status {response.status_code}, {len(self.assertions)} assertion(s) passed"
+
+    @staticmethod
+    def check_assertion(document, assertion):
+        path = assertion['path']
+        try:
+            value = lookup_path(document, path)
+        except (KeyError, IndexError, ValueError, TypeError):
+            if assertion.get('exists', True):
+                raise CheckFailed(f"{path} is missing")
+            return
+        if 'equals' in assertion and value != assertion['equals']:
+            raise CheckFailed(f"{path} is {value!r}, expected {assertion['equals']!r}")
+        try:
+            if 'lt' in assertion and not value < assertion['lt']:
+                raise CheckFailed(f"{path} is {value!r}, expected < {assertion['lt']!r}")
+            if 'gt' in assertion and not value > assertion['gt']:
+                raise CheckFailed(f"{path} is {value!r}, expected > {assertion['gt']!r}")
+        except TypeError:
+            raise CheckFailed(f"{path} is {value!r}, not comparable")
+
+
+class DnsCheck(Check):
+    """Resolve a hostname, optionally requiring specific addresses"""
+    kind = 'dns'
+
+    def __init__(self, hostname, expect=None, **options):
+        self.hostname = hostname
+        self.expect = set(expect or [])
+        super().__init__(**options)
+
+    def default_name(self):
+        return f"dns {self.hostname}"
+
+    def run(self):
+        # getaddrinfo has no timeout of its own; the runner enforces the budget
+        try:
+            addresses = {info[4][0] for info in socket.getaddrinfo(self.hostname, None)}
+        except socket.gaierror as e:
+            raise CheckFailed(str(e))
+        missing = self.expect - addresses
+        if missing:
+            raise CheckFailed(f"missing {', '.join(sorted(missing))}")
+        return ', '.join(sorted(addresses))
+
+
+class TlsExpiryCheck(Check):
+    """Complete a verified TLS handshake and require the certificate to outlive min_days"""
+    kind = 'tls'
+
+    def __init__(self, host, port=443, min_days=14, cafile=None, **options):
+        self.host = host
+        self.port = int(port)
+        self.min_days = float(min_days)
+        self.cafile = cafile
+        super().__init__(**options)
+
+    def default_name(self):
+        return f"tls {self.host}:{self.port}"
+
+    def run(self):
+        context = ssl.create_default_context(cafile=self.cafile)
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout) as sock:
+                with context.wrap_socket(sock, server_hostname=self.host) as tls:
+                    cert = tls.getpeercert()
+        except (OSError, ssl.SSLError) as e:
+            raise CheckFailed(str(e))
+        days_left = (ssl.cert_time_to_seconds(cert['notAfter']) - time.time()) / 86400
+        if days_left < self.min_days:
+            raise CheckFailed(f"certificate expires in {days_left:.1f} days")
+        return f"{days_left:.0f} days left"
+
+
+CHECK_TYPES = {
+    'tcp': TcpCheck,
+    'http': HttpCheck,
+    'dns': DnsCheck,
+    'tls': TlsExpiryCheck,
+}
+
+
+def build_check(config):
+    """Create a check from its config dict"""
+    options = dict(config)
+    kind = options.pop('type')
+    if kind not in CHECK_TYPES:
+        raise ValueError(f"Unknown check type: {kind}")
+    if 'assert' in options:
+        options['assertions'] = options.pop('assert')
+    return CHECK_TYPES[kind](**options)
+
+
+class CheckRunner:
+    """Run a set of checks concurrently and combine them into one status"""
+
+    def __init__(self, checks):
+        self.checks = list(checks)
+        # Headroom so a check stuck past its budget does not delay the next tick
+        self.executor = ThreadPoolExecutor(max_workers=max(4, len(self.checks) * 2), thread_name_prefix='check')
+
+    @staticmethod
+    def _timed(check):
+        started = time.perf_counter()
+        try:
+            ok, detail = True, check.run()
+        except CheckFailed as e:
+            ok, detail = False, str(e)
+        except Exception as e:
+            ok, detail = False, f"{type(e).__name__}: {e}"
+        return ok, detail, (time.perf_counter() - started) * 1000
+
+    def run(self):
+        """Return (combined_status, [CheckResult, ...])"""
+        started = time.perf_counter()
+        futures = [(check, self.executor.submit(self._timed, check)) for check in self.checks]
+
+        results = []
+        for check, future in futures:
+            # Every check started together, so its deadline is measured from `started`
+            remaining = max(0.0, started + check.timeout - time.perf_counter())
+            try:
+                ok, detail, latency_ms = future.result(timeout=remaining)
+            except FutureTimeout:
+                ok, detail, latency_ms = False, f"timed out after {check.timeout:g}s", check.timeout * 1000
+            results.append(CheckResult(check.name, check.kind, ok, latency_ms, detail, check.required))
+
+        combined = all(result.ok for result in results if result.required)
+        return combined, results
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,26 @@
+"""Values shared by the monitor, the archive and the offline tools.
+
+Anything that decides which Philippine day a probe falls on, how long a
+probe is credited for, or which status strings mean "up" lives here, so
+the live page, backfill and replay cannot drift apart.
+"""
+from datetime import datetime, timedelta, timezone
+
+PH_UTC_OFFSET = 8 * 3600  # Asia/Manila has no DST, so day boundaries are a fixed offset
+MANILA = timezone(timedelta(seconds=PH_UTC_OFFSET))
+MAX_PROBE_GAP = 60  # Longest gap (seconds) between probes credited to the daily bars
+UP_VALUES = frozenset({'up', '1', 'true', 'online', 'ok', '200'})  # Lower-cased status fields read as online
+
+
+def parse_time(value):
+    """Epoch seconds (number or numeric string) or ISO 8601; naive ISO values are Philippine time"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=MANILA)
+    return dt.timestamp()
@@ -0,0 +1,140 @@
+"""Structured logging that never blocks the caller.
+
+log_event() builds a record and does a non-blocking put onto a bounded
+queue; a QueueListener thread formats it as one JSON line and writes it
+to stdout. When stdout is slow (Render's log drain under load) the queue
+backs up instead of the probe loop, and once it is full records are
+dropped and counted.
+
+Noisy events can be limited per event name:
+
+    sample  keep one record in N,
+    rate    a token bucket of `rate` records per second, `burst` deep.
+
+The next record of an event that gets through carries a `suppressed`
+count of how many were held back before it.
+"""
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+import traceback
+
+logger = logging.getLogger('ptastatus')
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname.lower(),
+            'event': getattr(record, 'event', None) or record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if getattr(record, 'suppressed', 0):
+            entry['suppressed'] = record.suppressed
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class EventLimiter(logging.Filter):
+    """Per-event sampling and token-bucket rate limits, applied before a record is queued"""
+
+    def __init__(self, limits):
+        super().__init__()
+        self.limits = limits  # Event name -> {'sample': N, 'rate': per second, 'burst': tokens}
+        self.lock = threading.Lock()
+        self.state = {}
+        self.suppressed_total = 0
+
+    def filter(self, record):
+        event = getattr(record, 'event', None)
+        limit = self.limits.get(event)
+        if limit is None:
+            return True
+        with self.lock:
+            state = self.state.get(event)
+            if state is None:
+                state = self.state[event] = {'seen': 0, 'suppressed': 0,
+                                             'tokens': float(limit.get('burst', 1)), 'updated': time.monotonic()}
+            state['seen'] += 1
+            admitted = (state['seen'] - 1) % limit.get('sample', 1) == 0
+            if admitted and limit.get('rate'):
+                now = time.monotonic()
+                state['tokens'] = min(limit.get('burst', 1), state['tokens'] + (now - state['updated']) * limit['rate'])
+                state['updated'] = now
+                admitted = state['tokens'] >= 1
+                if admitted:
+                    state['tokens'] -= 1
+            if not admitted:
+                state['suppressed'] += 1
+                self.suppressed_total += 1
+                return False
+            record.suppressed, state['suppressed'] = state['suppressed'], 0
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler whose full queue drops the record instead of raising or blocking"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Only render the traceback here; the JSON formatting happens on the listener thread
+        if record.exc_info:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class EventLog:
+    """The handler, limiter and listener thread behind the 'ptastatus' logger"""
+
+    def __init__(self, limits=None, queue_size=10000, level=logging.INFO, stream=None):
+        self.limiter = EventLimiter(limits or {})
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        self.handler.addFilter(self.limiter)
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter())
+        self.listener = logging.handlers.QueueListener(self.handler.queue, output)
+        self.level = level
+
+    def start(self):
+        logger.addHandler(self.handler)
+        logger.setLevel(self.level)
+        logger.propagate = False
+        self.listener.start()
+        return self
+
+    def stop(self):
+        """Flush what is queued and stop the listener thread"""
+        logger.removeHandler(self.handler)
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def stats(self):
+        return {
+            'queued': self.handler.queue.qsize(),
+            'dropped': self.handler.dropped,
+            'suppressed': self.limiter.suppressed_total
+        }
+
+
+def log_event(event, level=logging.INFO, exc_info=None, **fields):
+    """Log `event` with structured fields, e.g. log_event('probe_error', logging.ERROR, error=str(e))"""
+    if logger.isEnabledFor(level):
+        logger.log(level, event, exc_info=exc_info, extra={'event': event, 'fields': fields})
@@ -0,0 +1,121 @@
+"""Scheduled maintenance windows and the interval index behind them.
+
+A window is a dict:
+
+    {"title": "Weekly deploy", "start": "2026-10-20T02:00", "duration": 900,
+     "every": "weekly", "until": "2027-01-01"}
+
+`start` and `until` are epoch seconds or ISO 8601 (naive means Manila
+time), `end` may replace `duration`, and `every` ("daily", "weekly" or
+seconds) makes it recurring. Manila has no DST, so fixed periods are
+exact.
+
+MaintenanceSchedule expands every occurrence that overlaps
+[now - lookback, now + horizon] into concrete intervals, merges the
+overlapping ones and keeps them as sorted, disjoint start/end lists. "Is
+`t` in maintenance" is then one bisect, O(log n) however many recurring
+windows there are. refresh() re-expands the range and swaps the lists in
+one assignment, so lookups never see a half-built index.
+"""
+import bisect
+import json
+
+from common import parse_time
+
+PERIODS = {'daily': 86400, 'weekly': 7 * 86400}
+
+
+class Window:
+    def __init__(self, spec):
+        self.title = spec.get('title') or 'Scheduled maintenance'
+        self.start = parse_time(spec['start'])
+        if 'end' in spec:
+            self.duration = parse_time(spec['end']) - self.start
+        else:
+            self.duration = float(spec['duration'])
+        every = spec.get('every')
+        self.every = float(PERIODS.get(every, every)) if every else None
+        self.until = parse_time(spec['until']) if spec.get('until') is not None else None
+        if self.duration <= 0:
+            raise ValueError(f"maintenance window {self.title!r} has no duration")
+        if self.every is not None and self.every < self.duration:
+            raise ValueError(f"maintenance window {self.title!r} repeats before it ends")
+
+    def occurrences(self, lower, upper):
+        """(start, end) of every occurrence overlapping [lower, upper)"""
+        if self.every is None:
+            if self.start < upper and self.start + self.duration > lower:
+                yield self.start, self.start + self.duration
+            return
+        # Jump straight to the first occurrence that can overlap `lower`
+        first = max(0, int((lower - self.duration - self.start) // self.every) + 1)
+        start = self.start + first * self.every
+        while start < upper and (self.until is None or start < self.until):
+            yield start, start + self.duration
+            start += self.every
+
+
+class MaintenanceSchedule:
+    def __init__(self, windows=(), horizon=14 * 86400, lookback=86400):
+        self.windows = [window if isinstance(window, Window) else Window(window) for window in windows]
+        self.horizon = horizon
+        self.lookback = lookback
+        # (starts, ends, titles, covered_from, covered_until); replaced whole by refresh()
+        self.index = ([], [], [], 0.0, 0.0)
+
+    @classmethod
+    def from_json(cls, text, **options):
+        return cls(json.loads(text) if text else [], **options)
+
+    def __len__(self):
+        return len(self.index[0])
+
+    def refresh(self, now):
+        """Rebuild the interval index around `now`; O(occurrences log occurrences)"""
+        lower, upper = now - self.lookback, now + self.horizon
+        intervals = sorted(
+            (start, end, window.title)
+            for window in self.windows
+            for start, end in window.occurrences(lower, upper)
+        )
+        starts, ends, titles = [], [], []
+        for start, end, title in intervals:
+            if ends and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+                titles[-1][title] = None
+            else:
+                starts.append(start)
+                ends.append(end)
+                titles.append({title: None})  # An ordered set, so merging stays linear
+        self.index = (starts, ends, [list(names) for names in titles], lower, upper)
+        return self
+
+    def mask(self, epochs):
+        """Vectorized window_at for a sorted NumPy array of epochs: True where maintenance covers them"""
+        import numpy as np
+        starts, ends, _, _, _ = self.index
+        if not starts:
+            return np.zeros(len(epochs), dtype=bool)
+        i = np.searchsorted(starts, epochs, side='right') - 1
+        return (i >= 0) & (epochs < np.asarray(ends)[np.maximum(i, 0)])
+
+    def window_at(self, epoch):
+        """(start, end, titles) of the maintenance covering `epoch`, or None; O(log n)"""
+        starts, ends, titles, _, _ = self.index
+        i = bisect.bisect_right(starts, epoch) - 1
+        if i >= 0 and epoch < ends[i]:
+            return starts[i], ends[i], titles[i]
+        return None
+
+    def upcoming(self, epoch, limit=3):
+        """The current and next `limit` windows after `epoch`, as dicts for the page and API"""
+        starts, ends, titles, _, _ = self.index
+        i = bisect.bisect_right(ends, epoch)
+        return [
+            {'start': int(starts[j]), 'end': int(ends[j]), 'titles': titles[j], 'active': starts[j] <= epoch}
+            for j in range(i, min(i + limit, len(starts)))
+        ]
+
+    def stale(self, epoch, margin=86400):
+        """True when `epoch` is close enough to the end of the expanded range to refresh"""
+        return epoch + margin > self.index[4] or epoch < self.index[3]
@@ -0,0 +1,96 @@
+import os
+import struct
+import threading
+
+# One fixed-size record per probe: epoch seconds, status, latency in milliseconds
+RECORD = struct.Struct('<dB3xf')
+RECORD_SIZE = RECORD.size
+READ_CHUNK_RECORDS = 4096
+
+
+class ProbeStore:
+    """Append-only file of raw probe results, one fixed-size record per probe.
+
+    Records are written in time order, so a time range can be located with a
+    binary search over record offsets and read back in fixed-size chunks
+    without loading the whole file.
+    """
+
+    def __init__(self, path, writable=True):
+        self.path = path
+        self.lock = threading.Lock()
+        self._file = open(path, 'ab') if writable else None  # Read-only stores only serve iter_chunks()
+
+    def append(self, epoch, status, latency_ms):
+        """Write one probe result and make it visible to readers immediately"""
+        record = RECORD.pack(epoch, 1 if status else 0, latency_ms)
+        with self.lock:
+            self._file.write(record)
+            self._file.flush()
+
+    def append_many(self, records):
+        """Write a batch of (epoch, status, latency_ms) records with a single write and flush"""
+        data = b''.join(RECORD.pack(epoch, 1 if status else 0, latency_ms) for epoch, status, latency_ms in records)
+        with self.lock:
+            self._file.write(data)
+            self._file.flush()
+
+    def count(self):
+        return os.path.getsize(self.path) // RECORD_SIZE
+
+    def first_index(self, epoch):
+        """Index of the first record at or after `epoch`"""
+        with open(self.path, 'rb') as f:
+            return self._lower_bound(f, epoch, self.count())
+
+    def last_epoch(self):
+        """Epoch of the newest record, or None when the store is empty"""
+        count = self.count()
+        if count == 0:
+            return None
+        with open(self.path, 'rb') as f:
+            return self._epoch_at(f, count - 1)
+
+    def close(self):
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+
+    def _epoch_at(self, f, index):
+        f.seek(index * RECORD_SIZE)
+        return RECORD.unpack(f.read(RECORD_SIZE))[0]
+
+    def _lower_bound(self, f, epoch, count):
+        """Index of the first record at or after `epoch`"""
+        low, high = 0, count
+        while low < high:
+            mid = (low + high) // 2
+            if self._epoch_at(f, mid) < epoch:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def iter_chunks(self, start=None, end=None, chunk_records=READ_CHUNK_RECORDS):
+        """Yield lists of (epoch, status, latency_ms) tuples with start <= epoch < end.
+
+        Only records that existed when the call started are read, so a long
+        export never races the probe loop's appends and never holds the lock.
+        """
+        count = self.count()
+        with open(self.path, 'rb') as f:
+            first = self._lower_bound(f, start, count) if start is not None else 0
+            last = self._lower_bound(f, end, count) if end is not None else count
+
+            f.seek(first * RECORD_SIZE)
+            index = first
+            while index < last:
+                batch = min(chunk_records, last - index)
+                data = f.read(batch * RECORD_SIZE)
+                if not data:
+                    break
+                yield [
+                    (epoch, bool(status), latency_ms)
+                    for epoch, status, latency_ms in RECORD.iter_unpack(data)
+                ]
+                index += batch
@@ -0,0 +1,105 @@
+"""Bounded, coalescing outbound queues for Socket.IO clients.
+
+Engine.IO gives every client an unbounded queue of packets waiting to be
+sent. A polling client on a slow link can fall minutes behind, and every
+missed `status_update` stays queued even though only the newest one
+matters. OutboundQueues replaces the queue factory of the Engine.IO
+server so that each client's queue:
+
+    keeps at most one pending packet per coalesced event (newest wins),
+    holds at most `limit` packets, dropping the oldest event packets first.
+
+Control packets (ping, pong, noop, close) are never dropped.
+"""
+import queue
+import threading
+
+from engineio import packet
+
+
+def event_name(pkt):
+    """Socket.IO event name of a queued Engine.IO packet, or None"""
+    if pkt is None or pkt.packet_type != packet.MESSAGE or not isinstance(pkt.data, str):
+        return None
+    # An EVENT on the default namespace without an ack id: 2["name",...]
+    if not pkt.data.startswith('2["'):
+        return None
+    end = pkt.data.find('"', 3)
+    return pkt.data[3:end] if end > 0 else None
+
+
+class CoalescingQueue(queue.Queue):
+    """Queue.Queue whose put() never blocks and never grows past `limit`"""
+
+    def __init__(self, owner):
+        super().__init__()
+        self.owner = owner
+        self.coalesced = 0
+        self.dropped = 0
+
+    def _discard(self, index):
+        # Called under self.mutex from put(); the removed packet will never be task_done()
+        del self.queue[index]
+        self.unfinished_tasks -= 1
+
+    def _put(self, item):
+        name = event_name(item)
+        if name in self.owner.coalesce_events:
+            for index, pending in enumerate(self.queue):
+                if event_name(pending) == name:
+                    self._discard(index)
+                    self.coalesced += 1
+                    self.owner.count('coalesced')
+                    break
+        self.queue.append(item)
+
+        while len(self.queue) > self.owner.limit:
+            for index, pending in enumerate(self.queue):
+                if pending is not None and pending.packet_type == packet.MESSAGE:
+                    self._discard(index)
+                    self.dropped += 1
+                    self.owner.count('dropped')
+                    break
+            else:
+                break
+
+
+class OutboundQueues:
+    """Queue factory for an Engine.IO server plus the counters its queues share"""
+
+    def __init__(self, coalesce_events=('status_update',), limit=16):
+        self.coalesce_events = frozenset(coalesce_events)
+        self.limit = limit
+        self.totals = {'coalesced': 0, 'dropped': 0}
+        self.lock = threading.Lock()
+        self.server = None
+
+    def install(self, eio_server):
+        self.server = eio_server
+        eio_server.create_queue = self.create_queue
+        return self
+
+    def create_queue(self, *args, **kwargs):
+        return CoalescingQueue(self)
+
+    def count(self, key):
+        with self.lock:
+            self.totals[key] += 1
+
+    def stats(self):
+        """Totals since start plus the current depth of every connected client's queue"""
+        sockets = dict(self.server.sockets) if self.server is not None else {}
+        depths = {
+            sid[:8]: {'depth': socket.queue.qsize(), 'coalesced': socket.queue.coalesced, 'dropped': socket.queue.dropped}
+            for sid, socket in sockets.items()
+            if isinstance(socket.queue, CoalescingQueue)
+        }
+        with self.lock:
+            totals = dict(self.totals)
+        return dict(
+            totals,
+            clients=len(depths),
+            limit=self.limit,
+            max_depth=max((client['depth'] for client in depths.values()), default=0),
+            queues=depths
+        )
@@ -0,0 +1,124 @@
+"""Replay recorded probe outcomes through the live state machine on a virtual clock.
+
+Each sample goes through the same app.record_probe() as the real probe
+loop (history, uptime, daily bars, probe store and the status_update
+broadcast), with app.clock pointed at the sample's timestamp instead of
+the wall clock. The 4-hourly uptime reset runs whenever virtual time
+crosses its interval. Nothing sleeps, so a day of 1 Hz probes replays in
+seconds:
+
+    python replay.py probes.dat
+    python replay.py export.csv --limit 1000000
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from common import UP_VALUES
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def iter_trace(path):
+    """Yield (epoch, status, latency_ms) from a probe store, CSV or NDJSON export; latency is None when missing"""
+    if path.endswith('.dat'):
+        from probe_store import ProbeStore
+        for chunk in ProbeStore(path, writable=False).iter_chunks():
+            for epoch, status, latency_ms in chunk:
+                yield epoch, status, None if math.isnan(latency_ms) else latency_ms
+    elif path.endswith('.ndjson'):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    latency = row.get('latency_ms')
+                    yield float(row['timestamp']), bool(row['status']), None if latency is None else float(latency)
+    else:
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                latency = (row.get('latency_ms') or '').strip()
+                yield float(row['timestamp']), row['status'].strip().lower() in UP_VALUES, float(latency) if latency else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('trace', help="probes.dat, or a CSV/NDJSON file from /export")
+    parser.add_argument('--limit', type=int, help="Stop after this many samples")
+    args = parser.parse_args()
+
+    # Keep the replay's writes away from the real probe store and archive
+    workdir = tempfile.mkdtemp(prefix='ptastatus-replay-')
+    os.environ['PROBE_STORE_PATH'] = os.path.join(workdir, 'probes.dat')
+    os.environ.pop('ARCHIVE_PATH', None)
+    try:
+        return replay(args)
+    finally:
+        # The scratch store is a full copy of the trace
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def replay(args):
+    import app
+    app.scheduler.shutdown()  # Real-time jobs are driven by the virtual clock instead
+    app.alert_dispatcher = None  # Never page anyone about a replayed outage
+    clock = VirtualClock()
+    app.clock = clock
+
+    samples = 0
+    next_reset = None
+    first_epoch = last_epoch = None
+    started = time.perf_counter()
+    for epoch, status, latency_ms in iter_trace(args.trace):
+        clock.now = epoch
+        if first_epoch is None:
+            first_epoch = epoch
+            app.start_epoch = epoch
+            next_reset = epoch + app.UPTIME_RESET_INTERVAL
+        while epoch >= next_reset:
+            app.reset_uptime_calculation()
+            next_reset += app.UPTIME_RESET_INTERVAL
+
+        app.record_probe(status, latency_ms)
+        last_epoch = epoch
+        samples += 1
+        if args.limit and samples >= args.limit:
+            break
+    elapsed = time.perf_counter() - started
+
+    if not samples:
+        print("Trace is empty")
+        return 1
+
+    virtual_seconds = last_epoch - first_epoch
+    _, bars = app.daily_bars.snapshot(now=last_epoch)
+    days = [bar for bar in bars if bar['uptime'] is not None]
+    print(f"samples:          {samples:,}")
+    print(f"wall time:        {elapsed:.2f}s")
+    print(f"throughput:       {samples / elapsed:,.0f} samples/s")
+    print(f"virtual span:     {virtual_seconds / 3600:.1f}h ({virtual_seconds / elapsed:,.0f}x real time)")
+    print(f"final status:     {app.current_state().upper()}")
+    print(f"uptime:           {app.uptime_percentage:.2f}%")
+    print(f"history entries:  {len(app.status_history)}")
+    print(f"state version:    {app.state_version}")
+    print(f"incidents:        {sum(bar['incidents'] for bar in days)}")
+    print(f"degraded:         {sum(bar['degraded_seconds'] for bar in days) / 3600:.1f}h in "
+          f"{sum(1 for entry in app.status_history if entry['state'] == 'degraded')} episode(s) still in history")
+    for bar in days[-7:]:
+        print(f"  {bar['date']}  {bar['uptime']:6.2f}%  {bar['incidents']} incident(s)  {bar['degraded_seconds'] / 60:5.0f} min degraded")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
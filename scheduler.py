@@ -0,0 +1,181 @@
+"""One monotonic-clock scheduler for every periodic job.
+
+Each job has a fixed period and its due times are computed from its first
+due time (start + k * period), so a slow run never pushes later runs back.
+A single timing thread keeps the jobs in a heap ordered by due time and
+hands due jobs to a few worker threads, so a slow job (a keep-alive ping
+waiting on the network) cannot delay another one (the probe).
+
+A job that is still running when it is due again is not started twice;
+the tick is counted as missed and the job resumes on its original grid.
+Every job keeps a lag histogram (how late it started against its due
+time) and a run-time histogram.
+"""
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+
+from eventlog import log_event
+
+# Histogram bucket upper bounds in milliseconds; anything larger lands in '+Inf'
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms):
+        index = 0
+        while index < len(BUCKETS_MS) and ms > BUCKETS_MS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def as_dict(self):
+        buckets = {str(bound): count for bound, count in zip(BUCKETS_MS, self.counts)}
+        buckets['+Inf'] = self.counts[-1]
+        return {
+            'count': self.total,
+            'mean_ms': round(self.sum_ms / self.total, 3) if self.total else None,
+            'max_ms': round(self.max_ms, 3),
+            'buckets': buckets
+        }
+
+
+class Job:
+    def __init__(self, name, func, period, due):
+        self.name = name
+        self.func = func
+        self.period = period
+        self.due = due
+        self.running = False
+        self.runs = 0
+        self.missed = 0
+        self.errors = 0
+        self.lag = Histogram()
+        self.runtime = Histogram()
+
+    def stats(self):
+        return {
+            'period': self.period,
+            'runs': self.runs,
+            'missed': self.missed,
+            'errors': self.errors,
+            'running': self.running,
+            'lag': self.lag.as_dict(),
+            'runtime': self.runtime.as_dict()
+        }
+
+
+class Scheduler:
+    """Drift-free periodic jobs on the monotonic clock"""
+
+    def __init__(self, workers=4):
+        self.jobs = {}
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._work = queue.Queue()
+        self._workers = workers
+        self._stopped = threading.Event()
+        self._threads = []
+        self.thread = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive() and not self._stopped.is_set()
+
+    def add_job(self, name, func, period, delay=None):
+        """Run func() every `period` seconds, first after `delay` (default: one period)"""
+        due = time.monotonic() + (period if delay is None else delay)
+        with self._condition:
+            if name in self.jobs:
+                raise ValueError(f"Job already scheduled: {name}")
+            job = self.jobs[name] = Job(name, func, period, due)
+            heapq.heappush(self._heap, (due, next(self._sequence), job))
+            self._condition.notify()
+        return job
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True, name='scheduler')
+        self.thread.start()
+        for index in range(self._workers):
+            worker = threading.Thread(target=self._work_loop, daemon=True, name=f'scheduler-worker-{index}')
+            worker.start()
+            self._threads.append(worker)
+        return self
+
+    def shutdown(self, timeout=5.0):
+        """Stop dispatching and wait briefly for running jobs; safe to call more than once"""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify()
+        for _ in self._threads:
+            self._work.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in [self.thread] + self._threads:
+            if thread is not None:
+                thread.join(max(0.0, deadline - time.monotonic()))
+
+    def join(self):
+        """Block until the scheduler is shut down"""
+        self._stopped.wait()
+
+    def stats(self):
+        return {name: job.stats() for name, job in self.jobs.items()}
+
+    def _run(self):
+        while not self._stopped.is_set():
+            with self._condition:
+                now = time.monotonic()
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                due, _, job = self._heap[0]
+                if due > now:
+                    self._condition.wait(due - now)
+                    continue
+                heapq.heappop(self._heap)
+
+                if job.running:
+                    job.missed += 1
+                else:
+                    job.running = True
+                    self._work.put((job, due))
+
+                # Next slot on the job's own grid; skip slots that have already passed
+                job.due = due + job.period
+                if job.due <= now:
+                    skipped = int((now - job.due) // job.period) + 1
+                    job.missed += skipped
+                    job.due += skipped * job.period
+                heapq.heappush(self._heap, (job.due, next(self._sequence), job))
+
+    def _work_loop(self):
+        while True:
+            item = self._work.get()
+            if item is None:
+                return
+            job, due = item
+            started = time.monotonic()
+            job.lag.observe((started - due) * 1000)
+            try:
+                job.func()
+            except Exception as e:
+                job.errors += 1
+                log_event('job_failed', logging.ERROR, job=job.name, error=str(e))
+            finally:
+                job.runtime.observe((time.monotonic() - started) * 1000)
+                job.runs += 1
+                job.running = False
@@ -0,0 +1,14 @@
+import os
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """The app imported against a scratch probe store, with its probe scheduler stopped"""
+    os.environ['PROBE_STORE_PATH'] = str(tmp_path_factory.mktemp('store') / 'probes.dat')
+    os.environ.pop('ARCHIVE_PATH', None)
+    os.environ.pop('PROBER_PROCESS', None)
+    import app
+    app.scheduler.shutdown()
+    return app
@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from alerts import Alert, TelegramChannel, WebhookChannel
+from bench.fakealerts import FakeAlertServer
+
+
+@pytest.fixture
+def server_factory():
+    servers = []
+
+    def start(**options):
+        servers.append(FakeAlertServer(**options).start())
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def deliver(channel, alerts, done, timeout=10.0):
+    """Start `channel`, offer (key, text) alerts back to back and wait for `done(channel)`"""
+    channel.start()
+    try:
+        for key, text in alerts:
+            channel.offer(Alert(key, text, time.time()))
+        deadline = time.monotonic() + timeout
+        while not done(channel) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        channel.stop()
+
+
+def sent_texts(server):
+    return [alert['text'] for _, body in server.received for alert in body['alerts']]
+
+
+def test_retries_until_delivered(server_factory):
+    server = server_factory(fail_first=2)
+    channel = WebhookChannel(f"{server.url}/hook", batch_window=0.05, backoff_base=0.05)
+    deliver(channel, [('status', 'bot is offline')], lambda c: c.stats['sent'] or c.stats['failed'])
+    assert server.attempts == 3
+    assert channel.stats['retries'] == 2
+    assert channel.stats['sent'] == 1
+    assert sent_texts(server) == ['bot is offline']
+
+
+def test_gives_up_after_max_retries(server_factory):
+    server = server_factory(fail_all=True, status=502)
+    channel = WebhookChannel(f"{server.url}/hook", batch_window=0.05, backoff_base=0.02, max_retries=2)
+    deliver(channel, [('status', 'bot is offline')], lambda c: c.stats['failed'])
+    assert server.attempts == 3
+    assert channel.stats['retries'] == 2
+    assert channel.stats['failed'] == 1
+    assert channel.stats['sent'] == 0
+
+
+def test_batch_keeps_newest_alert_per_key(server_factory):
+    server = server_factory()
+    channel = WebhookChannel(f"{server.url}/hook", batch_window=0.5)
+    flaps = [('status', f"bot is {'offline' if i % 2 == 0 else 'online'} ({i})") for i in range(5)]
+    deliver(channel, flaps + [('other', 'certificate expires soon')], lambda c: c.stats['sent'] or c.stats['failed'])
+    alerts = [(alert['key'], alert['text']) for _, body in server.received for alert in body['alerts']]
+    assert len(server.received) == 1
+    assert alerts == [('status', 'bot is offline (4)'), ('other', 'certificate expires soon')]
+    assert channel.stats['collapsed'] == 4
+
+
+def test_telegram_batch_is_one_message(server_factory):
+    server = server_factory()
+    channel = TelegramChannel('123:abc', '-100', api_base=server.url, batch_window=0.2)
+    deliver(channel, [('status', 'bot is offline'), ('latency', 'bot is slow')], lambda c: c.stats['sent'])
+    assert server.received == [('/bot123:abc/sendMessage', {'chat_id': '-100', 'text': 'bot is offline\nbot is slow'})]
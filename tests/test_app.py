@@ -0,0 +1,90 @@
+import time
+from collections import deque
+
+import pytest
+
+
+@pytest.fixture
+def ring(app_module, monkeypatch):
+    """Install transitions 11..15 in the event ring"""
+    monkeypatch.setattr(app_module, 'event_seq', 15)
+    monkeypatch.setattr(app_module, 'event_ring', deque([(seq, 1_790_000_000.0 + seq, 'online') for seq in range(11, 16)]))
+    return app_module
+
+
+def test_events_since_replays_missed_transitions(ring):
+    assert [event[0] for event in ring.events_since(12)] == [13, 14, 15]
+    assert [event[0] for event in ring.events_since(10)] == [11, 12, 13, 14, 15]
+    assert ring.events_since(15) == []
+
+
+def test_events_since_reports_gaps(ring):
+    # Transition 10 fell out of the ring, and 16 was never handed out (a seq from before a restart)
+    assert ring.events_since(9) is None
+    assert ring.events_since(16) is None
+
+
+def set_locations(app_module, monkeypatch, votes, age=0):
+    received = time.monotonic() - age
+    monkeypatch.setattr(app_module, 'locations', {
+        f"loc{index}": {'ok': ok, 'received': received, 'timestamp': None, 'latency_ms': 1.0, 'store': None}
+        for index, ok in enumerate(votes)
+    })
+
+
+@pytest.mark.parametrize('votes, quorum, expected', [
+    ([False, True, True], 0, True),     # One of three is not a majority
+    ([False, False, True], 0, False),
+    ([False, True, True], 1, False),
+    ([False, False], 5, False),         # A quorum above the location count is capped at all of them
+    ([False, True], 5, True),
+])
+def test_quorum_status(app_module, monkeypatch, votes, quorum, expected):
+    set_locations(app_module, monkeypatch, votes)
+    monkeypatch.setattr(app_module, 'QUORUM', quorum)
+    assert app_module.quorum_status(True) is expected
+
+
+def test_quorum_ignores_stale_locations(app_module, monkeypatch):
+    set_locations(app_module, monkeypatch, [False, False], age=app_module.LOCATION_STALE_AFTER + 1)
+    assert app_module.quorum_status(True) is True
+
+
+@pytest.fixture
+def ingest(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'INGEST_TOKEN', 'secret')
+    monkeypatch.setattr(app_module, 'locations', {})
+    client = app_module.app.test_client()
+
+    def post(body, token='secret'):
+        return client.post('/ingest', json=body, headers={'Authorization': f"Bearer {token}"})
+
+    return post
+
+
+def test_ingest_applies_new_results_once(app_module, ingest):
+    now = time.time()
+    body = {'location': 'sg', 'results': [[now - 2, True, 80.0], [now - 1, False, 0.0]]}
+    assert ingest(body).get_json() == {'accepted': 2}
+    assert ingest(body).get_json() == {'accepted': 0}
+    assert app_module.locations['sg']['ok'] is False
+
+
+@pytest.mark.parametrize('body', [
+    [['sg']],
+    {'location': 'sg', 'results': [[0, True, 1.0]]},
+    {'location': 'sg', 'results': [['nan', True, 1.0]]},
+    {'location': 'sg', 'results': [[1_790_000_000, 'false', 1.0]]},
+    {'location': '../etc', 'results': []},
+])
+def test_ingest_rejects_bad_bodies(ingest, body):
+    assert ingest(body).status_code == 400
+
+
+def test_ingest_requires_token(ingest):
+    assert ingest({'location': 'sg', 'results': []}, token='wrong').status_code == 401
+
+
+def test_status_wait_must_be_finite(app_module):
+    client = app_module.app.test_client()
+    assert client.get('/api/status?wait=nan').status_code == 400
@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import pytest
+
+from archive import HEADER_SIZE, SEGMENT_SIZE, ProbeArchive, day_and_second, decode_latencies, encode_latencies
+from common import PH_UTC_OFFSET
+
+# Midnight in Manila, so day boundaries fall on round offsets
+DAY_START = day_and_second(1_792_000_000)[0] * 86400 - PH_UTC_OFFSET
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = ProbeArchive(str(tmp_path / 'bot.arc'))
+    yield archive
+    archive.close()
+
+
+def test_single_writes_set_their_own_bits(archive):
+    # Neighbouring seconds share a byte of the status and known bitmaps
+    archive.write(DAY_START + 9, True, 100)
+    archive.write(DAY_START + 10, False, None)
+    archive.write(DAY_START + 11, True, 100)
+    archive.write(DAY_START + 11, False, 50)  # Rewriting a second clears its status bit
+    epochs, known, status, latency = archive.read_range(DAY_START + 8, DAY_START + 13)
+    assert epochs.tolist() == list(range(DAY_START + 8, DAY_START + 13))
+    assert known.tolist() == [False, True, True, True, False]
+    assert status.tolist() == [False, True, False, False, False]
+    assert np.isnan(latency[[0, 2, 4]]).all()
+    assert latency[1] == pytest.approx(100, rel=0.03)
+    assert latency[3] == pytest.approx(50, rel=0.03)
+
+
+def test_write_many_round_trips_across_days(archive):
+    epochs = np.arange(DAY_START + 86400 - 1000, DAY_START + 86400 + 1000)
+    status = epochs % 3 != 0
+    latency = np.where(epochs % 5 == 0, np.nan, (epochs % 400).astype(float))
+    archive.write_many(epochs, status, latency)
+
+    # Unaligned on both ends, so the read slices partial bytes of each bitmap
+    read_epochs, known, read_status, read_latency = archive.read_range(epochs[3], epochs[-5])
+    assert read_epochs.tolist() == epochs[3:-5].tolist()
+    assert known.all()
+    assert read_status.tolist() == status[3:-5].tolist()
+    assert np.isnan(read_latency).tolist() == np.isnan(latency[3:-5]).tolist()
+    np.testing.assert_allclose(read_latency, latency[3:-5], rtol=0.03, atol=0.5)
+
+
+def test_latency_codes():
+    latency = np.array([0, 1, 100, 1000, 1e9, np.nan, -1])
+    codes = encode_latencies(latency)
+    assert codes[0] == 1 and codes[-1] == 0 and codes[-2] == 0
+    assert codes[4] == 255
+    np.testing.assert_allclose(decode_latencies(codes)[:4], latency[:4], rtol=0.03, atol=0.5)
+
+
+def test_new_archive_starts_at_first_written_day(archive):
+    archive.write(DAY_START + 5, True, 10)
+    assert archive.base_day == day_and_second(DAY_START)[0]
+    assert os.path.getsize(archive.path) == HEADER_SIZE + SEGMENT_SIZE
+
+
+def test_older_writes_extend_the_start_backwards(tmp_path, archive):
+    archive.write(DAY_START + 5, True, 10)
+    old = DAY_START - 30 * 86400
+    # A second handle stands in for backfill running next to the monitor
+    backfill = ProbeArchive(archive.path)
+    backfill.write_many(np.arange(old, old + 100), np.ones(100, bool), np.full(100, 20.0))
+    backfill.close()
+
+    archive.write(DAY_START + 6, False, None)
+    assert archive.base_day == day_and_second(old)[0]
+    assert archive.days == 31
+    assert archive.read_range(DAY_START + 5, DAY_START + 7)[2].tolist() == [True, False]
+    _, known, status, _ = archive.read_range(old - 10, old + 110)
+    assert known.tolist() == [False] * 10 + [True] * 100 + [False] * 10
+    assert status[10:110].all()
+    # Nothing from the moved segments is left behind in the days between
+    assert not archive.read_range(old + 86400, DAY_START)[1].any()
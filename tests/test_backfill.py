@@ -0,0 +1,35 @@
+from datetime import datetime
+
+import numpy as np
+
+from backfill import load_csv, make_columns, parse_timestamps, rollup
+from common import MANILA
+
+
+def test_parse_timestamps_naive_is_manila():
+    values = np.array([b'1790000000', b'1790000001.5'])
+    assert parse_timestamps(values).tolist() == [1790000000.0, 1790000001.5]
+    values = np.array([b'2026-10-20T02:00:00', b'2026-10-19T18:00:00Z', b'2026-10-20T02:00:00+08:00'])
+    expected = datetime(2026, 10, 20, 2, tzinfo=MANILA).timestamp()
+    assert parse_timestamps(values).tolist() == [expected] * 3
+
+
+def test_csv_with_missing_latency(tmp_path):
+    path = tmp_path / 'export.csv'
+    path.write_text('timestamp,status,latency_ms\n1790000000,up,\n1790000001,down,\n1790000002,OK,12.5\n')
+    columns = load_csv(str(path))
+    assert columns.status.tolist() == [True, False, True]
+    assert np.isnan(columns.latency_ms[:2]).all()
+    assert columns.latency_ms[2] == 12.5
+
+
+def test_rollup_leaves_maintenance_out():
+    epochs = np.arange(0, 3600, 1.0) + 1_790_000_000
+    status = np.ones(len(epochs), bool)
+    status[1000:1600] = False
+    maintenance = np.zeros(len(epochs), bool)
+    maintenance[2000:2300] = True
+    day = rollup(make_columns(epochs, status, np.full(len(epochs), 50.0)), maintenance=maintenance)
+    assert sum(day['down_seconds']) == 600
+    assert sum(day['maintenance_seconds']) == 300
+    assert sum(day['incidents']) == 1
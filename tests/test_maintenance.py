@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from common import MANILA
+from maintenance import MaintenanceSchedule, Window
+
+NOW = 1_790_000_000.0
+
+
+def test_one_off_window():
+    schedule = MaintenanceSchedule([{'title': 'DB', 'start': NOW + 100, 'duration': 60}]).refresh(NOW)
+    assert schedule.window_at(NOW + 99) is None
+    assert schedule.window_at(NOW + 100) == (NOW + 100, NOW + 160, ['DB'])
+    assert schedule.window_at(NOW + 160) is None
+
+
+def test_recurring_window_stops_at_until():
+    spec = {'title': 'Deploy', 'start': NOW, 'duration': 600, 'every': 'daily', 'until': NOW + 2 * 86400}
+    schedule = MaintenanceSchedule([spec]).refresh(NOW)
+    assert schedule.window_at(NOW + 86400 + 300) is not None
+    assert schedule.window_at(NOW + 86400 + 600) is None
+    assert schedule.window_at(NOW + 2 * 86400 + 300) is None
+
+
+def test_overlapping_windows_merge_titles():
+    schedule = MaintenanceSchedule([
+        {'title': 'Deploy', 'start': NOW, 'duration': 60},
+        {'title': 'DB', 'start': NOW + 30, 'duration': 60},
+        {'title': 'Deploy', 'start': NOW + 80, 'duration': 20},
+    ]).refresh(NOW)
+    assert len(schedule) == 1
+    assert schedule.window_at(NOW + 85) == (NOW, NOW + 100, ['Deploy', 'DB'])
+
+
+def test_naive_iso_is_manila_time():
+    window = Window({'start': '2026-10-20T02:00', 'end': '2026-10-20T02:15'})
+    assert window.start == datetime(2026, 10, 20, 2, 0, tzinfo=MANILA).timestamp()
+    assert window.duration == 900
+
+
+def test_window_must_end_before_it_repeats():
+    with pytest.raises(ValueError):
+        Window({'start': NOW, 'duration': 2 * 86400, 'every': 'daily'})
+
+
+def test_mask_matches_window_at():
+    schedule = MaintenanceSchedule([
+        {'start': NOW + 100, 'duration': 60, 'every': 3600},
+        {'start': NOW + 5000, 'duration': 30},
+    ]).refresh(NOW)
+    epochs = np.arange(NOW, NOW + 4 * 3600, 7.0)
+    assert schedule.mask(epochs).tolist() == [schedule.window_at(epoch) is not None for epoch in epochs]
@@ -0,0 +1,63 @@
+import threading
+
+from engineio import packet
+
+from realtime import OutboundQueues, event_name
+
+
+def event(name, data=1):
+    return packet.Packet(packet.MESSAGE, f'2["{name}",{data}]')
+
+
+def drain(queue):
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+        queue.task_done()
+    return items
+
+
+def test_event_name():
+    assert event_name(event('status_update')) == 'status_update'
+    assert event_name(packet.Packet(packet.PING)) is None
+    assert event_name(packet.Packet(packet.MESSAGE, '3["ack"]')) is None
+    assert event_name(None) is None
+
+
+def test_coalesced_event_keeps_only_newest():
+    queues = OutboundQueues(coalesce_events=('status_update',))
+    queue = queues.create_queue()
+    for i in range(5):
+        queue.put(event('status_update', i))
+    queue.put(event('resume'))
+    assert [pkt.data for pkt in drain(queue)] == ['2["status_update",4]', '2["resume",1]']
+    assert queue.coalesced == 4
+    assert queues.totals['coalesced'] == 4
+
+
+def test_limit_drops_oldest_event_but_not_control_packets():
+    queues = OutboundQueues(coalesce_events=(), limit=3)
+    queue = queues.create_queue()
+    queue.put(packet.Packet(packet.PING))
+    for i in range(4):
+        queue.put(event('log', i))
+    items = drain(queue)
+    assert [pkt.packet_type for pkt in items] == [packet.PING, packet.MESSAGE, packet.MESSAGE]
+    assert [pkt.data for pkt in items[1:]] == ['2["log",2]', '2["log",3]']
+    assert queue.dropped == 2
+
+
+def test_task_accounting_matches_what_is_left():
+    # Discarded packets never get a task_done(), so they must not count as unfinished
+    queues = OutboundQueues(limit=2)
+    queue = queues.create_queue()
+    for i in range(3):
+        queue.put(event('status_update', i))
+    for i in range(3):
+        queue.put(event('log', i))
+    assert queue.unfinished_tasks == queue.qsize() == 2
+    drain(queue)
+    joined = threading.Thread(target=queue.join, daemon=True)
+    joined.start()
+    joined.join(timeout=1)
+    assert not joined.is_alive()